@@ -0,0 +1,43 @@
+"""
+Add advisor report access to the business_advisors table
+
+An advisor's account is linked to a client's advisor slot when the advisor
+requests access, and access_granted_at is set when the client grants it.
+Book of business reports only cover clients that granted access; existing
+advisors start with none and have to request it.
+"""
+from app import create_app, db
+from sqlalchemy import text
+
+COLUMNS = [
+    ('advisor_user_id', 'INTEGER REFERENCES users(id) ON DELETE SET NULL'),
+    ('access_granted_at', 'TIMESTAMP'),
+]
+
+app = create_app()
+
+with app.app_context():
+    for column, column_type in COLUMNS:
+        try:
+            with db.engine.connect() as conn:
+                conn.execute(text(f"""
+                    ALTER TABLE business_advisors
+                    ADD COLUMN {column} {column_type}
+                """))
+                conn.commit()
+                print(f"OK Added {column} column to business_advisors table")
+
+        except Exception as e:
+            print(f"Skipped {column}: {e}")
+
+    try:
+        with db.engine.connect() as conn:
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_business_advisors_advisor_user_id
+                ON business_advisors (advisor_user_id)
+            """))
+            conn.commit()
+            print("OK Added ix_business_advisors_advisor_user_id index")
+
+    except Exception as e:
+        print(f"Error adding index: {e}")
@@ -0,0 +1,69 @@
+"""
+Version exit quiz results
+
+Adds exit_quiz_responses.version and the unique (user_id, version) index so
+each submission is kept as its own snapshot, and rewrites the stored
+responses / all_scores JSON in the compact form new snapshots use. Before
+this every user had a single row, which becomes version 1.
+"""
+import json
+from app import create_app, db
+from sqlalchemy import text, update
+from app.models.exit_quiz import ExitQuizResponse
+from app.services.exit_quiz_results import encode_responses, encode_scores
+
+app = create_app()
+
+with app.app_context():
+    try:
+        with db.engine.connect() as conn:
+            conn.execute(text("""
+                ALTER TABLE exit_quiz_responses
+                ADD COLUMN version INTEGER NOT NULL DEFAULT 1
+            """))
+            conn.commit()
+            print("OK Added version column to exit_quiz_responses table")
+
+    except Exception as e:
+        print(f"Skipped version: {e}")
+
+    try:
+        with db.engine.connect() as conn:
+            conn.execute(text("""
+                CREATE UNIQUE INDEX IF NOT EXISTS uq_exit_quiz_user_version
+                ON exit_quiz_responses (user_id, version)
+            """))
+            conn.commit()
+            print("OK Created uq_exit_quiz_user_version index")
+
+    except Exception as e:
+        print(f"Skipped index: {e}")
+
+    try:
+        rows = db.session.query(
+            ExitQuizResponse.id,
+            ExitQuizResponse.responses,
+            ExitQuizResponse.all_scores,
+            ExitQuizResponse.updated_at
+        ).all()
+
+        compacted = []
+        for row in rows:
+            responses = encode_responses(json.loads(row.responses or '{}'))
+            all_scores = encode_scores(json.loads(row.all_scores)) if row.all_scores else row.all_scores
+            if responses != row.responses or all_scores != row.all_scores:
+                compacted.append({
+                    'id': row.id,
+                    'responses': responses,
+                    'all_scores': all_scores,
+                    'updated_at': row.updated_at
+                })
+
+        if compacted:
+            db.session.execute(update(ExitQuizResponse), compacted)
+        db.session.commit()
+        print(f"OK Compacted {len(compacted)} of {len(rows)} quiz results")
+
+    except Exception as e:
+        print(f"Error: {e}")
+        db.session.rollback()
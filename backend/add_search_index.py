@@ -0,0 +1,56 @@
+"""
+Add the full-text search columns and indexes (PostgreSQL)
+
+Adds the generated search_vector column to each searched table and builds
+its GIN index with CREATE INDEX CONCURRENTLY, so writes are not blocked
+while the index builds. Adding a stored generated column rewrites the table
+under an ACCESS EXCLUSIVE lock, so run this in a quiet period; tables that
+already have the column are skipped. Until it has run, the app searches
+with its in-process index.
+
+SQLite needs no migration: its FTS5 index is created at startup.
+"""
+import sys
+from app import create_app, db
+from sqlalchemy import text
+from app.services.search import SEARCH_SOURCES, missing_search_vectors, search_vector_ddl
+
+app = create_app()
+
+with app.app_context():
+    if db.engine.dialect.name != 'postgresql':
+        print("Nothing to do: search columns are only used on PostgreSQL")
+        sys.exit(0)
+
+    missing = set(missing_search_vectors())
+    db.session.commit()
+    failed = False
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        for doc_type, source in SEARCH_SOURCES.items():
+            table = source['table']
+            add_column, create_index = search_vector_ddl(doc_type)
+            try:
+                if table in missing:
+                    conn.execute(text(add_column))
+                    print(f"OK Added search_vector column to {table} table")
+                else:
+                    print(f"Skipped search_vector on {table}: column already exists")
+
+                # A failed concurrent build leaves an invalid index that IF NOT EXISTS would keep
+                invalid = conn.execute(text("""
+                    SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+                    WHERE c.relname = :name AND NOT i.indisvalid
+                """), {'name': f"ix_{table}_search"}).first()
+                if invalid:
+                    conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_search"))
+
+                conn.execute(text(create_index))
+                print(f"OK Added ix_{table}_search index")
+
+            except Exception as e:
+                print(f"Error adding search index on {table}: {e}")
+                failed = True
+
+    sys.exit(1 if failed else 0)
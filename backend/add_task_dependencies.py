@@ -0,0 +1,40 @@
+"""
+Add dependency scheduling fields to the tasks table
+
+create_app() creates the new task_dependencies table; this adds the
+latest_start/latest_finish columns the scheduler keeps on each task and
+stores the plan of every user who already has dependencies.
+"""
+from app import create_app, db
+from sqlalchemy import text
+
+app = create_app()
+
+with app.app_context():
+    for column in ('latest_start', 'latest_finish'):
+        try:
+            with db.engine.connect() as conn:
+                conn.execute(text(f"""
+                    ALTER TABLE tasks
+                    ADD COLUMN {column} DATE
+                """))
+                conn.commit()
+                print(f"OK Added {column} column to tasks table")
+
+        except Exception as e:
+            print(f"Error adding {column}: {e}")
+
+    # Store the plan for dependencies that predate the scheduler columns;
+    # GET /api/tasks/schedule only reads it
+    try:
+        from app.models.task import TaskDependency, reschedule_user_tasks
+
+        user_ids = [row.user_id for row in db.session.query(TaskDependency.user_id).distinct()]
+        for user_id in user_ids:
+            reschedule_user_tasks(user_id)
+        db.session.commit()
+        print(f"OK Backfilled task schedules for {len(user_ids)} users")
+
+    except Exception as e:
+        print(f"Error backfilling task schedules: {e}")
+        db.session.rollback()
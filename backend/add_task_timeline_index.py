@@ -0,0 +1,26 @@
+"""
+Add the (user_id, bar start, bar end) expression index used by the task timeline
+
+The timeline filters on COALESCE(start_date, due_date) and
+COALESCE(due_date, start_date); an index on the plain date columns can only
+serve its user_id prefix, so the earlier ix_tasks_user_dates is replaced.
+"""
+from app import create_app, db
+from sqlalchemy import text
+
+app = create_app()
+
+with app.app_context():
+    try:
+        with db.engine.connect() as conn:
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_tasks_user_span
+                ON tasks (user_id, COALESCE(start_date, due_date), COALESCE(due_date, start_date))
+            """))
+            conn.execute(text("DROP INDEX IF EXISTS ix_tasks_user_dates"))
+            conn.commit()
+            print("OK Added ix_tasks_user_span index to tasks table")
+
+    except Exception as e:
+        print(f"Error: {e}")
+        db.session.rollback()
@@ -0,0 +1,46 @@
+"""
+Add cached exit coverage to the wealth_gaps table
+
+Adds the exit value / after-tax proceeds / coverage ratio columns and fills
+them from each user's latest valuation. From then on they are kept current
+whenever a valuation is saved (see app/services/exit_coverage.py).
+"""
+from app import create_app, db
+from sqlalchemy import text
+from app.models.wealth_gap import WealthGap
+from app.services.exit_coverage import refresh_exit_coverage
+
+COLUMNS = [
+    ('exit_value', 'FLOAT'),
+    ('exit_value_date', 'TIMESTAMP'),
+    ('exit_after_tax_proceeds', 'FLOAT'),
+    ('exit_coverage_ratio', 'FLOAT'),
+    ('coverage_updated_at', 'TIMESTAMP'),
+]
+
+app = create_app()
+
+with app.app_context():
+    for column, column_type in COLUMNS:
+        try:
+            with db.engine.connect() as conn:
+                conn.execute(text(f"""
+                    ALTER TABLE wealth_gaps
+                    ADD COLUMN {column} {column_type}
+                """))
+                conn.commit()
+                print(f"OK Added {column} column to wealth_gaps table")
+
+        except Exception as e:
+            print(f"Skipped {column}: {e}")
+
+    try:
+        wealth_gaps = WealthGap.query.all()
+        for wealth_gap in wealth_gaps:
+            refresh_exit_coverage(db.session, wealth_gap)
+        db.session.commit()
+        print(f"OK Computed exit coverage for {len(wealth_gaps)} wealth gaps")
+
+    except Exception as e:
+        print(f"Error: {e}")
+        db.session.rollback()
@@ -27,7 +27,11 @@ def create_app(config_class=Config):
     # Initialize extensions
     db.init_app(app)
     
-    CORS(app, resources={r"/api/*": {"origins": "*"}})
+    CORS(app, resources={r"/api/*": {
+        "origins": "*",
+        # Read by the frontend on file downloads
+        "expose_headers": ["Content-Disposition", "X-Appendix-Parts"]
+    }})
     jwt = JWTManager(app)
     
     # JWT Error Handlers - MUST be inside create_app function
@@ -54,6 +58,7 @@ def create_app(config_class=Config):
     from app.routes.wealth_gap import wealth_gap_bp
     from app.routes.exit_quiz import exit_quiz_bp
     from app.routes.task import task_bp
+    from app.routes.search import search_bp
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(business_bp)
@@ -63,10 +68,17 @@ def create_app(config_class=Config):
     app.register_blueprint(wealth_gap_bp, url_prefix='/api/wealth-gap')
     app.register_blueprint(exit_quiz_bp, url_prefix='/api/exit-quiz')
     app.register_blueprint(task_bp)
+    app.register_blueprint(search_bp)
     
-    # Create tables
+    # Create tables and the full-text search index
     with app.app_context():
         db.create_all()
+
+        from app.services.search import init_search
+        init_search(app)
+
+        from app.services.exit_coverage import init_exit_coverage
+        init_exit_coverage(app)
     
     # Root route
     @app.route('/')
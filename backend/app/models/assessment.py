@@ -5,6 +5,11 @@ Stores user responses to 120+ questions across 8 major categories
 
 from datetime import datetime
 from app.models import db
+from app.services.assessment_scoring import (
+    SCORE_MAP,
+    aggregate_scores,
+    assessment_score_fields
+)
 
 class Assessment(db.Model):
     __tablename__ = 'assessments'
@@ -45,64 +50,33 @@ class Assessment(db.Model):
     def calculate_scores(self):
         """Calculate overall and category scores based on responses"""
         responses = AssessmentResponse.query.filter_by(assessment_id=self.id).all()
+        weights = question_weights(r.question_id for r in responses)
 
-        if not responses:
-            self.overall_score = 0.0
-            self.attractiveness_score = 0.0
-            self.financial_performance_score = 0.0
-            self.revenue_quality_score = 0.0
-            self.customer_concentration_score = 0.0
-            self.management_team_score = 0.0
-            self.competitive_position_score = 0.0
-            self.growth_potential_score = 0.0
-            self.intellectual_property_score = 0.0
-            self.legal_compliance_score = 0.0
-            self.owner_dependency_score = 0.0
-            self.strategic_positioning_score = 0.0
-            self.answered_questions = 0
-            return
-
-        # Count answered questions (excluding N/A answers with value 0)
-        answered_responses = [r for r in responses if r.answer_value != 0]
-        self.answered_questions = len(responses)
-
-        # Calculate overall score (average of all non-N/A responses)
-        if answered_responses:
-            total_score = sum(r.score for r in answered_responses)
-            self.overall_score = total_score / len(answered_responses)
-        else:
-            self.overall_score = 0.0
-
-        # ATTRACTIVENESS SCORE = Overall score for this assessment
-        self.attractiveness_score = self.overall_score
-
-        # Calculate category scores based on actual responses in each category
-        category_mapping = {
-            'financial_performance': 'financial_performance_score',
-            'revenue_quality': 'revenue_quality_score',
-            'customer_concentration': 'customer_concentration_score',
-            'management_team': 'management_team_score',
-            'competitive_position': 'competitive_position_score',
-            'growth_potential': 'growth_potential_score',
-            'intellectual_property': 'intellectual_property_score',
-            'legal_compliance': 'legal_compliance_score',
-            'owner_dependency': 'owner_dependency_score',
-            'strategic_positioning': 'strategic_positioning_score'
-        }
+        aggregates = aggregate_scores(
+            [0] * len(responses),
+            1,
+            [r.category for r in responses],
+            [r.answer_value for r in responses],
+            [r.score or 0.0 for r in responses],
+            [weights.get(r.question_id, 1.0) for r in responses]
+        )
+
+        for field, value in assessment_score_fields(aggregates, 0).items():
+            setattr(self, field, value)
 
-        for category_key, score_attr in category_mapping.items():
-            # Get responses for this category (excluding N/A)
-            category_responses = [r for r in responses
-                                if r.category == category_key and r.answer_value != 0]
 
-            if category_responses:
-                category_total = sum(r.score for r in category_responses)
-                category_score = category_total / len(category_responses)
-            else:
-                category_score = 0.0
+def question_weights(question_ids):
+    """Map question_id -> scoring weight for the given questions"""
+    question_ids = set(question_ids)
+    if not question_ids:
+        return {}
 
-            # Set the score on the model
-            setattr(self, score_attr, category_score)
+    rows = db.session.query(
+        AssessmentQuestion.question_id,
+        AssessmentQuestion.weight
+    ).filter(AssessmentQuestion.question_id.in_(question_ids)).all()
+
+    return {question_id: (weight if weight is not None else 1.0) for question_id, weight in rows}
 
 
 class AssessmentResponse(db.Model):
@@ -135,15 +109,7 @@ class AssessmentResponse(db.Model):
         """Calculate score based on answer value (1-6 scale)"""
         if self.answer_value is not None:
             # New 1-6 scoring scale
-            score_map = {
-                1: 17,
-                2: 33,
-                3: 50,
-                4: 67,
-                5: 83,
-                6: 100
-            }
-            self.score = float(score_map.get(self.answer_value, 0))
+            self.score = float(SCORE_MAP.get(self.answer_value, 0))
         else:
             self.score = 0.0
 
@@ -194,4 +160,17 @@ class AssessmentQuestion(db.Model):
     impacts_attractiveness = db.Column(db.Boolean, default=True)
 
     order = db.Column(db.Integer, default=0)
-    active = db.Column(db.Boolean, default=True)
\ No newline at end of file
+    active = db.Column(db.Boolean, default=True)
+
+    def to_summary_dict(self):
+        """Question details embedded in task payloads"""
+        return {
+            'question_id': self.question_id,
+            'subject': self.subject,
+            'category': self.category,
+            'category_display': self.category_display,
+            # Not present on every schema version
+            'activity_type': getattr(self, 'activity_type', None),
+            'intangible_asset_type': getattr(self, 'intangible_asset_type', None),
+            'question_text': self.question_text
+        }
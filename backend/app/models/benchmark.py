@@ -0,0 +1,249 @@
+"""
+Cohort Benchmark Models
+Pre-aggregated score distributions per (industry, revenue band, category)
+and the sample each user currently contributes to them
+"""
+
+import json
+from datetime import datetime
+from app.models import db
+from app.services.benchmarking import (
+    BENCHMARK_FIELDS,
+    cohort_keys,
+    empty_histogram,
+    normalize_industry,
+    revenue_band,
+    sample_bins
+)
+
+
+class ScoreDistribution(db.Model):
+    """Histogram of peer scores for one cohort and category"""
+    __tablename__ = 'score_distributions'
+    __table_args__ = (
+        db.UniqueConstraint('industry', 'revenue_band', 'category', name='uq_score_distribution_cohort'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    industry = db.Column(db.String(100), nullable=False)
+    revenue_band = db.Column(db.String(20), nullable=False)
+    category = db.Column(db.String(100), nullable=False)
+
+    counts = db.Column(db.Text, nullable=False)  # JSON array of bin counts
+    total = db.Column(db.Integer, default=0, nullable=False)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def get_counts(self):
+        return json.loads(self.counts) if self.counts else empty_histogram()
+
+    def __repr__(self):
+        return f'<ScoreDistribution {self.industry}/{self.revenue_band}/{self.category} n={self.total}>'
+
+
+class BenchmarkSample(db.Model):
+    """The scores a user currently contributes to the cohort distributions"""
+    __tablename__ = 'benchmark_samples'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, unique=True)
+    assessment_id = db.Column(db.Integer, db.ForeignKey('assessments.id'), nullable=True)
+
+    industry = db.Column(db.String(100), nullable=False)
+    revenue_band = db.Column(db.String(20), nullable=False)
+    scores = db.Column(db.Text, nullable=False)  # JSON benchmark key -> score
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def get_scores(self):
+        return json.loads(self.scores) if self.scores else {}
+
+
+def assessment_benchmark_scores(assessment):
+    """Benchmark key -> score for an assessment"""
+    return {key: getattr(assessment, field) or 0.0 for key, field in BENCHMARK_FIELDS.items()}
+
+
+def business_cohort(business):
+    """(industry, revenue band) cohort for a business profile"""
+    if not business:
+        return normalize_industry(None), revenue_band(None)
+    return normalize_industry(business.industry), revenue_band(business.revenue)
+
+
+def _insert_ignoring_conflicts(table):
+    """INSERT that skips rows hitting a unique constraint, on SQLite and PostgreSQL"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"No conflict-free insert for {dialect}")
+    return insert(table).on_conflict_do_nothing()
+
+
+def _seed_distributions(cohorts):
+    """
+    Make sure every distribution row for the given cohorts exists
+
+    Rows that do not exist yet cannot be locked, so two first samples for a
+    new cohort would both insert it and one would fail on the unique
+    constraint. Inserting with ON CONFLICT DO NOTHING lets concurrent
+    writers create the rows without an error; the update then runs against
+    rows that can be locked.
+    """
+    empty_counts = json.dumps(empty_histogram())
+    rows = [
+        {'industry': industry, 'revenue_band': band, 'category': category,
+         'counts': empty_counts, 'total': 0, 'updated_at': datetime.utcnow()}
+        for industry, band in cohorts
+        for category in BENCHMARK_FIELDS
+    ]
+    db.session.execute(_insert_ignoring_conflicts(ScoreDistribution.__table__), rows)
+
+
+def _locked_distributions(cohorts):
+    """Create any missing distribution rows for the given cohorts, then load and lock them"""
+    _seed_distributions(cohorts)
+    filters = [
+        db.and_(ScoreDistribution.industry == industry, ScoreDistribution.revenue_band == band)
+        for industry, band in cohorts
+    ]
+    rows = ScoreDistribution.query.filter(db.or_(*filters)).with_for_update().all()
+    return {(row.industry, row.revenue_band, row.category): row for row in rows}
+
+
+def _apply_sample(distributions, industry, band, bins, delta):
+    """Add (delta=1) or remove (delta=-1) one sample from its cohorts"""
+    for cohort_industry, cohort_band in cohort_keys(industry, band):
+        for category, index in bins.items():
+            key = (cohort_industry, cohort_band, category)
+            row = distributions.get(key)
+            if row is None:
+                row = ScoreDistribution(
+                    industry=cohort_industry,
+                    revenue_band=cohort_band,
+                    category=category,
+                    counts=json.dumps(empty_histogram()),
+                    total=0
+                )
+                db.session.add(row)
+                distributions[key] = row
+
+            counts = row.get_counts()
+            counts[index] = max(counts[index] + delta, 0)
+            row.counts = json.dumps(counts)
+            row.total = max((row.total or 0) + delta, 0)
+
+
+def record_benchmark_sample(user_id, assessment=None, business=None):
+    """
+    Incrementally update the cohort distributions for one user
+
+    Replaces the user's previous contribution with the given assessment's
+    scores and/or moves it to the business's current cohort. Only the
+    affected histogram rows are touched; the caller commits.
+    """
+    if business is None:
+        from app.models.business import Business
+        business = Business.query.filter_by(user_id=user_id).first()
+
+    sample = BenchmarkSample.query.filter_by(user_id=user_id).first()
+    if sample is None and assessment is None:
+        return None
+
+    industry, band = business_cohort(business)
+    scores = assessment_benchmark_scores(assessment) if assessment is not None else sample.get_scores()
+    new_bins = sample_bins(scores)
+
+    if sample is not None:
+        old_bins = sample_bins(sample.get_scores())
+        if (sample.industry, sample.revenue_band) == (industry, band) and old_bins == new_bins:
+            if assessment is not None:
+                sample.assessment_id = assessment.id
+                sample.scores = json.dumps(scores)
+            return sample
+
+    cohorts = set(cohort_keys(industry, band))
+    if sample is not None:
+        cohorts.update(cohort_keys(sample.industry, sample.revenue_band))
+    distributions = _locked_distributions(cohorts)
+
+    if sample is not None:
+        _apply_sample(distributions, sample.industry, sample.revenue_band, old_bins, -1)
+    else:
+        sample = BenchmarkSample(user_id=user_id)
+        db.session.add(sample)
+
+    _apply_sample(distributions, industry, band, new_bins, 1)
+
+    sample.industry = industry
+    sample.revenue_band = band
+    sample.scores = json.dumps(scores)
+    if assessment is not None:
+        sample.assessment_id = assessment.id
+
+    return sample
+
+
+def load_cohort_distributions(industry, band):
+    """
+    Load every distribution a cohort lookup may need in one query
+
+    Returns:
+        Dict of (industry, band) -> {category: (counts, total)}
+    """
+    cohorts = cohort_keys(industry, band)
+    filters = [
+        db.and_(ScoreDistribution.industry == i, ScoreDistribution.revenue_band == b)
+        for i, b in cohorts
+    ]
+    result = {cohort: {} for cohort in cohorts}
+    for row in ScoreDistribution.query.filter(db.or_(*filters)).all():
+        result[(row.industry, row.revenue_band)][row.category] = (row.get_counts(), row.total)
+    return result
+
+
+def rebuild_benchmarks():
+    """
+    Rebuild every distribution from each user's latest scored assessment
+
+    Returns the number of samples recorded. The caller commits.
+    """
+    from app.models.assessment import Assessment
+    from app.models.business import Business
+
+    ScoreDistribution.query.delete()
+    BenchmarkSample.query.delete()
+
+    latest = db.session.query(
+        Assessment.user_id,
+        db.func.max(Assessment.id).label('assessment_id')
+    ).filter(Assessment.answered_questions > 0).group_by(Assessment.user_id).subquery()
+
+    rows = db.session.query(Assessment, Business)\
+        .join(latest, Assessment.id == latest.c.assessment_id)\
+        .outerjoin(Business, Business.user_id == Assessment.user_id)\
+        .all()
+
+    distributions = {}
+    seen_users = set()
+    for assessment, business in rows:
+        if assessment.user_id in seen_users:
+            continue
+        seen_users.add(assessment.user_id)
+
+        industry, band = business_cohort(business)
+        scores = assessment_benchmark_scores(assessment)
+        _apply_sample(distributions, industry, band, sample_bins(scores), 1)
+        db.session.add(BenchmarkSample(
+            user_id=assessment.user_id,
+            assessment_id=assessment.id,
+            industry=industry,
+            revenue_band=band,
+            scores=json.dumps(scores)
+        ))
+
+    return len(seen_users)
+
@@ -1,3 +1,5 @@
+import json
+from collections import namedtuple
 from datetime import datetime
 from app.models import db
 
@@ -78,146 +80,510 @@ class Business(db.Model):
     successor_identified = db.Column(db.Boolean, default=False)
     successor_type = db.Column(db.String(50))  # Family, Management, External, None
 
-    # Advisory team
-    custom_advisors = db.Column(db.Text)  # JSON array of custom advisors
+    # Advisory team (individual advisors live in business_advisors)
     advisory_notes = db.Column(db.Text)
-    has_attorney = db.Column(db.Boolean, default=False)
-    attorney_name = db.Column(db.String(200))
-    attorney_email = db.Column(db.String(200))
-    attorney_phone = db.Column(db.String(50))
-    has_accountant = db.Column(db.Boolean, default=False)
-    accountant_name = db.Column(db.String(200))
-    accountant_email = db.Column(db.String(200))
-    accountant_phone = db.Column(db.String(50))
-    has_financial_advisor = db.Column(db.Boolean, default=False)
-    financial_advisor_name = db.Column(db.String(200))
-    financial_advisor_email = db.Column(db.String(200))
-    financial_advisor_phone = db.Column(db.String(50))
-    has_exit_advisor = db.Column(db.Boolean, default=False)
-    exit_advisor_name = db.Column(db.String(200))
-    exit_advisor_email = db.Column(db.String(200))
-    exit_advisor_phone = db.Column(db.String(50))
-    has_insurance_agent = db.Column(db.Boolean, default=False)
-    insurance_agent_name = db.Column(db.String(200))
-    insurance_agent_email = db.Column(db.String(200))
-    insurance_agent_phone = db.Column(db.String(50))
-    has_banker = db.Column(db.Boolean, default=False)
-    banker_name = db.Column(db.String(200))
-    banker_email = db.Column(db.String(200))
-    banker_phone = db.Column(db.String(50))
-    has_estate_planner = db.Column(db.Boolean, default=False)
-    estate_planner_name = db.Column(db.String(200))
-    estate_planner_email = db.Column(db.String(200))
-    estate_planner_phone = db.Column(db.String(50))
-    has_business_coach = db.Column(db.Boolean, default=False)
-    business_coach_name = db.Column(db.String(200))
-    business_coach_email = db.Column(db.String(200))
-    business_coach_phone = db.Column(db.String(50))
-    
+    advisors = db.relationship('BusinessAdvisor', backref='business', lazy='select',
+                               cascade='all, delete-orphan',
+                               order_by='[BusinessAdvisor.role, BusinessAdvisor.position]')
+
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    def to_dict(self, fields=None):
+        """
+        Serialize the profile
+
+        Args:
+            fields: payload keys to include (see resolve_profile_fields);
+                None for every field
+        """
+        keys = list(PROFILE_OUTPUT) + ADVISOR_FIELDS if fields is None else fields
+        # Advisors are a separate table, only loaded when asked for
+        advisor_values = advisor_profile_fields(self.advisors) \
+            if any(key in ADVISOR_FIELD_SET for key in keys) else {}
+
+        result = {}
+        for key in keys:
+            if key in advisor_values:
+                result[key] = advisor_values[key]
+            else:
+                field = PROFILE_OUTPUT[key]
+                result[key] = field.serialize(getattr(self, field.column))
+        return result
+
+    @classmethod
+    def load_only_columns(cls, fields):
+        """Column attributes backing the given payload keys, for load_only()"""
+        return [getattr(cls, PROFILE_OUTPUT[key].column) for key in fields if key in PROFILE_OUTPUT]
+
+    def __repr__(self):
+        return f'<Business {self.name}>'
+
+
+class BusinessAdvisor(db.Model):
+    """One member of a business's advisory team"""
+    __tablename__ = 'business_advisors'
+    __table_args__ = (
+        db.UniqueConstraint('business_id', 'role', 'position', name='uq_business_advisor_slot'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    business_id = db.Column(db.Integer, db.ForeignKey('businesses.id', ondelete='CASCADE'),
+                            nullable=False, index=True)
+    role = db.Column(db.String(50), nullable=False)  # One of ADVISOR_ROLES, or 'custom'
+    position = db.Column(db.Integer, nullable=False, default=0)  # Order among custom advisors
+    title = db.Column(db.String(200))  # Label for custom advisors
+    engaged = db.Column(db.Boolean, default=False)
+    name = db.Column(db.String(200))
+    email = db.Column(db.String(200))
+    phone = db.Column(db.String(50))
+
+    # Report access: the advisor's account asks for it, the client grants it.
+    # The email above is free text and never grants access on its own
+    advisor_user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'), index=True)
+    access_granted_at = db.Column(db.DateTime)  # None while the request is pending
+    advisor_user = db.relationship('User', foreign_keys=[advisor_user_id])
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
     def to_dict(self):
+        access = None
+        if self.advisor_user_id is not None:
+            access = {
+                'user_id': self.advisor_user_id,
+                'name': self.advisor_user.full_name if self.advisor_user else None,
+                'email': self.advisor_user.email if self.advisor_user else None,
+                'granted': self.access_granted_at is not None,
+                'granted_at': self.access_granted_at.isoformat() if self.access_granted_at else None
+            }
         return {
             'id': self.id,
-            'user_id': self.user_id,
-            # Client Personal Information
-            'client_first_name': self.client_first_name,
-            'client_last_name': self.client_last_name,
-            'client_email': self.client_email,
-            'client_phone': self.client_phone,
-            'client_date_of_birth': self.client_date_of_birth.isoformat() if self.client_date_of_birth else None,
-            'client_address': self.client_address,
-            'client_city': self.client_city,
-            'client_state': self.client_state,
-            'client_zip': self.client_zip,
-            'client_sex': self.client_sex,
-            'client_notes': self.client_notes,
-            # Spouse/Partner Information
-            'spouse_name': self.spouse_name,
-            'spouse_email': self.spouse_email,
-            'spouse_phone': self.spouse_phone,
-            'spouse_involved_in_business': self.spouse_involved_in_business,
-            'spouse_sex': self.spouse_sex,
-            'spouse_notes': self.spouse_notes,
-            # Family & Dependents
-            'num_dependents': self.num_dependents,
-            'dependents_info': self.dependents_info,
-            'dependents_notes': self.dependents_notes,
-            # Business Information
-            'business_name': self.name,
-            'industry': self.industry,
-            'revenue': self.revenue,
-            'ebitda': self.ebitda,
-            'employees': self.employees,
-            'year_founded': self.founded_year,
-            'exit_goal': self.exit_goal,
-            'primary_location': self.primary_location,
-            'primary_market': self.primary_market,
-            'registration_type': self.registration_type,
-            'owners': self.owners,
-            'business_notes': self.business_notes,
-            # Exit planning fields
-            'exit_horizon': self.exit_horizon,
-            'preferred_exit_type': self.preferred_exit_type,
-            'key_motivations': self.key_motivations,
-            'key_motivations_other': self.key_motivations_other,
-            'deal_breakers': self.deal_breakers,
-            'deal_breakers_other': self.deal_breakers_other,
-            'exit_notes': self.exit_notes,
-            # Strategic assets
-            'has_proprietary_tech': self.has_proprietary_tech,
-            'has_patents_ip': self.has_patents_ip,
-            'has_recurring_revenue': self.has_recurring_revenue,
-            'recurring_revenue_percentage': self.recurring_revenue_percentage,
-            # Financials
-            'gross_margin': self.gross_margin,
-            'growth_rate': self.growth_rate,
-            'customer_concentration': self.customer_concentration,
-            # Succession & team
-            'has_management_team': self.has_management_team,
-            'successor_identified': self.successor_identified,
-            'successor_type': self.successor_type,
-            # Advisory team
-            'custom_advisors': self.custom_advisors,
-            'advisory_notes': self.advisory_notes,
-            'has_attorney': self.has_attorney,
-            'attorney_name': self.attorney_name,
-            'attorney_email': self.attorney_email,
-            'attorney_phone': self.attorney_phone,
-            'has_accountant': self.has_accountant,
-            'accountant_name': self.accountant_name,
-            'accountant_email': self.accountant_email,
-            'accountant_phone': self.accountant_phone,
-            'has_financial_advisor': self.has_financial_advisor,
-            'financial_advisor_name': self.financial_advisor_name,
-            'financial_advisor_email': self.financial_advisor_email,
-            'financial_advisor_phone': self.financial_advisor_phone,
-            'has_exit_advisor': self.has_exit_advisor,
-            'exit_advisor_name': self.exit_advisor_name,
-            'exit_advisor_email': self.exit_advisor_email,
-            'exit_advisor_phone': self.exit_advisor_phone,
-            'has_insurance_agent': self.has_insurance_agent,
-            'insurance_agent_name': self.insurance_agent_name,
-            'insurance_agent_email': self.insurance_agent_email,
-            'insurance_agent_phone': self.insurance_agent_phone,
-            'has_banker': self.has_banker,
-            'banker_name': self.banker_name,
-            'banker_email': self.banker_email,
-            'banker_phone': self.banker_phone,
-            'has_estate_planner': self.has_estate_planner,
-            'estate_planner_name': self.estate_planner_name,
-            'estate_planner_email': self.estate_planner_email,
-            'estate_planner_phone': self.estate_planner_phone,
-            'has_business_coach': self.has_business_coach,
-            'business_coach_name': self.business_coach_name,
-            'business_coach_email': self.business_coach_email,
-            'business_coach_phone': self.business_coach_phone,
-            # Timestamps
-            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'role': self.role,
+            'position': self.position,
+            'title': self.title,
+            'engaged': self.engaged,
+            'name': self.name,
+            'email': self.email,
+            'phone': self.phone,
+            'access': access,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
-    
+
     def __repr__(self):
-        return f'<Business {self.name}>'
\ No newline at end of file
+        return f'<BusinessAdvisor {self.role} {self.name}>'
+
+
+# ---------------------------------------------------------------------------
+# Profile field registry
+# Maps each client payload key to its column, how the value is parsed, the
+# value a full save uses when the key is missing, and how it is serialized
+# ---------------------------------------------------------------------------
+
+ProfileField = namedtuple('ProfileField', ['column', 'parse', 'default', 'serialize'])
+
+
+def _as_is(value):
+    return value
+
+
+def _to_int(value):
+    return int(value) if value else None
+
+
+def _to_float(value):
+    return float(value) if value else None
+
+
+def _to_json_list(value):
+    return json.dumps(value) if value else '[]'
+
+
+def _to_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+    except (ValueError, TypeError):
+        return None  # Unparseable dates are dropped rather than rejected
+
+
+def _to_business_name(value):
+    # No required fields; autosave may run before the name is filled in
+    return value or 'Unnamed Business'
+
+
+def _date_out(value):
+    return value.isoformat() if value else None
+
+
+def _field(column, parse=_as_is, default=None, serialize=_as_is):
+    return ProfileField(column, parse, default, serialize)
+
+
+def _text(column):
+    return _field(column)
+
+
+def _note(column):
+    return _field(column, default='')
+
+
+def _flag(column):
+    return _field(column, default=False)
+
+
+def _json_list(column):
+    return _field(column, _to_json_list, [])
+
+
+PROFILE_FIELDS = {
+    # Client Personal Information
+    'client_first_name': _text('client_first_name'),
+    'client_last_name': _text('client_last_name'),
+    'client_email': _text('client_email'),
+    'client_phone': _text('client_phone'),
+    'client_date_of_birth': _field('client_date_of_birth', _to_date, serialize=_date_out),
+    'client_address': _text('client_address'),
+    'client_city': _text('client_city'),
+    'client_state': _text('client_state'),
+    'client_zip': _text('client_zip'),
+    'client_sex': _text('client_sex'),
+    'client_notes': _note('client_notes'),
+    # Spouse/Partner Information
+    'spouse_name': _text('spouse_name'),
+    'spouse_email': _text('spouse_email'),
+    'spouse_phone': _text('spouse_phone'),
+    'spouse_involved_in_business': _flag('spouse_involved_in_business'),
+    'spouse_sex': _text('spouse_sex'),
+    'spouse_notes': _note('spouse_notes'),
+    # Family & Dependents
+    'num_dependents': _field('num_dependents', _to_int),
+    'dependents_info': _json_list('dependents_info'),
+    'dependents_notes': _note('dependents_notes'),
+    # Business Information
+    'business_name': _field('name', _to_business_name),
+    'industry': _text('industry'),
+    'employees': _field('employees', _to_int),
+    'year_founded': _field('founded_year', _to_int),
+    'primary_location': _text('primary_location'),
+    'primary_market': _text('primary_market'),
+    'registration_type': _text('registration_type'),
+    'owners': _json_list('owners'),
+    'business_notes': _note('business_notes'),
+    # Exit planning
+    'exit_horizon': _text('exit_horizon'),
+    'preferred_exit_type': _text('preferred_exit_type'),
+    'key_motivations': _json_list('key_motivations'),
+    'key_motivations_other': _json_list('key_motivations_other'),
+    'deal_breakers': _json_list('deal_breakers'),
+    'deal_breakers_other': _json_list('deal_breakers_other'),
+    'exit_notes': _note('exit_notes'),
+    # Strategic assets
+    'has_proprietary_tech': _flag('has_proprietary_tech'),
+    'has_patents_ip': _flag('has_patents_ip'),
+    'has_recurring_revenue': _flag('has_recurring_revenue'),
+    'recurring_revenue_percentage': _field('recurring_revenue_percentage', _to_float),
+    # Financials
+    'gross_margin': _field('gross_margin', _to_float),
+    'growth_rate': _field('growth_rate', _to_float),
+    'customer_concentration': _text('customer_concentration'),
+    # Succession & team
+    'has_management_team': _flag('has_management_team'),
+    'successor_identified': _flag('successor_identified'),
+    'successor_type': _text('successor_type'),
+    # Advisory team
+    'advisory_notes': _note('advisory_notes'),
+}
+
+
+def parse_profile_fields(data, partial=False):
+    """
+    Parse a profile payload into businesses column values
+
+    Advisor keys are handled by apply_advisor_fields. A full save covers every registered field, using its default when the
+    key is missing; a partial save covers only the keys submitted.
+    Raises ValueError on unknown keys (partial only) or unparseable numbers.
+    """
+    if partial:
+        unknown = set(data) - set(PROFILE_FIELDS) - ADVISOR_FIELD_SET
+        if unknown:
+            raise ValueError(f'Unknown profile fields: {", ".join(sorted(unknown))}')
+        keys = [key for key in PROFILE_FIELDS if key in data]
+    else:
+        keys = PROFILE_FIELDS
+
+    values = {}
+    for key in keys:
+        field = PROFILE_FIELDS[key]
+        values[key] = field.parse(data.get(key, field.default))
+    return values
+
+
+def apply_profile_fields(business, values):
+    """
+    Set only the columns whose value actually changes
+
+    Returns:
+        Dict of payload key -> serialized new value for the changed fields
+    """
+    changed = {}
+    for key, value in values.items():
+        field = PROFILE_FIELDS[key]
+        if getattr(business, field.column) != value:
+            setattr(business, field.column, value)
+            changed[key] = field.serialize(value)
+    return changed
+
+
+# ---------------------------------------------------------------------------
+# Advisory team
+# The profile payload keeps its flat shape (has_attorney, attorney_name, ...,
+# custom_advisors); it is mapped onto business_advisors rows here
+# ---------------------------------------------------------------------------
+
+ADVISOR_ROLES = [
+    'attorney', 'accountant', 'financial_advisor', 'exit_advisor',
+    'insurance_agent', 'banker', 'estate_planner', 'business_coach'
+]
+CUSTOM_ADVISOR_ROLE = 'custom'
+ADVISOR_COLUMNS = ['title', 'engaged', 'name', 'email', 'phone']
+
+ADVISOR_FIELDS = ['custom_advisors'] + [
+    f'{prefix}{role}{suffix}' for role in ADVISOR_ROLES
+    for prefix, suffix in (('has_', ''), ('', '_name'), ('', '_email'), ('', '_phone'))
+]
+ADVISOR_FIELD_SET = set(ADVISOR_FIELDS)
+
+
+def normalize_email(email):
+    """Email for comparison: trimmed and lower-cased, or None when blank"""
+    return (email or '').strip().lower() or None
+
+
+def advisor_profile_fields(advisors):
+    """Flat profile payload values for a list of BusinessAdvisor rows"""
+    values = {}
+    for role in ADVISOR_ROLES:
+        values[f'has_{role}'] = False
+        for detail in ('name', 'email', 'phone'):
+            values[f'{role}_{detail}'] = None
+
+    custom = []
+    for advisor in sorted(advisors, key=lambda a: a.position):
+        if advisor.role == CUSTOM_ADVISOR_ROLE:
+            custom.append({'title': advisor.title, 'name': advisor.name,
+                           'email': advisor.email, 'phone': advisor.phone})
+        elif advisor.role in ADVISOR_ROLES:
+            values[f'has_{advisor.role}'] = bool(advisor.engaged)
+            for detail in ('name', 'email', 'phone'):
+                values[f'{advisor.role}_{detail}'] = getattr(advisor, detail)
+
+    values['custom_advisors'] = json.dumps(custom)
+    return values
+
+
+def _parse_advisor_field(key, value):
+    if key == 'custom_advisors':
+        return json.dumps([
+            {detail: (item or {}).get(detail) for detail in ('title', 'name', 'email', 'phone')}
+            for item in (value or [])
+        ])
+    if key.startswith('has_'):
+        return bool(value)
+    return value or None
+
+
+def _advisor_rows(values):
+    """business_advisors row specs for flat profile values"""
+    rows = []
+    for role in ADVISOR_ROLES:
+        row = {'role': role, 'position': 0, 'title': None, 'engaged': values[f'has_{role}'],
+               'name': values[f'{role}_name'], 'email': values[f'{role}_email'],
+               'phone': values[f'{role}_phone']}
+        # A role that is neither engaged nor filled in has no row
+        if row['engaged'] or row['name'] or row['email'] or row['phone']:
+            rows.append(row)
+
+    for position, item in enumerate(json.loads(values['custom_advisors'])):
+        rows.append(dict(item, role=CUSTOM_ADVISOR_ROLE, position=position, engaged=True))
+    return rows
+
+
+def sync_advisors(business, rows):
+    """
+    Bulk upsert a business's advisors to exactly the given rows
+
+    Rows are matched on (role, position): matches are updated in place
+    (only changed columns), new ones inserted and the rest deleted, all in
+    the next flush. Bumps business.updated_at when anything changed so
+    profile ETags stay valid. A slot whose email changes loses its report
+    access link. The caller commits.
+
+    Returns:
+        Number of advisor rows inserted, updated or deleted
+    """
+    existing = {(advisor.role, advisor.position): advisor for advisor in business.advisors}
+    changes = 0
+
+    for row in rows:
+        advisor = existing.pop((row['role'], row['position']), None)
+        if advisor is None:
+            business.advisors.append(BusinessAdvisor(**row))
+            changes += 1
+            continue
+        dirty = False
+        # A different advisor in this slot does not inherit the previous one's report access
+        if advisor.advisor_user_id is not None and \
+                normalize_email(advisor.email) != normalize_email(row.get('email')):
+            advisor.advisor_user_id = None
+            advisor.access_granted_at = None
+            dirty = True
+        for column in ADVISOR_COLUMNS:
+            if getattr(advisor, column) != row.get(column):
+                setattr(advisor, column, row.get(column))
+                dirty = True
+        changes += dirty
+
+    for advisor in existing.values():
+        business.advisors.remove(advisor)
+        changes += 1
+
+    if changes and business.id is not None:
+        business.updated_at = datetime.utcnow()
+    return changes
+
+
+def apply_advisor_fields(business, data, partial=False):
+    """
+    Apply the advisor keys of a profile payload
+
+    A full save resets advisors missing from the payload; a partial save
+    only touches the submitted keys.
+
+    Returns:
+        Dict of payload key -> serialized new value for the changed fields
+    """
+    keys = [key for key in ADVISOR_FIELDS if key in data] if partial else ADVISOR_FIELDS
+    if not keys:
+        return {}
+
+    current = advisor_profile_fields(business.advisors)
+    values = dict(current)
+    for key in keys:
+        values[key] = _parse_advisor_field(key, data.get(key))
+
+    changed = {key: values[key] for key in keys if values[key] != current[key]}
+    if changed:
+        sync_advisors(business, _advisor_rows(values))
+    return changed
+
+
+def parse_advisor_list(advisors):
+    """
+    Row specs for the advisors endpoint payload
+
+    Each item has a role (one of ADVISOR_ROLES or 'custom'), and optionally
+    title, engaged, name, email and phone. Standard roles may appear once;
+    custom advisors keep their order. Raises ValueError on bad input.
+    """
+    if not isinstance(advisors, list):
+        raise ValueError('advisors must be a list')
+
+    rows = []
+    seen_roles = set()
+    custom_position = 0
+    for item in advisors:
+        if not isinstance(item, dict):
+            raise ValueError('Each advisor must be an object')
+        role = item.get('role')
+        if role == CUSTOM_ADVISOR_ROLE:
+            position = custom_position
+            custom_position += 1
+        elif role in ADVISOR_ROLES:
+            if role in seen_roles:
+                raise ValueError(f'Duplicate advisor role: {role}')
+            seen_roles.add(role)
+            position = 0
+        else:
+            raise ValueError(f'Unknown advisor role: {role}')
+
+        rows.append({
+            'role': role,
+            'position': position,
+            'title': item.get('title') or None,
+            'engaged': bool(item.get('engaged', role == CUSTOM_ADVISOR_ROLE)),
+            'name': item.get('name') or None,
+            'email': item.get('email') or None,
+            'phone': item.get('phone') or None,
+        })
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Read projections
+# Every serialized key, plus named groups so lightweight views only load
+# and serialize the columns they show (?fields=core,financials)
+# ---------------------------------------------------------------------------
+
+def _datetime_out(value):
+    return value.isoformat() if value else None
+
+
+PROFILE_OUTPUT = {
+    'id': _text('id'),
+    'user_id': _text('user_id'),
+    **PROFILE_FIELDS,
+    # Not editable through the profile form
+    'revenue': _text('revenue'),
+    'ebitda': _text('ebitda'),
+    'exit_goal': _text('exit_goal'),
+    'created_at': _field('created_at', serialize=_datetime_out),
+    'updated_at': _field('updated_at', serialize=_datetime_out),
+}
+
+# Always returned; updated_at also versions the ETag
+PROFILE_BASE_FIELDS = ['id', 'user_id', 'updated_at']
+
+PROFILE_GROUPS = {
+    'core': ['business_name', 'industry', 'employees', 'year_founded', 'revenue', 'ebitda',
+             'primary_location', 'primary_market', 'exit_horizon', 'preferred_exit_type'],
+    'contact': ['client_first_name', 'client_last_name', 'client_email', 'client_phone',
+                'client_city', 'client_state'],
+    'client': [key for key in PROFILE_FIELDS if key.startswith('client_')],
+    'spouse': [key for key in PROFILE_FIELDS if key.startswith('spouse_')],
+    'dependents': ['num_dependents', 'dependents_info', 'dependents_notes'],
+    'business': ['business_name', 'industry', 'revenue', 'ebitda', 'employees', 'year_founded',
+                 'exit_goal', 'primary_location', 'primary_market', 'registration_type',
+                 'owners', 'business_notes'],
+    'exit': ['exit_horizon', 'preferred_exit_type', 'key_motivations', 'key_motivations_other',
+             'deal_breakers', 'deal_breakers_other', 'exit_notes'],
+    'strategic': ['has_proprietary_tech', 'has_patents_ip', 'has_recurring_revenue',
+                  'recurring_revenue_percentage'],
+    'financials': ['revenue', 'ebitda', 'gross_margin', 'growth_rate', 'customer_concentration',
+                   'recurring_revenue_percentage'],
+    'succession': ['has_management_team', 'successor_identified', 'successor_type'],
+    'advisors': ['advisory_notes'] + ADVISOR_FIELDS,
+}
+
+
+def resolve_profile_fields(spec):
+    """
+    Payload keys for a comma-separated list of groups and/or field names
+
+    Returns None (every field) for an empty spec or 'all'.
+    Raises ValueError for unknown names.
+    """
+    names = [name.strip() for name in (spec or '').split(',') if name.strip()]
+    if not names or 'all' in names:
+        return None
+
+    fields = list(PROFILE_BASE_FIELDS)
+    for name in names:
+        if name in PROFILE_GROUPS:
+            keys = PROFILE_GROUPS[name]
+        elif name in PROFILE_OUTPUT or name in ADVISOR_FIELD_SET:
+            keys = [name]
+        else:
+            raise ValueError(f'Unknown profile field or group: {name}')
+        fields.extend(key for key in keys if key not in fields)
+    return fields
@@ -1,6 +1,9 @@
 """
 Exit Strategy Quiz Model
 Stores quiz responses and recommended exit strategies
+
+Each submission is an immutable snapshot numbered per user by version, so
+the newest version is the current result and older ones are the history.
 """
 
 from datetime import datetime
@@ -8,21 +11,25 @@ from app.models import db
 
 
 class ExitQuizResponse(db.Model):
-    """Store user's exit strategy quiz responses"""
+    """Store one version of a user's exit strategy quiz responses"""
     __tablename__ = 'exit_quiz_responses'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'version', name='uq_exit_quiz_user_version'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    version = db.Column(db.Integer, nullable=False, default=1)  # 1, 2, ... per user
 
-    # Quiz responses (stored as JSON)
-    responses = db.Column(db.Text, nullable=False)  # JSON string of all answers
+    # Quiz responses (stored as compact JSON)
+    responses = db.Column(db.Text, nullable=False)  # JSON string of all answers, keys sorted
 
     # Scoring results
     top_recommendation = db.Column(db.String(100))
     second_recommendation = db.Column(db.String(100))
     third_recommendation = db.Column(db.String(100))
 
-    # Detailed scores for all options (JSON)
+    # Detailed scores for all options (compact JSON)
     all_scores = db.Column(db.Text)  # JSON with scores for all exit types
 
     # Timestamps
@@ -37,6 +44,7 @@ class ExitQuizResponse(db.Model):
         return {
             'id': self.id,
             'user_id': self.user_id,
+            'version': self.version,
             'responses': json.loads(self.responses) if self.responses else {},
             'top_recommendation': self.top_recommendation,
             'second_recommendation': self.second_recommendation,
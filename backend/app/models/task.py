@@ -1,12 +1,38 @@
-from datetime import datetime
+from datetime import date, datetime
 from app.models import db
+from app.services.task_scheduler import DEFAULT_DURATION_DAYS, schedule_tasks
+
+class TaskTemplate(db.Model):
+    """Shared catalog of system tasks, materialized per user only when edited"""
+    __tablename__ = 'task_templates'
+    __table_args__ = (
+        db.UniqueConstraint('question_id', 'title', name='uq_task_template_question_title'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    question_id = db.Column(db.String(100), db.ForeignKey('assessment_questions.question_id'), nullable=False)
+
+    title = db.Column(db.String(500), nullable=False)
+    description = db.Column(db.Text)
+    priority = db.Column(db.String(50), default='medium')
+    position = db.Column(db.Integer, default=0)  # Order within the question
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<TaskTemplate {self.question_id}: {self.title}>'
+
 
 class Task(db.Model):
     __tablename__ = 'tasks'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'template_id', name='uq_task_user_template'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     question_id = db.Column(db.String(100), db.ForeignKey('assessment_questions.question_id'), nullable=False)
+    template_id = db.Column(db.Integer, db.ForeignKey('task_templates.id'), nullable=True)  # Set when copied from the catalog
 
     # Task details
     title = db.Column(db.String(500), nullable=False)
@@ -20,6 +46,10 @@ class Task(db.Model):
     due_date = db.Column(db.Date)
     completed_at = db.Column(db.DateTime)
 
+    # Latest dates that keep the dependency plan on time; set by the scheduler
+    latest_start = db.Column(db.Date)
+    latest_finish = db.Column(db.Date)
+
     # Notes and attachments
     notes = db.Column(db.Text)
 
@@ -27,7 +57,18 @@ class Task(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Relationships
+    question = db.relationship('AssessmentQuestion', lazy='select')
+
+    @property
+    def slack_days(self):
+        """Days the task can slip without delaying the plan (None when it has no dependencies)"""
+        if self.latest_start is None or self.start_date is None:
+            return None
+        return (self.latest_start - self.start_date).days
+
     def to_dict(self):
+        slack_days = self.slack_days
         return {
             'id': self.id,
             'user_id': self.user_id,
@@ -37,9 +78,13 @@ class Task(db.Model):
             'status': self.status,
             'priority': self.priority,
             'is_system_task': self.is_system_task,
+            'template_id': self.template_id,
             'start_date': self.start_date.isoformat() if self.start_date else None,
             'due_date': self.due_date.isoformat() if self.due_date else None,
             'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'latest_start': self.latest_start.isoformat() if self.latest_start else None,
+            'slack_days': slack_days,
+            'on_critical_path': slack_days is not None and slack_days <= 0 and self.status != 'completed',
             'notes': self.notes,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
@@ -47,3 +92,164 @@ class Task(db.Model):
 
     def __repr__(self):
         return f'<Task {self.title}>'
+
+
+# A task's timeline bar runs from its first to its last date (a point if it
+# has only one; undated tasks have no bar)
+TASK_BAR_START = db.func.coalesce(Task.start_date, Task.due_date)
+TASK_BAR_END = db.func.coalesce(Task.due_date, Task.start_date)
+
+# Timeline range queries: user_id equality plus a range on the bar start
+db.Index('ix_tasks_user_span', Task.user_id, TASK_BAR_START, TASK_BAR_END)
+
+
+class TaskDependency(db.Model):
+    """Finish-to-start ordering between two of a user's tasks"""
+    __tablename__ = 'task_dependencies'
+    __table_args__ = (
+        db.UniqueConstraint('task_id', 'depends_on_id', name='uq_task_dependency'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    task_id = db.Column(db.Integer, db.ForeignKey('tasks.id'), nullable=False)  # The dependent task
+    depends_on_id = db.Column(db.Integer, db.ForeignKey('tasks.id'), nullable=False)  # Its prerequisite
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'task_id': self.task_id,
+            'depends_on_id': self.depends_on_id,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+
+def load_dependency_graph(user_id):
+    """Predecessor and successor adjacency lists for a user's tasks"""
+    predecessors = {}
+    successors = {}
+    edges = db.session.query(TaskDependency.task_id, TaskDependency.depends_on_id)\
+        .filter(TaskDependency.user_id == user_id).all()
+    for task_id, depends_on_id in edges:
+        predecessors.setdefault(task_id, []).append(depends_on_id)
+        successors.setdefault(depends_on_id, []).append(task_id)
+    return predecessors, successors
+
+
+def _task_duration(task):
+    if task.start_date and task.due_date and task.due_date >= task.start_date:
+        return (task.due_date - task.start_date).days
+    return DEFAULT_DURATION_DAYS
+
+
+def _schedule_node(task, today):
+    """Scheduler input for a task"""
+    duration = _task_duration(task)
+    finish = None
+    if task.status == 'completed':
+        finished_on = task.completed_at.date() if task.completed_at else (task.due_date or task.start_date or today)
+        finish = finished_on.toordinal()
+
+    if task.start_date:
+        anchor = task.start_date
+    elif task.due_date:
+        anchor = date.fromordinal(task.due_date.toordinal() - duration)
+    else:
+        anchor = today
+    return {'anchor': anchor.toordinal(), 'duration': duration, 'finish': finish}
+
+
+def _stored_schedule(task):
+    """The schedule the task was left with by the last run, if complete"""
+    if None in (task.start_date, task.due_date, task.latest_start, task.latest_finish):
+        return None
+    if task.status == 'completed':
+        # Completed tasks keep their own dates; the scheduler's view is in latest_*
+        return {'es': task.latest_start.toordinal(), 'ef': task.latest_finish.toordinal(),
+                'ls': task.latest_start.toordinal(), 'lf': task.latest_finish.toordinal()}
+    return {'es': task.start_date.toordinal(), 'ef': task.due_date.toordinal(),
+            'ls': task.latest_start.toordinal(), 'lf': task.latest_finish.toordinal()}
+
+
+def current_schedule(tasks, predecessors, successors):
+    """
+    Schedule of a user's dependent tasks for display, without modifying them
+
+    Uses the schedule stored by the last run; if any task has none (plans
+    predating the scheduler, before add_task_dependencies.py backfilled
+    them) the whole plan is computed in memory instead.
+
+    Returns:
+        Tuple of (schedule, stored) where schedule maps task id to
+        {'es', 'ef', 'ls', 'lf'} ordinals and stored says whether it came
+        from the tasks' own columns
+    """
+    schedule = {task_id: _stored_schedule(task) for task_id, task in tasks.items()}
+    if all(values is not None for values in schedule.values()):
+        return schedule, True
+
+    today = datetime.utcnow().date()
+    nodes = {task_id: _schedule_node(task, today) for task_id, task in tasks.items()}
+    schedule, _ = schedule_tasks(nodes, predecessors, successors)
+    return schedule, False
+
+
+def reschedule_user_tasks(user_id, changed_task_ids=None):
+    """
+    Re-run critical path scheduling for a user's dependent tasks
+
+    Open tasks are pushed (never pulled) so they start after their
+    prerequisites finish, keeping their duration; latest start/finish are
+    refreshed for slack. With changed_task_ids only the tasks downstream or
+    upstream of those tasks are recomputed, and only rows whose schedule
+    moved are modified. The caller commits.
+
+    Returns the list of tasks whose schedule changed.
+    Raises ValueError if the dependencies contain a cycle.
+    """
+    predecessors, successors = load_dependency_graph(user_id)
+    graph_ids = set(predecessors) | set(successors)
+    load_ids = graph_ids | set(changed_task_ids or ())
+    if not load_ids:
+        return []
+
+    tasks = {task.id: task for task in Task.query.filter(Task.user_id == user_id, Task.id.in_(load_ids)).all()}
+
+    # Tasks that just left the graph no longer have a plan
+    updated = []
+    for task_id in load_ids - graph_ids:
+        task = tasks.get(task_id)
+        if task and (task.latest_start or task.latest_finish):
+            task.latest_start = task.latest_finish = None
+            updated.append(task)
+
+    graph_tasks = {task_id: task for task_id, task in tasks.items() if task_id in graph_ids}
+    if not graph_tasks:
+        return updated
+
+    today = datetime.utcnow().date()
+    nodes = {task_id: _schedule_node(task, today) for task_id, task in graph_tasks.items()}
+
+    previous = None
+    if changed_task_ids is not None:
+        previous = {}
+        for task_id, task in graph_tasks.items():
+            stored = _stored_schedule(task)
+            if stored is not None:
+                previous[task_id] = stored
+
+    schedule, touched = schedule_tasks(nodes, predecessors, successors, previous, changed_task_ids)
+
+    for task_id in touched:
+        task = graph_tasks[task_id]
+        values = schedule[task_id]
+        if task.status != 'completed':
+            task.start_date = date.fromordinal(values['es'])
+            task.due_date = date.fromordinal(values['ef'])
+        task.latest_start = date.fromordinal(values['ls'])
+        task.latest_finish = date.fromordinal(values['lf'])
+        updated.append(task)
+
+    return updated
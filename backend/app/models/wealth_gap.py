@@ -4,6 +4,7 @@ Wealth Gap Model for tracking client's financial readiness for exit
 
 from datetime import datetime
 from app.models import db
+from app.services.wealth_projection import wealth_goal
 
 class WealthGap(db.Model):
     __tablename__ = 'wealth_gaps'
@@ -33,31 +34,27 @@ class WealthGap(db.Model):
     # Liabilities (optional tracking)
     total_liabilities = db.Column(db.Float, default=0.0)
 
+    # Exit coverage, cached from the latest valuation (see app.services.exit_coverage)
+    exit_value = db.Column(db.Float)
+    exit_value_date = db.Column(db.DateTime)
+    exit_after_tax_proceeds = db.Column(db.Float)
+    exit_coverage_ratio = db.Column(db.Float)  # Share of the wealth gap the proceeds close
+    coverage_updated_at = db.Column(db.DateTime)
+
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     def calculate_wealth_goal(self):
         """Calculate wealth goal based on selected method"""
-        if self.wealth_goal_method == 'single_number':
-            return self.wealth_goal_amount
-        elif self.wealth_goal_method == 'monthly_needs':
-            # Present Value calculation for monthly needs
-            # PV = PMT * [(1 - (1 + r)^-n) / r]
-            # Where PMT = monthly payment, r = monthly rate, n = number of months
-
-            monthly_rate = (self.annual_return_rate - self.annual_inflation_rate) / 100 / 12
-            num_months = self.years_of_income * 12
-
-            if monthly_rate == 0:
-                # If real return is 0, it's just monthly_need * months
-                present_value = self.monthly_cash_need * num_months
-            else:
-                # Standard present value annuity formula
-                present_value = self.monthly_cash_need * ((1 - (1 + monthly_rate) ** -num_months) / monthly_rate)
-
-            return present_value
-        return 0.0
+        return wealth_goal(
+            self.wealth_goal_method,
+            wealth_goal_amount=self.wealth_goal_amount,
+            monthly_cash_need=self.monthly_cash_need,
+            years_of_income=self.years_of_income,
+            annual_inflation_rate=self.annual_inflation_rate,
+            annual_return_rate=self.annual_return_rate
+        )
 
     def calculate_wealth_gap(self):
         """Calculate the wealth gap: Wealth Goal - Current Net Worth"""
@@ -105,6 +102,11 @@ class WealthGap(db.Model):
             'calculated_wealth_goal': wealth_goal,
             'calculated_wealth_gap': wealth_gap,
             'net_worth_breakdown': net_worth_breakdown,
+            'exit_value': self.exit_value,
+            'exit_value_date': self.exit_value_date.isoformat() if self.exit_value_date else None,
+            'exit_after_tax_proceeds': self.exit_after_tax_proceeds,
+            'exit_coverage_ratio': self.exit_coverage_ratio,
+            'coverage_updated_at': self.coverage_updated_at.isoformat() if self.coverage_updated_at else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
@@ -1,6 +1,6 @@
 # assessment.py - Routes that work with YOUR existing models
 
-from flask import Blueprint, request, jsonify, current_app, send_file
+from flask import Blueprint, request, jsonify, current_app
 from functools import wraps
 from datetime import datetime
 import jwt
@@ -10,6 +10,8 @@ import logging
 logger = logging.getLogger(__name__)
 assessment_bp = Blueprint('assessments', __name__)
 
+DEFAULT_APPENDIX_PART_SIZE = 40  # questions per appendix PDF
+
 # JWT decorator
 def token_required(f):
     @wraps(f)
@@ -280,6 +282,7 @@ def start_assessment(current_user_id):
 def save_response(current_user_id):
     """Save a response to an assessment question"""
     from app.models.assessment import Assessment, AssessmentResponse, AssessmentQuestion
+    from app.models.benchmark import record_benchmark_sample
     from app.models import db
 
     data = request.get_json()
@@ -352,6 +355,9 @@ def save_response(current_user_id):
     # Recalculate assessment scores
     assessment.calculate_scores()
 
+    # Keep the cohort benchmark distributions current
+    record_benchmark_sample(current_user_id, assessment=assessment)
+
     db.session.commit()
 
     return jsonify({
@@ -376,15 +382,27 @@ def save_response(current_user_id):
 def get_tasks(current_user_id):
     """Get all tasks for the current user's assessments"""
     from app.models.assessment import Assessment, AssessmentTask
+    from app.utils.pagination import apply_sort, paginate
+
+    sort_columns = {
+        'created_at': AssessmentTask.created_at,
+        'due_date': AssessmentTask.due_date,
+        'status': AssessmentTask.status,
+        'priority': AssessmentTask.priority,
+        'title': AssessmentTask.title
+    }
 
-    # Get all assessments for the user
-    assessments = Assessment.query.filter_by(user_id=current_user_id).all()
-    assessment_ids = [a.id for a in assessments]
+    # Single query: join through the owning assessment instead of loading
+    # every assessment first
+    query = AssessmentTask.query.join(
+        Assessment, AssessmentTask.assessment_id == Assessment.id
+    ).filter(Assessment.user_id == current_user_id)
 
-    # Get all tasks for these assessments
-    tasks = AssessmentTask.query.filter(
-        AssessmentTask.assessment_id.in_(assessment_ids)
-    ).order_by(AssessmentTask.created_at.desc()).all()
+    try:
+        query = apply_sort(query, sort_columns, AssessmentTask.id, default_sort='created_at')
+        tasks, pagination = paginate(query)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
     tasks_data = []
     for task in tasks:
@@ -399,10 +417,14 @@ def get_tasks(current_user_id):
             'created_at': task.created_at.isoformat() if task.created_at else None
         })
 
-    return jsonify({
+    response = {
         'tasks': tasks_data,
         'count': len(tasks_data)
-    })
+    }
+    if pagination:
+        response['pagination'] = pagination
+
+    return jsonify(response)
 
 
 # Update task status
@@ -446,43 +468,24 @@ def update_task_status(current_user_id, task_id):
     }), 200
 
 
-# Generate PDF report for assessment
-@assessment_bp.route('/<int:assessment_id>/pdf', methods=['GET'])
-@token_required
-def generate_assessment_pdf(current_user_id, assessment_id):
-    """Generate and download PDF report for an assessment"""
-    from app.models.assessment import Assessment, AssessmentResponse
-    from app.utils.pdf_generator import AssessmentPDFGenerator
-
-    # Get assessment and verify ownership
-    assessment = Assessment.query.filter_by(
-        id=assessment_id,
-        user_id=current_user_id
-    ).first()
-
-    if not assessment:
-        return jsonify({'error': 'Assessment not found'}), 404
+def build_assessment_pdf_data(assessment):
+    """Plain-dict assessment data for AssessmentPDFGenerator"""
+    from app.models import db
+    from app.models.assessment import AssessmentResponse
 
-    # Get all responses for this assessment
-    responses = AssessmentResponse.query.filter_by(
-        assessment_id=assessment_id
-    ).all()
+    # The report only counts answers by gap zone; question text and comments
+    # are left to the appendix (build_assessment_appendix_data)
+    responses = db.session.query(
+        AssessmentResponse.answer_value,
+        AssessmentResponse.score
+    ).filter(AssessmentResponse.assessment_id == assessment.id).all()
 
-    # Prepare assessment data
-    response_data = []
-    for response in responses:
-        response_data.append({
-            'question_id': response.question_id,
-            'question_text': response.question_text,
-            'category': response.category,
-            'subject': response.subject,
-            'answer_value': response.answer_value,
-            'answer_text': response.answer_text,
-            'score': response.score,
-            'comments': response.comments
-        })
+    response_data = [
+        {'answer_value': response.answer_value, 'score': response.score}
+        for response in responses
+    ]
 
-    assessment_data = {
+    return {
         'id': assessment.id,
         'overall_score': assessment.overall_score,
         'attractiveness_score': assessment.attractiveness_score,
@@ -504,25 +507,204 @@ def generate_assessment_pdf(current_user_id, assessment_id):
         'responses': response_data
     }
 
-    # Generate PDF
-    try:
-        pdf_generator = AssessmentPDFGenerator()
-        pdf_buffer = pdf_generator.generate_report(assessment_data)
 
-        # Generate filename with date
-        filename = f"assessment_report_{assessment.id}_{datetime.now().strftime('%Y%m%d')}.pdf"
+def build_assessment_appendix_data(assessment, part, part_size):
+    """
+    Plain-dict data for one part of the assessment appendix
+
+    Only the part's responses are loaded, in report category order, so a
+    part costs the same however large the assessment is.
+
+    Returns:
+        Dictionary for AssessmentPDFGenerator.generate_appendix, or None if
+        the part is out of range
+    """
+    from sqlalchemy import case
+    from app.models.assessment import AssessmentResponse
+    from app.services.assessment_scoring import CATEGORIES
+
+    query = AssessmentResponse.query.filter_by(assessment_id=assessment.id)
+    total = query.count()
+    parts = max(1, -(-total // part_size))
+    if part < 1 or part > parts:
+        return None
+
+    category_rank = case(
+        {category: i for i, category in enumerate(CATEGORIES)},
+        value=AssessmentResponse.category,
+        else_=len(CATEGORIES)
+    )
+    responses = query.order_by(category_rank, AssessmentResponse.question_id, AssessmentResponse.id)\
+        .offset((part - 1) * part_size)\
+        .limit(part_size)\
+        .all()
+
+    return {
+        'id': assessment.id,
+        'created_at': assessment.created_at.isoformat() if assessment.created_at else None,
+        'part': part,
+        'parts': parts,
+        'first': (part - 1) * part_size + 1,
+        'total': total,
+        'responses': [{
+            'question_id': response.question_id,
+            'question_text': response.question_text,
+            'category': response.category,
+            'subject': response.subject,
+            'answer_value': response.answer_value,
+            'answer_text': response.answer_text,
+            'score': response.score,
+            'comments': response.comments,
+            'considerations': response.considerations
+        } for response in responses]
+    }
+
+
+def assessment_pdf_filename(assessment):
+    return f"assessment_report_{assessment.id}_{datetime.now().strftime('%Y%m%d')}.pdf"
+
 
-        return send_file(
-            pdf_buffer,
-            mimetype='application/pdf',
-            as_attachment=True,
-            download_name=filename
+# Generate PDF report for assessment
+@assessment_bp.route('/<int:assessment_id>/pdf', methods=['GET'])
+@token_required
+def generate_assessment_pdf(current_user_id, assessment_id):
+    """Generate and download PDF report for an assessment"""
+    from app.models.assessment import Assessment
+    from app.routes.pdf import send_report
+
+    # Get assessment and verify ownership
+    assessment = Assessment.query.filter_by(
+        id=assessment_id,
+        user_id=current_user_id
+    ).first()
+
+    if not assessment:
+        return jsonify({'error': 'Assessment not found'}), 404
+
+    # Generate PDF (or reuse the cached one)
+    try:
+        return send_report(
+            'assessment',
+            {'assessment_data': build_assessment_pdf_data(assessment)},
+            assessment_pdf_filename(assessment)
         )
     except Exception as e:
         logger.error(f"Error generating PDF: {e}")
         return jsonify({'error': 'Failed to generate PDF report'}), 500
 
 
+# Generate one part of the question-by-question appendix
+@assessment_bp.route('/<int:assessment_id>/pdf/appendix', methods=['GET'])
+@token_required
+def generate_assessment_appendix_pdf(current_user_id, assessment_id):
+    """
+    Download one part of an assessment's question-by-question appendix
+
+    Query: ?part=N (from 1). The X-Appendix-Parts header gives the number
+    of parts; each holds PDF_APPENDIX_PART_SIZE questions.
+    """
+    from app.models.assessment import Assessment
+    from app.routes.pdf import send_report
+
+    assessment = Assessment.query.filter_by(
+        id=assessment_id,
+        user_id=current_user_id
+    ).first()
+
+    if not assessment:
+        return jsonify({'error': 'Assessment not found'}), 404
+
+    part = request.args.get('part', 1, type=int)
+    part_size = current_app.config.get('PDF_APPENDIX_PART_SIZE', DEFAULT_APPENDIX_PART_SIZE)
+    appendix_data = build_assessment_appendix_data(assessment, part, part_size)
+    if appendix_data is None:
+        return jsonify({'error': 'Appendix part not found'}), 404
+
+    try:
+        response = send_report(
+            'assessment-appendix',
+            {'appendix_data': appendix_data},
+            f"assessment_appendix_{assessment.id}_part{part}_of_{appendix_data['parts']}.pdf"
+        )
+    except Exception as e:
+        logger.error(f"Error generating appendix PDF: {e}")
+        return jsonify({'error': 'Failed to generate PDF appendix'}), 500
+
+    response.headers['X-Appendix-Parts'] = str(appendix_data['parts'])
+    return response
+
+
+# Get percentile ranks against peer businesses
+@assessment_bp.route('/<int:assessment_id>/benchmark', methods=['GET'])
+@token_required
+def get_assessment_benchmark(current_user_id, assessment_id):
+    """Rank an assessment's scores against businesses in the same industry and size band"""
+    from app.models.assessment import Assessment
+    from app.models.business import Business
+    from app.models.benchmark import assessment_benchmark_scores, business_cohort, load_cohort_distributions
+    from app.services.benchmarking import MIN_COHORT_SIZE, ALL, cohort_keys, percentile_rank
+
+    assessment = Assessment.query.filter_by(
+        id=assessment_id,
+        user_id=current_user_id
+    ).first()
+
+    if not assessment:
+        return jsonify({'error': 'Assessment not found'}), 404
+
+    business = Business.query.filter_by(user_id=current_user_id).first()
+    industry, band = business_cohort(business)
+    distributions = load_cohort_distributions(industry, band)
+
+    # Use the most specific cohort that is large enough to be meaningful
+    cohort = None
+    for cohort_industry, cohort_band in cohort_keys(industry, band):
+        overall = distributions[(cohort_industry, cohort_band)].get('overall')
+        if overall and overall[1] >= MIN_COHORT_SIZE:
+            cohort = (cohort_industry, cohort_band)
+            break
+
+    scores = assessment_benchmark_scores(assessment)
+
+    if not cohort:
+        return jsonify({
+            'assessment_id': assessment_id,
+            'cohort': None,
+            'message': f'Not enough peer businesses to benchmark against (minimum {MIN_COHORT_SIZE})',
+            'overall': {'score': scores['overall'], 'percentile': None},
+            'categories': {key: {'score': score, 'percentile': None}
+                           for key, score in scores.items() if key != 'overall'}
+        })
+
+    cohort_distributions = distributions[cohort]
+    ranks = {}
+    for key, score in scores.items():
+        counts, total = cohort_distributions.get(key, (None, 0))
+        ranks[key] = {
+            'score': score,
+            'percentile': percentile_rank(counts, total, score) if total >= MIN_COHORT_SIZE else None
+        }
+
+    if cohort[0] == ALL:
+        level = 'all'
+    elif cohort[1] == ALL:
+        level = 'industry'
+    else:
+        level = 'industry_revenue'
+
+    return jsonify({
+        'assessment_id': assessment_id,
+        'cohort': {
+            'industry': cohort[0],
+            'revenue_band': cohort[1],
+            'level': level,
+            'peer_count': cohort_distributions['overall'][1]
+        },
+        'overall': ranks.pop('overall'),
+        'categories': ranks
+    })
+
+
 # Get detailed CEPA-level assessment summary
 @assessment_bp.route('/<int:assessment_id>/summary', methods=['GET'])
 @token_required
@@ -4,10 +4,15 @@ Exit Strategy Quiz Routes
 
 from flask import Blueprint, request, jsonify
 from app.models import db
-from app.models.exit_quiz import ExitQuizResponse
 from app.routes.assessment import token_required
-from app.services.exit_quiz_engine import QUIZ_QUESTIONS, EXIT_STRATEGIES, calculate_exit_scores
-import json
+from app.services.exit_quiz_engine import QUIZ_QUESTIONS, EXIT_STRATEGIES, calculate_exit_scores, answer_sensitivity
+from app.services.exit_quiz_results import (
+    build_recommendations,
+    latest_responses,
+    quiz_history,
+    results_payload,
+    save_snapshot
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -60,50 +65,16 @@ def submit_quiz(current_user_id):
         # Calculate scores and recommendations
         results = calculate_exit_scores(responses)
 
-        # Get top 3 recommendations
-        top_3 = results['top_recommendations']
-
-        # Save to database
-        existing_response = ExitQuizResponse.query.filter_by(user_id=current_user_id).first()
-
-        if existing_response:
-            # Update existing
-            existing_response.responses = json.dumps(responses)
-            existing_response.top_recommendation = top_3[0] if len(top_3) > 0 else None
-            existing_response.second_recommendation = top_3[1] if len(top_3) > 1 else None
-            existing_response.third_recommendation = top_3[2] if len(top_3) > 2 else None
-            existing_response.all_scores = json.dumps(results['all_scores'])
-        else:
-            # Create new
-            quiz_response = ExitQuizResponse(
-                user_id=current_user_id,
-                responses=json.dumps(responses),
-                top_recommendation=top_3[0] if len(top_3) > 0 else None,
-                second_recommendation=top_3[1] if len(top_3) > 1 else None,
-                third_recommendation=top_3[2] if len(top_3) > 2 else None,
-                all_scores=json.dumps(results['all_scores'])
-            )
-            db.session.add(quiz_response)
-
-        db.session.commit()
-
-        # Format response with full strategy details
-        recommendations = []
-        for i, strategy_key in enumerate(top_3, 1):
-            strategy_info = EXIT_STRATEGIES.get(strategy_key, {})
-            recommendations.append({
-                'rank': i,
-                'key': strategy_key,
-                'name': strategy_info.get('name', ''),
-                'category': strategy_info.get('category', ''),
-                'description': strategy_info.get('description', ''),
-                'best_for': strategy_info.get('best_for', ''),
-                'score': results['all_scores'].get(strategy_key, 0)
-            })
+        # Save as the user's next quiz version
+        snapshot, created = save_snapshot(current_user_id, responses, results)
+        if created:
+            db.session.commit()
 
         return jsonify({
             'success': True,
-            'recommendations': recommendations,
+            'quiz_id': snapshot.id,
+            'version': snapshot.version,
+            'recommendations': build_recommendations(results['top_recommendations'], results['all_scores']),
             'detailed_results': results['detailed_results'],
             'all_scores': results['all_scores']
         }), 200
@@ -116,47 +87,57 @@ def submit_quiz(current_user_id):
         return jsonify({'error': 'Failed to process quiz submission'}), 500
 
 
+@exit_quiz_bp.route('/what-if', methods=['POST'])
+@token_required
+def quiz_what_if(current_user_id):
+    """
+    Show how each alternative answer would move every strategy's score
+
+    Uses the posted responses, or the user's saved quiz when none are sent.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        responses = data.get('responses')
+
+        if responses is None:
+            responses = latest_responses(current_user_id)
+
+            if responses is None:
+                return jsonify({
+                    'success': False,
+                    'message': 'No quiz results found. Please take the quiz first.'
+                }), 404
+
+        if not isinstance(responses, dict):
+            return jsonify({'error': 'responses must be an object of question id to answer'}), 400
+
+        return jsonify({
+            'success': True,
+            **answer_sensitivity(responses)
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error building quiz what-if table: {e}")
+        return jsonify({'error': 'Failed to build what-if table'}), 500
+
+
 @exit_quiz_bp.route('/results', methods=['GET'])
 @token_required
 def get_quiz_results(current_user_id):
-    """Get user's most recent quiz results"""
+    """Get user's most recent quiz results, or a given ?version="""
     try:
-        quiz_response = ExitQuizResponse.query.filter_by(
-            user_id=current_user_id
-        ).order_by(ExitQuizResponse.created_at.desc()).first()
+        version = request.args.get('version', type=int)
+        payload = results_payload(current_user_id, version)
 
-        if not quiz_response:
+        if payload is None:
             return jsonify({
                 'success': False,
                 'message': 'No quiz results found. Please take the quiz first.'
             }), 404
 
-        # Build recommendations with full details
-        recommendations = []
-        for i, strategy_key in enumerate([
-            quiz_response.top_recommendation,
-            quiz_response.second_recommendation,
-            quiz_response.third_recommendation
-        ], 1):
-            if strategy_key:
-                strategy_info = EXIT_STRATEGIES.get(strategy_key, {})
-                all_scores = json.loads(quiz_response.all_scores) if quiz_response.all_scores else {}
-                recommendations.append({
-                    'rank': i,
-                    'key': strategy_key,
-                    'name': strategy_info.get('name', ''),
-                    'category': strategy_info.get('category', ''),
-                    'description': strategy_info.get('description', ''),
-                    'best_for': strategy_info.get('best_for', ''),
-                    'score': all_scores.get(strategy_key, 0)
-                })
-
         return jsonify({
             'success': True,
-            'quiz_id': quiz_response.id,
-            'recommendations': recommendations,
-            'completed_at': quiz_response.created_at.isoformat() if quiz_response.created_at else None,
-            'all_scores': json.loads(quiz_response.all_scores) if quiz_response.all_scores else {}
+            **payload
         }), 200
 
     except Exception as e:
@@ -167,25 +148,11 @@ def get_quiz_results(current_user_id):
 @exit_quiz_bp.route('/history', methods=['GET'])
 @token_required
 def get_quiz_history(current_user_id):
-    """Get user's quiz history"""
+    """Get user's quiz history, newest version first"""
     try:
-        quiz_responses = ExitQuizResponse.query.filter_by(
-            user_id=current_user_id
-        ).order_by(ExitQuizResponse.created_at.desc()).all()
-
-        history = []
-        for quiz_response in quiz_responses:
-            history.append({
-                'id': quiz_response.id,
-                'top_recommendation': quiz_response.top_recommendation,
-                'second_recommendation': quiz_response.second_recommendation,
-                'third_recommendation': quiz_response.third_recommendation,
-                'completed_at': quiz_response.created_at.isoformat() if quiz_response.created_at else None
-            })
-
         return jsonify({
             'success': True,
-            'history': history
+            'history': quiz_history(current_user_id)
         }), 200
 
     except Exception as e:
@@ -3,17 +3,100 @@ PDF Report Routes for ExitReady Pro
 Handles generation and download of valuation reports
 """
 
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, Response, current_app, request, jsonify, send_file
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import User, Business, Valuation
-from app.services.pdf_generator import ValuationPDFGenerator
+from app.models.assessment import Assessment
+from app.routes.assessment import assessment_pdf_filename, build_assessment_pdf_data
+from app.services.pdf_cache import get_pdf_cache, report_cache_key
+from app.services.pdf_jobs import DONE, FAILED, FINISHED, JobLimitError, get_job_queue, job_status, render_report
+from app.services.report_packs import advisor_client_ids, current_period, iter_packs, write_packs_zip
 from app import db
+import io
+import json
+import logging
 import os
 import tempfile
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 pdf_bp = Blueprint('pdf', __name__)
 
+# Valuation report kinds and the suffix of their download names
+VALUATION_REPORTS = {
+    'advanced-valuation': 'valuation_report',
+    'basic-valuation': 'quick_valuation'
+}
+
+# How soon a job status stream reconnects while the job is unfinished
+JOB_STREAM_RETRY_MS = 1000
+
+# Renders larger than this spill from memory to an anonymous temp file
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+
+def _valuation_payload(data):
+    """Render payload of a valuation report request"""
+    payload = {
+        'valuation_data': data.get('valuation_data', {}),
+        'business_profile': data.get('business_profile', {})
+    }
+    if data.get('vector_charts'):
+        # Part of the payload so vector and PNG chart renders are cached apart
+        payload['vector_charts'] = True
+    return payload
+
+
+def _send_pdf(source, download_name, cache_key):
+    """
+    Send a PDF from a cache path or an in-memory buffer
+
+    Paths go through send_file, which lets the WSGI server use its file
+    wrapper (sendfile); buffers are sent without another copy.
+    """
+    response = send_file(
+        source,
+        as_attachment=True,
+        download_name=download_name,
+        mimetype='application/pdf',
+        etag=cache_key
+    )
+    response.headers['Cache-Control'] = 'private, no-cache'
+    if isinstance(source, io.BytesIO):
+        response.content_length = source.getbuffer().nbytes
+    return response
+
+
+def send_report(kind, payload, download_name):
+    """
+    Serve a report from the PDF cache, rendering it on a miss
+
+    A client that already holds the report (If-None-Match) gets a 304
+    without it being rendered or read.
+    """
+    cache_key = report_cache_key(kind, payload)
+    if cache_key in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(cache_key)
+        return response
+
+    cache = get_pdf_cache()
+    path = cache.get(cache_key)
+    if path is not None:
+        return _send_pdf(path, download_name, cache_key)
+
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+        render_report(kind, payload, spool)
+        try:
+            path = cache.put(cache_key, spool)
+        except OSError as e:
+            logger.warning(f"Could not cache rendered PDF: {e}")
+            spool.seek(0)
+            return _send_pdf(io.BytesIO(spool.read()), download_name, cache_key)
+    return _send_pdf(path, download_name, cache_key)
+
+
 @pdf_bp.route('/api/pdf/advanced-valuation', methods=['POST'])
 @jwt_required()
 def generate_advanced_valuation_pdf():
@@ -27,29 +110,13 @@ def generate_advanced_valuation_pdf():
         
         # Get request data
         data = request.get_json()
-        valuation_data = data.get('valuation_data', {})
         business_profile = data.get('business_profile', {})
         
-        # Create PDF generator
-        pdf_gen = ValuationPDFGenerator()
-        
-        # Generate unique filename
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"advanced_valuation_{timestamp}.pdf"
-        
-        # Use temporary directory
-        temp_dir = tempfile.gettempdir()
-        filepath = os.path.join(temp_dir, filename)
-        
-        # Generate PDF
-        pdf_gen.generate_advanced_report(valuation_data, business_profile, filepath)
-        
-        # Send file
-        return send_file(
-            filepath,
-            as_attachment=True,
-            download_name=f"{business_profile.get('business_name', 'business')}_valuation_report.pdf",
-            mimetype='application/pdf'
+        # Generate PDF (or reuse the cached one)
+        return send_report(
+            'advanced-valuation',
+            _valuation_payload(data),
+            f"{business_profile.get('business_name', 'business')}_valuation_report.pdf"
         )
         
     except Exception as e:
@@ -72,29 +139,13 @@ def generate_basic_valuation_pdf():
         
         # Get request data
         data = request.get_json()
-        valuation_data = data.get('valuation_data', {})
         business_profile = data.get('business_profile', {})
         
-        # Create PDF generator
-        pdf_gen = ValuationPDFGenerator()
-        
-        # Generate unique filename
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"quick_valuation_{timestamp}.pdf"
-        
-        # Use temporary directory
-        temp_dir = tempfile.gettempdir()
-        filepath = os.path.join(temp_dir, filename)
-        
-        # Generate PDF
-        pdf_gen.generate_basic_report(valuation_data, business_profile, filepath)
-        
-        # Send file
-        return send_file(
-            filepath,
-            as_attachment=True,
-            download_name=f"{business_profile.get('business_name', 'business')}_quick_valuation.pdf",
-            mimetype='application/pdf'
+        # Generate PDF (or reuse the cached one)
+        return send_report(
+            'basic-valuation',
+            _valuation_payload(data),
+            f"{business_profile.get('business_name', 'business')}_quick_valuation.pdf"
         )
         
     except Exception as e:
@@ -200,3 +251,165 @@ def get_valuation_history():
     except Exception as e:
         print(f"Error fetching valuation history: {str(e)}")
         return jsonify({'error': f'Failed to fetch valuations: {str(e)}'}), 500
+
+
+def _job_response(job, status_code=200):
+    response = jsonify({
+        'success': True,
+        **job_status(job),
+        'status_url': f"/api/pdf/jobs/{job['job_id']}",
+        'download_url': f"/api/pdf/jobs/{job['job_id']}/download"
+    })
+    response.status_code = status_code
+    return response
+
+
+@pdf_bp.route('/api/pdf/jobs', methods=['POST'])
+@jwt_required()
+def submit_pdf_job():
+    """
+    Queue a PDF report and return its job id straight away
+
+    Body: {"kind": "advanced-valuation" | "basic-valuation", "valuation_data", "business_profile"}
+       or {"kind": "assessment", "assessment_id"}
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        data = request.get_json() or {}
+        kind = data.get('kind')
+
+        if kind == 'assessment':
+            assessment = Assessment.query.filter_by(id=data.get('assessment_id'), user_id=user_id).first()
+            if not assessment:
+                return jsonify({'error': 'Assessment not found'}), 404
+            payload = {'assessment_data': build_assessment_pdf_data(assessment)}
+            filename = assessment_pdf_filename(assessment)
+        elif kind in VALUATION_REPORTS:
+            business_profile = data.get('business_profile', {})
+            payload = _valuation_payload(data)
+            filename = f"{business_profile.get('business_name', 'business')}_{VALUATION_REPORTS[kind]}.pdf"
+        else:
+            return jsonify({'error': f"Unknown report kind: {kind}"}), 400
+
+        job = get_job_queue().submit(kind, payload, user_id, filename)
+
+        response = _job_response(job, 202)
+        response.headers['Location'] = f"/api/pdf/jobs/{job['job_id']}"
+        return response
+
+    except JobLimitError as e:
+        response = jsonify({'error': str(e)})
+        response.status_code = e.status_code
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response
+
+    except Exception as e:
+        logger.error(f"Error queueing PDF job: {e}")
+        return jsonify({'error': 'Failed to queue PDF report'}), 500
+
+
+@pdf_bp.route('/api/pdf/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def get_pdf_job(job_id):
+    """
+    Job status
+
+    With ?stream=1 or Accept: text/event-stream the status is sent as a
+    single server-sent event with a retry interval rather than held open
+    until the job finishes, so a slow render never pins a request thread;
+    EventSource reconnects on its own, and once the client has seen the
+    finished status (Last-Event-ID) it gets 204, which stops it.
+    """
+    job = get_job_queue().get(job_id, int(get_jwt_identity()))
+
+    if not job:
+        return jsonify({'error': 'PDF job not found'}), 404
+
+    if request.args.get('stream') or 'text/event-stream' in request.headers.get('Accept', ''):
+        finished = job['status'] in FINISHED
+        if finished and request.headers.get('Last-Event-ID') == job['status']:
+            return '', 204
+        event = f"id: {job['status']}\ndata: {json.dumps(job_status(job))}\n\n"
+        if not finished:
+            event = f"retry: {JOB_STREAM_RETRY_MS}\n{event}"
+        return Response(event, mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+    return _job_response(job)
+
+
+@pdf_bp.route('/api/pdf/jobs/<job_id>/download', methods=['GET'])
+@jwt_required()
+def download_pdf_job(job_id):
+    """Download the PDF of a finished job"""
+    job = get_job_queue().get(job_id, int(get_jwt_identity()))
+
+    if not job:
+        return jsonify({'error': 'PDF job not found'}), 404
+    if job['status'] == FAILED:
+        return jsonify({'error': 'Failed to generate PDF'}), 500
+    if job['status'] != DONE:
+        return jsonify({'error': 'PDF is not ready yet', 'status': job['status']}), 409
+
+    if job['cache_key'] is None:
+        # Batch job: its file sits next to the job record
+        path = get_job_queue().jobs.output_path(job['job_id'])
+        if not os.path.exists(path):
+            return jsonify({'error': 'Report is no longer available, generate it again'}), 410
+        return send_file(path, as_attachment=True, download_name=job['filename'], mimetype=job['mimetype'])
+
+    path = get_pdf_cache().get(job['cache_key'])
+    if path is None:
+        return jsonify({'error': 'PDF is no longer available, generate it again'}), 410
+    return _send_pdf(path, job['filename'], job['cache_key'])
+
+
+@pdf_bp.route('/api/pdf/book-of-business', methods=['POST'])
+@jwt_required()
+def submit_book_of_business():
+    """
+    Queue a ZIP of this quarter's client pack for every client of the advisor
+
+    Clients are the users who granted the caller's account access to their
+    reports. Returns a job like POST /api/pdf/jobs: its status carries
+    progress (done/total/failed packs) and its download is the ZIP.
+    """
+    try:
+        user_id = int(get_jwt_identity())
+        client_ids = advisor_client_ids(user_id)
+        if not client_ids:
+            return jsonify({'error': 'No clients have granted you access to their reports'}), 404
+
+        app = current_app._get_current_object()
+        queue = get_job_queue()
+        period = current_period()
+
+        def build(output, executor, progress):
+            with app.app_context():
+                write_packs_zip(
+                    iter_packs(client_ids, period=period),
+                    output,
+                    workers=queue.workers,
+                    cache=get_pdf_cache(app),
+                    total=len(client_ids),
+                    progress=progress,
+                    pool=executor
+                )
+
+        job = queue.submit_batch(
+            'book-of-business', user_id, f"book_of_business_{period}.zip", 'application/zip',
+            build, total=len(client_ids)
+        )
+
+        response = _job_response(job, 202)
+        response.headers['Location'] = f"/api/pdf/jobs/{job['job_id']}"
+        return response
+
+    except JobLimitError as e:
+        response = jsonify({'error': str(e)})
+        response.status_code = e.status_code
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response
+
+    except Exception as e:
+        logger.error(f"Error queueing book of business: {e}")
+        return jsonify({'error': 'Failed to queue book of business report'}), 500
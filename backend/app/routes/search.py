@@ -0,0 +1,56 @@
+from flask import Blueprint, request, jsonify
+from app.routes.assessment import token_required
+from app.services.search import SEARCH_TYPES, search
+from app.utils.pagination import get_page_args
+
+search_bp = Blueprint('search', __name__)
+
+DEFAULT_SEARCH_PER_PAGE = 20
+MIN_QUERY_LENGTH = 2
+
+
+@search_bp.route('/api/search', methods=['GET'])
+@token_required
+def search_content(current_user):
+    """
+    Ranked full-text search over the user's tasks and the question guidance
+
+    Query parameters:
+        q: search text (every word must match, as a prefix)
+        type: comma-separated result types (task, question); default all
+        page, per_page: paging (default page 1, 20 per page)
+    """
+    try:
+        query = (request.args.get('q') or '').strip()
+        if len(query) < MIN_QUERY_LENGTH:
+            return jsonify({'success': False, 'error': f'q must be at least {MIN_QUERY_LENGTH} characters'}), 400
+
+        types = [t for t in (request.args.get('type') or '').split(',') if t]
+        unknown = set(types) - set(SEARCH_TYPES)
+        if unknown:
+            return jsonify({'success': False, 'error': f'type must be one of: {", ".join(SEARCH_TYPES)}'}), 400
+
+        page, per_page = get_page_args()
+        page = page or 1
+        per_page = per_page or DEFAULT_SEARCH_PER_PAGE
+
+        results, total = search(current_user, query, types or None, page, per_page)
+
+        return jsonify({
+            'success': True,
+            'query': query,
+            'results': results,
+            'pagination': {
+                'page': page,
+                'per_page': per_page,
+                'total': total,
+                'pages': (total + per_page - 1) // per_page
+            }
+        })
+
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    except Exception as e:
+        print(f"Error searching: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
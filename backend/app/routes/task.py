@@ -1,87 +1,124 @@
 from flask import Blueprint, request, jsonify
+from sqlalchemy import insert, update
 from app.models import db
-from app.models.task import Task
+from app.models.task import (
+    TASK_BAR_END, TASK_BAR_START, Task, TaskDependency, current_schedule, load_dependency_graph,
+    reschedule_user_tasks
+)
 from app.models.assessment import AssessmentQuestion
 from app.routes.assessment import token_required
-from datetime import datetime
+from app.services.task_catalog import (
+    get_task_catalog,
+    materialize_template,
+    overlay_user_tasks,
+    task_with_question,
+    template_id_from_task_id,
+    virtual_task,
+    virtual_task_id
+)
+from app.services.task_scheduler import critical_path, topological_order, would_create_cycle
+from app.utils.pagination import sort_records, paginate_list
+from datetime import date, datetime, timedelta
 
 task_bp = Blueprint('task', __name__)
 
+PRIORITY_RANK = {'high': 3, 'medium': 2, 'low': 1}
+
+# Sortable fields for task lists (the list is merged in memory, so these are key functions)
+TASK_SORT_KEYS = {
+    'created_at': lambda task: task['created_at'],
+    'updated_at': lambda task: task['updated_at'],
+    'start_date': lambda task: task['start_date'],
+    'due_date': lambda task: task['due_date'],
+    'title': lambda task: task['title'],
+    'status': lambda task: task['status'],
+    'priority': lambda task: PRIORITY_RANK.get(task['priority'], 0),
+    'question_id': lambda task: task['question_id']
+}
+
+
+# Fields that move a task on the dependency schedule
+SCHEDULE_FIELDS = ('start_date', 'due_date', 'status')
+
+
+def get_user_task(current_user, task_id):
+    """Stored task for an id, copying system tasks (negative ids) to the user first"""
+    template_id = template_id_from_task_id(task_id)
+    if template_id is not None:
+        return materialize_template(current_user, template_id)
+    return Task.query.filter_by(id=task_id, user_id=current_user).first()
+
+
 @task_bp.route('/api/tasks', methods=['GET'])
 @token_required
 def get_tasks(current_user):
-    """Get all tasks for the current user with optional filtering"""
+    """Get all tasks for the current user with optional filtering, sorting and paging"""
     try:
         # Get query parameters for filtering
         status = request.args.get('status')
         question_id = request.args.get('question_id')
         priority = request.args.get('priority')
 
-        # Build query
-        query = Task.query.filter_by(user_id=current_user)
+        # Only the user's own rows come from the database; untouched system
+        # tasks are overlaid from the shared template catalog
+        user_tasks = Task.query.options(db.joinedload(Task.question))\
+            .filter_by(user_id=current_user).all()
+        tasks = overlay_user_tasks(get_task_catalog(), int(current_user), user_tasks)
 
         if status:
-            query = query.filter_by(status=status)
+            tasks = [task for task in tasks if task['status'] == status]
         if question_id:
-            query = query.filter_by(question_id=question_id)
+            tasks = [task for task in tasks if task['question_id'] == question_id]
         if priority:
-            query = query.filter_by(priority=priority)
-
-        tasks = query.order_by(Task.created_at.desc()).all()
-
-        # Get question details for each task
-        tasks_with_questions = []
-        for task in tasks:
-            task_dict = task.to_dict()
-            question = AssessmentQuestion.query.filter_by(question_id=task.question_id).first()
-            if question:
-                task_dict['question'] = {
-                    'question_id': question.question_id,
-                    'subject': question.subject,
-                    'category': question.category,
-                    'category_display': question.category_display,
-                    'activity_type': question.activity_type,
-                    'intangible_asset_type': question.intangible_asset_type,
-                    'question_text': question.question_text
-                }
-            tasks_with_questions.append(task_dict)
+            tasks = [task for task in tasks if task['priority'] == priority]
 
-        return jsonify({
+        tasks = sort_records(tasks, TASK_SORT_KEYS, 'id', default_sort='created_at')
+        tasks, pagination = paginate_list(tasks)
+
+        response = {
             'success': True,
-            'tasks': tasks_with_questions
-        })
+            'tasks': tasks
+        }
+        if pagination:
+            response['pagination'] = pagination
+
+        return jsonify(response)
+
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
 
     except Exception as e:
         print(f"Error fetching tasks: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
-@task_bp.route('/api/tasks/<int:task_id>', methods=['GET'])
+@task_bp.route('/api/tasks/<int(signed=True):task_id>', methods=['GET'])
 @token_required
 def get_task(current_user, task_id):
-    """Get a specific task"""
+    """Get a specific task (negative ids are untouched system tasks)"""
     try:
-        task = Task.query.filter_by(id=task_id, user_id=current_user).first()
+        template_id = template_id_from_task_id(task_id)
+        query = Task.query.options(db.joinedload(Task.question)).filter_by(user_id=current_user)
+
+        if template_id is not None:
+            task = query.filter_by(template_id=template_id).first()
+            if not task:
+                template = get_task_catalog()['by_id'].get(template_id)
+                if not template:
+                    return jsonify({'success': False, 'error': 'Task not found'}), 404
+                return jsonify({
+                    'success': True,
+                    'task': virtual_task(template, int(current_user))
+                })
+        else:
+            task = query.filter_by(id=task_id).first()
 
         if not task:
             return jsonify({'success': False, 'error': 'Task not found'}), 404
 
-        task_dict = task.to_dict()
-        question = AssessmentQuestion.query.filter_by(question_id=task.question_id).first()
-        if question:
-            task_dict['question'] = {
-                'question_id': question.question_id,
-                'subject': question.subject,
-                'category': question.category,
-                'category_display': question.category_display,
-                'activity_type': question.activity_type,
-                'intangible_asset_type': question.intangible_asset_type,
-                'question_text': question.question_text
-            }
-
         return jsonify({
             'success': True,
-            'task': task_dict
+            'task': task_with_question(task)
         })
 
     except Exception as e:
@@ -135,12 +172,12 @@ def create_task(current_user):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
-@task_bp.route('/api/tasks/<int:task_id>', methods=['PUT'])
+@task_bp.route('/api/tasks/<int(signed=True):task_id>', methods=['PUT'])
 @token_required
 def update_task(current_user, task_id):
-    """Update an existing task"""
+    """Update an existing task; editing a system task copies it to the user first"""
     try:
-        task = Task.query.filter_by(id=task_id, user_id=current_user).first()
+        task = get_user_task(current_user, task_id)
 
         if not task:
             return jsonify({'success': False, 'error': 'Task not found'}), 404
@@ -170,12 +207,19 @@ def update_task(current_user, task_id):
 
         task.updated_at = datetime.utcnow()
 
+        # Push dependent tasks along when this one moves
+        rescheduled = []
+        if any(field in data for field in SCHEDULE_FIELDS):
+            db.session.flush()
+            rescheduled = [t for t in reschedule_user_tasks(current_user, {task.id}) if t.id != task.id]
+
         db.session.commit()
 
         return jsonify({
             'success': True,
             'message': 'Task updated successfully',
-            'task': task.to_dict()
+            'task': task.to_dict(),
+            'rescheduled_tasks': [t.to_dict() for t in rescheduled]
         })
 
     except Exception as e:
@@ -184,17 +228,35 @@ def update_task(current_user, task_id):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
-@task_bp.route('/api/tasks/<int:task_id>', methods=['DELETE'])
+@task_bp.route('/api/tasks/<int(signed=True):task_id>', methods=['DELETE'])
 @token_required
 def delete_task(current_user, task_id):
     """Delete a task"""
     try:
+        if template_id_from_task_id(task_id) is not None:
+            return jsonify({
+                'success': False,
+                'error': 'System tasks cannot be deleted; mark them not relevant instead'
+            }), 400
+
         task = Task.query.filter_by(id=task_id, user_id=current_user).first()
 
         if not task:
             return jsonify({'success': False, 'error': 'Task not found'}), 404
 
+        dependencies = TaskDependency.query.filter(
+            db.or_(TaskDependency.task_id == task.id, TaskDependency.depends_on_id == task.id)
+        ).all()
+        neighbours = {d.task_id for d in dependencies} | {d.depends_on_id for d in dependencies}
+        neighbours.discard(task.id)
+
+        for dependency in dependencies:
+            db.session.delete(dependency)
         db.session.delete(task)
+        db.session.flush()
+
+        if neighbours:
+            reschedule_user_tasks(current_user, neighbours)
         db.session.commit()
 
         return jsonify({
@@ -208,52 +270,644 @@ def delete_task(current_user, task_id):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@task_bp.route('/api/tasks/<int(signed=True):task_id>/dependencies', methods=['GET'])
+@token_required
+def get_task_dependencies(current_user, task_id):
+    """Prerequisites of a task and the tasks waiting on it"""
+    try:
+        if template_id_from_task_id(task_id) is not None:
+            # Untouched system tasks cannot have dependencies yet
+            return jsonify({'success': True, 'depends_on': [], 'blocking': []})
+
+        task = Task.query.filter_by(id=task_id, user_id=current_user).first()
+        if not task:
+            return jsonify({'success': False, 'error': 'Task not found'}), 404
+
+        dependencies = TaskDependency.query.filter(
+            db.or_(TaskDependency.task_id == task.id, TaskDependency.depends_on_id == task.id)
+        ).all()
+        related_ids = {d.task_id for d in dependencies} | {d.depends_on_id for d in dependencies}
+        related = {t.id: t for t in Task.query.filter(Task.id.in_(related_ids)).all()} if related_ids else {}
+
+        return jsonify({
+            'success': True,
+            'task': task.to_dict(),
+            'depends_on': [related[d.depends_on_id].to_dict() for d in dependencies if d.task_id == task.id],
+            'blocking': [related[d.task_id].to_dict() for d in dependencies if d.depends_on_id == task.id]
+        })
+
+    except Exception as e:
+        print(f"Error fetching task dependencies: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@task_bp.route('/api/tasks/<int(signed=True):task_id>/dependencies', methods=['POST'])
+@token_required
+def add_task_dependency(current_user, task_id):
+    """Make a task wait for another task to finish"""
+    try:
+        data = request.get_json() or {}
+        if data.get('depends_on_id') is None:
+            return jsonify({'success': False, 'error': 'depends_on_id is required'}), 400
+
+        try:
+            depends_on_id = int(data['depends_on_id'])
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': 'depends_on_id must be a task id'}), 400
+
+        task = get_user_task(current_user, task_id)
+        prerequisite = get_user_task(current_user, depends_on_id)
+        if not task or not prerequisite:
+            return jsonify({'success': False, 'error': 'Task not found'}), 404
+        db.session.flush()
+
+        if task.id == prerequisite.id:
+            return jsonify({'success': False, 'error': 'A task cannot depend on itself'}), 400
+
+        _, successors = load_dependency_graph(current_user)
+        if prerequisite.id in successors and task.id in successors[prerequisite.id]:
+            return jsonify({'success': False, 'error': 'Dependency already exists'}), 400
+        if would_create_cycle(successors, task.id, prerequisite.id):
+            return jsonify({'success': False, 'error': 'Dependency would create a cycle'}), 400
+
+        dependency = TaskDependency(user_id=task.user_id, task_id=task.id, depends_on_id=prerequisite.id)
+        db.session.add(dependency)
+        db.session.flush()
+
+        rescheduled = reschedule_user_tasks(current_user, {task.id, prerequisite.id})
+        db.session.commit()
+
+        return jsonify({
+            'success': True,
+            'message': 'Dependency added successfully',
+            'dependency': dependency.to_dict(),
+            'rescheduled_tasks': [t.to_dict() for t in rescheduled]
+        })
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error adding task dependency: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@task_bp.route('/api/tasks/<int:task_id>/dependencies/<int:depends_on_id>', methods=['DELETE'])
+@token_required
+def delete_task_dependency(current_user, task_id, depends_on_id):
+    """Remove a dependency between two tasks"""
+    try:
+        dependency = TaskDependency.query.filter_by(
+            user_id=current_user, task_id=task_id, depends_on_id=depends_on_id
+        ).first()
+        if not dependency:
+            return jsonify({'success': False, 'error': 'Dependency not found'}), 404
+
+        db.session.delete(dependency)
+        db.session.flush()
+
+        rescheduled = reschedule_user_tasks(current_user, {task_id, depends_on_id})
+        db.session.commit()
+
+        return jsonify({
+            'success': True,
+            'message': 'Dependency removed successfully',
+            'rescheduled_tasks': [t.to_dict() for t in rescheduled]
+        })
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error removing task dependency: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+def _schedule_dates(task, values):
+    """Task dict date fields for a schedule computed in memory"""
+    fields = {'latest_start': date.fromordinal(values['ls']).isoformat()}
+    if task.status != 'completed':
+        fields['start_date'] = date.fromordinal(values['es']).isoformat()
+        fields['due_date'] = date.fromordinal(values['ef']).isoformat()
+    slack_days = values['ls'] - values['es']
+    fields['slack_days'] = slack_days
+    fields['on_critical_path'] = slack_days <= 0 and task.status != 'completed'
+    return fields
+
+
+@task_bp.route('/api/tasks/schedule', methods=['GET'])
+@token_required
+def get_task_schedule(current_user):
+    """Dependency plan in topological order with slack and the critical path"""
+    try:
+        predecessors, successors = load_dependency_graph(current_user)
+        graph_ids = set(predecessors) | set(successors)
+        if not graph_ids:
+            return jsonify({'success': True, 'tasks': [], 'critical_path': [], 'finish_date': None})
+
+        tasks = {t.id: t for t in Task.query.filter(Task.user_id == current_user, Task.id.in_(graph_ids)).all()}
+
+        # Read-only: a plan that was never stored is computed for this response only
+        schedule, stored = current_schedule(tasks, predecessors, successors)
+
+        completed = {task_id for task_id, t in tasks.items() if t.status == 'completed'}
+        order = topological_order(tasks, predecessors, successors)
+
+        plan = []
+        for task_id in order:
+            task_dict = tasks[task_id].to_dict()
+            if not stored:
+                task_dict.update(_schedule_dates(tasks[task_id], schedule[task_id]))
+            task_dict['depends_on'] = sorted(predecessors.get(task_id, []))
+            plan.append(task_dict)
+
+        return jsonify({
+            'success': True,
+            'tasks': plan,
+            'critical_path': critical_path(schedule, predecessors, successors, completed),
+            'finish_date': date.fromordinal(max(values['lf'] for values in schedule.values())).isoformat()
+        })
+
+    except Exception as e:
+        print(f"Error fetching task schedule: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# Default and maximum timeline windows
+TIMELINE_DAYS_BEFORE = 30
+TIMELINE_DAYS_AFTER = 90
+TIMELINE_MAX_DAYS = 3 * 366
+UNCATEGORIZED = 'uncategorized'
+
+
+def _timeline_window():
+    """
+    Read the ?start=/?end= window (ISO dates), defaulting to around today
+    Raises ValueError on invalid or oversized windows
+    """
+    today = datetime.utcnow().date()
+    try:
+        start = date.fromisoformat(request.args['start']) if request.args.get('start') \
+            else today - timedelta(days=TIMELINE_DAYS_BEFORE)
+        end = date.fromisoformat(request.args['end']) if request.args.get('end') \
+            else start + timedelta(days=TIMELINE_DAYS_BEFORE + TIMELINE_DAYS_AFTER)
+    except ValueError:
+        raise ValueError('start and end must be dates in YYYY-MM-DD format')
+
+    if end < start:
+        raise ValueError('end must not be before start')
+    if (end - start).days > TIMELINE_MAX_DAYS:
+        raise ValueError(f'window must not exceed {TIMELINE_MAX_DAYS} days')
+
+    return start, end
+
+
+def _overlaps_window(start, end):
+    """
+    Tasks whose timeline bar overlaps the window; undated tasks never match
+
+    Written as plain ranges on the COALESCEd bar dates so that, with the
+    user_id filter, ix_tasks_user_span serves it as an index range scan.
+    """
+    return db.and_(TASK_BAR_START <= end, TASK_BAR_END >= start)
+
+
+def _timeline_group_columns(group_by):
+    """(key, label) columns for a timeline grouping"""
+    if group_by == 'question':
+        return Task.question_id, AssessmentQuestion.subject
+    if group_by == 'category':
+        return AssessmentQuestion.category, AssessmentQuestion.category_display
+    raise ValueError('group_by must be category or question')
+
+
+@task_bp.route('/api/tasks/timeline', methods=['GET'])
+@token_required
+def get_task_timeline(current_user):
+    """
+    Gantt data for the scheduled tasks that overlap a date window
+
+    Query parameters:
+        start, end: window bounds (YYYY-MM-DD)
+        group_by: category (default) or question
+        collapsed: comma-separated group keys returned as summary bars only
+    """
+    try:
+        start, end = _timeline_window()
+        group_by = request.args.get('group_by', 'category')
+        group_key, group_label = _timeline_group_columns(group_by)
+        collapsed = {key for key in request.args.get('collapsed', '').split(',') if key}
+
+        today = datetime.utcnow().date()
+        bar_start, bar_end = TASK_BAR_START, TASK_BAR_END
+        in_window = db.and_(Task.user_id == current_user, _overlaps_window(start, end))
+
+        # Summary bar for every group in the window
+        group_rows = db.session.query(
+            group_key,
+            group_label,
+            db.func.count(Task.id),
+            db.func.min(bar_start),
+            db.func.max(bar_end),
+            db.func.sum(db.case((Task.status == 'completed', 1), else_=0)),
+            db.func.sum(db.case((db.and_(Task.status != 'completed', Task.due_date < today), 1), else_=0))
+        ).outerjoin(
+            AssessmentQuestion, AssessmentQuestion.question_id == Task.question_id
+        ).filter(
+            in_window
+        ).group_by(
+            group_key, group_label
+        ).all()
+
+        groups = {}
+        for key, label, count, group_start, group_end, completed, overdue in group_rows:
+            key = key or UNCATEGORIZED
+            group = groups.setdefault(key, {
+                'key': key,
+                'label': label or key.replace('_', ' ').title(),
+                'count': 0,
+                'completed': 0,
+                'overdue': 0,
+                'start': group_start,
+                'end': group_end,
+                'collapsed': key in collapsed
+            })
+            group['count'] += count
+            group['completed'] += int(completed or 0)
+            group['overdue'] += int(overdue or 0)
+            group['start'] = min(group['start'], group_start)
+            group['end'] = max(group['end'], group_end)
+
+        # Individual bars only for the groups the chart has expanded
+        expanded = [key for key, group in groups.items() if not group['collapsed']]
+        if expanded:
+            named = [key for key in expanded if key != UNCATEGORIZED]
+            group_filter = group_key.in_(named)
+            if UNCATEGORIZED in expanded:
+                group_filter = db.or_(group_filter, group_key.is_(None))
+
+            task_rows = db.session.query(
+                Task.id,
+                Task.question_id,
+                Task.title,
+                Task.status,
+                Task.priority,
+                Task.is_system_task,
+                Task.start_date,
+                Task.due_date,
+                group_key
+            ).outerjoin(
+                AssessmentQuestion, AssessmentQuestion.question_id == Task.question_id
+            ).filter(
+                in_window, group_filter
+            ).order_by(
+                bar_start, Task.id
+            ).all()
+
+            for row in task_rows:
+                groups[row[-1] or UNCATEGORIZED].setdefault('tasks', []).append({
+                    'id': row.id,
+                    'question_id': row.question_id,
+                    'title': row.title,
+                    'status': row.status,
+                    'priority': row.priority,
+                    'is_system_task': row.is_system_task,
+                    'start_date': row.start_date.isoformat() if row.start_date else None,
+                    'due_date': row.due_date.isoformat() if row.due_date else None
+                })
+
+        ordered = sorted(groups.values(), key=lambda group: (group['start'], group['key']))
+        for group in ordered:
+            group['progress'] = round(group['completed'] / group['count'] * 100, 1) if group['count'] else 0
+            group['start'] = group['start'].isoformat()
+            group['end'] = group['end'].isoformat()
+            if not group['collapsed']:
+                group.setdefault('tasks', [])
+
+        return jsonify({
+            'success': True,
+            'window': {'start': start.isoformat(), 'end': end.isoformat()},
+            'group_by': group_by,
+            'total': sum(group['count'] for group in ordered),
+            'groups': ordered
+        })
+
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    except Exception as e:
+        print(f"Error fetching task timeline: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+TASK_STATUSES = ['not_started', 'in_progress', 'under_review', 'completed', 'not_relevant']
+TASK_PRIORITIES = ['high', 'medium', 'low']
+
+
+def _empty_stats():
+    stats = {'total': 0, 'overdue': 0}
+    stats.update({status: 0 for status in TASK_STATUSES})
+    stats.update({f'{priority}_priority': 0 for priority in TASK_PRIORITIES})
+    return stats
+
+
+def _add_stats(stats, status, priority, count, overdue):
+    stats['total'] += count
+    stats['overdue'] += overdue
+    if status in TASK_STATUSES:
+        stats[status] += count
+    if priority in TASK_PRIORITIES:
+        stats[f'{priority}_priority'] += count
+
+
+def _finish_stats(stats):
+    relevant_tasks = stats['total'] - stats['not_relevant']
+    stats['relevant_tasks'] = relevant_tasks
+    stats['completion_rate'] = round(
+        (stats['completed'] / relevant_tasks * 100) if relevant_tasks > 0 else 0, 1
+    )
+    return stats
+
+
 @task_bp.route('/api/tasks/stats', methods=['GET'])
 @token_required
 def get_task_stats(current_user):
     """Get task statistics for the current user"""
     try:
-        total_tasks = Task.query.filter_by(user_id=current_user).count()
-        not_started = Task.query.filter_by(user_id=current_user, status='not_started').count()
-        in_progress = Task.query.filter_by(user_id=current_user, status='in_progress').count()
-        under_review = Task.query.filter_by(user_id=current_user, status='under_review').count()
-        completed = Task.query.filter_by(user_id=current_user, status='completed').count()
-        not_relevant = Task.query.filter_by(user_id=current_user, status='not_relevant').count()
-
-        # Calculate relevant tasks (exclude not_relevant)
-        relevant_tasks = total_tasks - not_relevant
-
-        # Get tasks by priority
-        high_priority = Task.query.filter_by(user_id=current_user, priority='high').count()
-        medium_priority = Task.query.filter_by(user_id=current_user, priority='medium').count()
-        low_priority = Task.query.filter_by(user_id=current_user, priority='low').count()
-
-        # Get overdue tasks
         today = datetime.utcnow().date()
-        overdue = Task.query.filter(
-            Task.user_id == current_user,
-            Task.status != 'completed',
-            Task.due_date < today
-        ).count()
+        overdue = db.case(
+            (db.and_(Task.status != 'completed', Task.due_date < today), 1),
+            else_=0
+        )
+
+        # One grouped aggregate; totals and breakdowns are folded from it
+        rows = db.session.query(
+            Task.template_id,
+            Task.question_id,
+            AssessmentQuestion.category,
+            AssessmentQuestion.category_display,
+            Task.status,
+            Task.priority,
+            db.func.count(Task.id),
+            db.func.sum(overdue)
+        ).outerjoin(
+            AssessmentQuestion, AssessmentQuestion.question_id == Task.question_id
+        ).filter(
+            Task.user_id == current_user
+        ).group_by(
+            Task.template_id,
+            Task.question_id,
+            AssessmentQuestion.category,
+            AssessmentQuestion.category_display,
+            Task.status,
+            Task.priority
+        ).all()
+
+        # Templates the user has not materialized count as not started and never overdue
+        materialized = {row[0] for row in rows if row[0] is not None}
+        untouched = [
+            (None, template['question_id'], template['question']['category'],
+             template['question']['category_display'], 'not_started', template['priority'], 1, 0)
+            for template in get_task_catalog()['templates']
+            if template['template_id'] not in materialized
+        ]
+
+        totals = _empty_stats()
+        by_question = {}
+        by_category = {}
+
+        for _, question_id, category, category_display, status, priority, count, overdue_count in rows + untouched:
+            overdue_count = int(overdue_count or 0)
+            _add_stats(totals, status, priority, count, overdue_count)
+
+            if question_id not in by_question:
+                by_question[question_id] = _empty_stats()
+                by_question[question_id]['category'] = category
+            _add_stats(by_question[question_id], status, priority, count, overdue_count)
+
+            category_key = category or 'uncategorized'
+            if category_key not in by_category:
+                by_category[category_key] = _empty_stats()
+                by_category[category_key]['category_display'] = category_display or 'Uncategorized'
+            _add_stats(by_category[category_key], status, priority, count, overdue_count)
+
+        stats = _finish_stats(totals)
+        stats['by_question'] = {key: _finish_stats(value) for key, value in by_question.items()}
+        stats['by_category'] = {key: _finish_stats(value) for key, value in by_category.items()}
 
         return jsonify({
             'success': True,
-            'stats': {
-                'total': total_tasks,
-                'not_started': not_started,
-                'in_progress': in_progress,
-                'under_review': under_review,
-                'completed': completed,
-                'not_relevant': not_relevant,
-                'relevant_tasks': relevant_tasks,
-                'high_priority': high_priority,
-                'medium_priority': medium_priority,
-                'low_priority': low_priority,
-                'overdue': overdue,
-                'completion_rate': round((completed / relevant_tasks * 100) if relevant_tasks > 0 else 0, 1)
-            }
+            'stats': stats
         })
 
     except Exception as e:
         print(f"Error fetching task stats: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# Fields a batch may change, and the most tasks one batch may touch
+BATCH_CHANGE_FIELDS = ('title', 'description', 'status', 'priority', 'start_date', 'due_date', 'notes')
+MAX_BATCH_SIZE = 500
+
+
+def _parse_batch_changes(changes):
+    """
+    Validated column values for a batch change set
+    Raises ValueError on unknown fields or invalid values
+    """
+    if not isinstance(changes, dict) or not changes:
+        raise ValueError('changes must be a non-empty object')
+
+    unknown = set(changes) - set(BATCH_CHANGE_FIELDS)
+    if unknown:
+        raise ValueError(f'Unknown task fields: {", ".join(sorted(unknown))}')
+
+    values = {}
+    for field, value in changes.items():
+        if field in ('start_date', 'due_date'):
+            try:
+                value = datetime.fromisoformat(value).date() if value else None
+            except (TypeError, ValueError):
+                raise ValueError(f'{field} must be a date in YYYY-MM-DD format')
+        elif field == 'status' and value not in TASK_STATUSES:
+            raise ValueError(f'status must be one of: {", ".join(TASK_STATUSES)}')
+        elif field == 'priority' and value not in TASK_PRIORITIES:
+            raise ValueError(f'priority must be one of: {", ".join(TASK_PRIORITIES)}')
+        elif field == 'title' and not value:
+            raise ValueError('Title is required')
+        values[field] = value
+    return values
+
+
+def _batch_filter_matches(task_filter, status, priority, question_id, category):
+    """Whether a task matches a batch filter ({ids} is handled by the caller)"""
+    return all([
+        'status' not in task_filter or status == task_filter['status'],
+        'priority' not in task_filter or priority == task_filter['priority'],
+        'question_id' not in task_filter or question_id == task_filter['question_id'],
+        'category' not in task_filter or category == task_filter['category']
+    ])
+
+
+@task_bp.route('/api/tasks:batch', methods=['PATCH'])
+@token_required
+def batch_update_tasks(current_user):
+    """
+    Apply changes to many tasks in one transaction
+
+    The body is either a list of per-task changes:
+        {"updates": [{"id": 12, "changes": {"due_date": "2025-03-01"}}, ...]}
+    or one change set for every task matching a filter:
+        {"filter": {"category": "financial"}, "changes": {"status": "not_relevant"}}
+    Filters may use ids, status, priority, question_id and category. Untouched
+    system tasks (negative ids) are copied to the user with the changes applied.
+    """
+    try:
+        data = request.get_json() or {}
+        catalog = get_task_catalog()
+        now = datetime.utcnow()
+
+        # Every stored task of the user, as plain columns, in one query
+        rows = db.session.query(
+            Task.id, Task.template_id, Task.status, Task.priority, Task.question_id,
+            Task.completed_at, AssessmentQuestion.category
+        ).outerjoin(
+            AssessmentQuestion, AssessmentQuestion.question_id == Task.question_id
+        ).filter(Task.user_id == current_user).all()
+        stored = {row.id: row for row in rows}
+        materialized = {row.template_id: row.id for row in rows if row.template_id is not None}
+
+        # Resolve the request into task id -> change set
+        targets = {}
+        if 'updates' in data:
+            if not isinstance(data['updates'], list):
+                raise ValueError('updates must be a list')
+            for item in data['updates']:
+                if not isinstance(item, dict) or not isinstance(item.get('id'), int):
+                    raise ValueError('each update needs an integer id and a changes object')
+                targets[item['id']] = _parse_batch_changes(item.get('changes'))
+        elif 'changes' in data:
+            changes = _parse_batch_changes(data['changes'])
+            task_filter = data.get('filter') or {}
+            unknown = set(task_filter) - {'ids', 'status', 'priority', 'question_id', 'category'}
+            if unknown:
+                raise ValueError(f'Unknown filter fields: {", ".join(sorted(unknown))}')
+            ids = set(task_filter['ids']) if 'ids' in task_filter else None
+
+            for row in rows:
+                if (ids is None or row.id in ids) and _batch_filter_matches(
+                        task_filter, row.status, row.priority, row.question_id, row.category):
+                    targets[row.id] = changes
+            for template in catalog['templates']:
+                task_id = virtual_task_id(template['template_id'])
+                if template['template_id'] in materialized or (ids is not None and task_id not in ids):
+                    continue
+                if _batch_filter_matches(task_filter, 'not_started', template['priority'],
+                                         template['question_id'], template['question']['category']):
+                    targets[task_id] = changes
+        else:
+            raise ValueError('Provide either updates or filter and changes')
+
+        if len(targets) > MAX_BATCH_SIZE:
+            raise ValueError(f'A batch may change at most {MAX_BATCH_SIZE} tasks')
+
+        # Virtual ids of already-copied system tasks refer to the stored copy
+        resolved = {}
+        new_templates = {}
+        for task_id, changes in targets.items():
+            template_id = template_id_from_task_id(task_id)
+            if template_id is None:
+                if task_id not in stored:
+                    return jsonify({'success': False, 'error': f'Task {task_id} not found'}), 404
+                resolved[task_id] = changes
+            elif template_id in materialized:
+                resolved[materialized[template_id]] = changes
+            elif template_id in catalog['by_id']:
+                new_templates[template_id] = changes
+            else:
+                return jsonify({'success': False, 'error': f'Task {task_id} not found'}), 404
+
+        # Copy untouched system tasks with their changes in one multi-row INSERT
+        if new_templates:
+            new_rows = []
+            for template_id, changes in new_templates.items():
+                template = catalog['by_id'][template_id]
+                row = {
+                    'user_id': int(current_user),
+                    'question_id': template['question_id'],
+                    'template_id': template_id,
+                    'title': template['title'],
+                    'description': template['description'],
+                    'priority': template['priority'],
+                    'status': 'not_started',
+                    'is_system_task': True,
+                    'start_date': None,
+                    'due_date': None,
+                    'notes': None,
+                    'completed_at': None,
+                    'created_at': now,
+                    'updated_at': now
+                }
+                row.update(changes)
+                if row['status'] == 'completed':
+                    row['completed_at'] = now
+                new_rows.append(row)
+            db.session.execute(insert(Task), new_rows)
+
+        # Tasks sharing a change set get one UPDATE ... WHERE id IN (...);
+        # the rest go out as a single executemany keyed by primary key
+        by_changes = {}
+        for task_id, changes in resolved.items():
+            by_changes.setdefault(tuple(sorted(changes.items())), []).append(task_id)
+
+        per_row = []
+        for key, task_ids in by_changes.items():
+            changes = dict(key)
+            if len(task_ids) > 1:
+                values = dict(changes, updated_at=now)
+                if 'status' in changes:
+                    values['completed_at'] = db.func.coalesce(Task.completed_at, now) \
+                        if changes['status'] == 'completed' else None
+                db.session.execute(
+                    update(Task).where(Task.user_id == current_user, Task.id.in_(task_ids)).values(**values),
+                    execution_options={'synchronize_session': False}
+                )
+            else:
+                task_id = task_ids[0]
+                values = dict(changes, id=task_id, updated_at=now)
+                if 'status' in changes:
+                    values['completed_at'] = (stored[task_id].completed_at or now) \
+                        if changes['status'] == 'completed' else None
+                per_row.append(values)
+        if per_row:
+            db.session.execute(update(Task), per_row)
+
+        updated_ids = set(resolved)
+        query = Task.query.options(db.joinedload(Task.question)).filter(Task.user_id == current_user)
+        if new_templates:
+            query = query.filter(db.or_(Task.id.in_(updated_ids), Task.template_id.in_(new_templates)))
+        else:
+            query = query.filter(Task.id.in_(updated_ids))
+        tasks = query.order_by(Task.id).all() if targets else []
+
+        # One incremental reschedule for the whole batch
+        rescheduled = []
+        if any(field in changes for changes in targets.values() for field in SCHEDULE_FIELDS):
+            task_ids = {task.id for task in tasks}
+            rescheduled = [t for t in reschedule_user_tasks(current_user, task_ids) if t.id not in task_ids]
+
+        # Serialize before committing; the commit expires every loaded row
+        response = {
+            'success': True,
+            'updated': len(tasks),
+            'tasks': [task_with_question(task) for task in tasks],
+            'rescheduled_tasks': [t.to_dict() for t in rescheduled]
+        }
+        db.session.commit()
+
+        return jsonify(response)
+
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error batch updating tasks: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
@@ -6,6 +6,7 @@ from flask import Blueprint, request, jsonify
 from app.models import db
 from app.models.wealth_gap import WealthGap
 from app.routes.assessment import token_required
+from app.services.wealth_projection import wealth_goal as calculate_wealth_goal, project_scenarios
 import logging
 
 logger = logging.getLogger(__name__)
@@ -110,25 +111,45 @@ def calculate_wealth_gap(current_user_id):
     try:
         data = request.get_json()
 
-        # Create temporary object for calculation
-        temp_gap = WealthGap()
-        temp_gap.wealth_goal_method = data.get('wealth_goal_method', 'single_number')
-        temp_gap.wealth_goal_amount = float(data.get('wealth_goal_amount', 0))
-        temp_gap.monthly_cash_need = float(data.get('monthly_cash_need', 0))
-        temp_gap.years_of_income = int(data.get('years_of_income', 20))
-        temp_gap.annual_inflation_rate = float(data.get('annual_inflation_rate', 3.0))
-        temp_gap.annual_return_rate = float(data.get('annual_return_rate', 7.0))
-        temp_gap.current_net_worth = float(data.get('current_net_worth', 0))
-
-        wealth_goal = temp_gap.calculate_wealth_goal()
-        wealth_gap = temp_gap.calculate_wealth_gap()
+        current_net_worth = float(data.get('current_net_worth', 0))
+        wealth_goal = calculate_wealth_goal(
+            data.get('wealth_goal_method', 'single_number'),
+            wealth_goal_amount=float(data.get('wealth_goal_amount', 0)),
+            monthly_cash_need=float(data.get('monthly_cash_need', 0)),
+            years_of_income=int(data.get('years_of_income', 20)),
+            annual_inflation_rate=float(data.get('annual_inflation_rate', 3.0)),
+            annual_return_rate=float(data.get('annual_return_rate', 7.0))
+        )
 
         return jsonify({
             'wealth_goal': wealth_goal,
-            'wealth_gap': wealth_gap,
-            'current_net_worth': temp_gap.current_net_worth
+            'wealth_gap': wealth_goal - current_net_worth,
+            'current_net_worth': current_net_worth
         }), 200
 
     except Exception as e:
         logger.error(f"Error calculating wealth gap: {e}")
         return jsonify({'error': 'Failed to calculate wealth gap'}), 500
+
+
+@wealth_gap_bp.route('/scenarios', methods=['POST'])
+@token_required
+def project_wealth_scenarios(current_user_id):
+    """
+    Monte Carlo projection of closing the wealth gap through the exit
+
+    Takes the /calculate inputs plus exit_value, years_to_exit,
+    annual_contribution, volatilities, exit_tax_rate,
+    transaction_cost_rate, n_scenarios and seed (see
+    app.services.wealth_projection.project_scenarios).
+    """
+    try:
+        data = request.get_json() or {}
+        return jsonify({'projection': project_scenarios(data)}), 200
+
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    except Exception as e:
+        logger.error(f"Error projecting wealth scenarios: {e}")
+        return jsonify({'error': 'Failed to project wealth scenarios'}), 500
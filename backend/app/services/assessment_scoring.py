@@ -0,0 +1,134 @@
+"""
+Assessment Scoring Engine
+Vectorized answer-to-score mapping and category aggregation shared by the
+live response endpoint and the bulk rescoring job
+"""
+import numpy as np
+
+
+# Answer value (1-6 scale) -> normalized 0-100 score. 0 is N/A.
+SCORE_MAP = {
+    1: 17,
+    2: 33,
+    3: 50,
+    4: 67,
+    5: 83,
+    6: 100
+}
+
+# Response category -> Assessment score column
+CATEGORY_SCORE_FIELDS = {
+    'financial_performance': 'financial_performance_score',
+    'revenue_quality': 'revenue_quality_score',
+    'customer_concentration': 'customer_concentration_score',
+    'management_team': 'management_team_score',
+    'competitive_position': 'competitive_position_score',
+    'growth_potential': 'growth_potential_score',
+    'intellectual_property': 'intellectual_property_score',
+    'legal_compliance': 'legal_compliance_score',
+    'owner_dependency': 'owner_dependency_score',
+    'strategic_positioning': 'strategic_positioning_score'
+}
+
+CATEGORIES = list(CATEGORY_SCORE_FIELDS.keys())
+_CATEGORY_INDEX = {category: i for i, category in enumerate(CATEGORIES)}
+
+# Lookup table indexed by answer value; unmapped values score 0
+_SCORE_TABLE = np.zeros(max(SCORE_MAP) + 1)
+for _value, _score in SCORE_MAP.items():
+    _SCORE_TABLE[_value] = _score
+
+
+def score_answers(answer_values):
+    """
+    Map answer values to 0-100 scores in one pass
+
+    Args:
+        answer_values: Sequence of answer values (None allowed)
+
+    Returns:
+        numpy array of float scores, 0.0 for missing/unmapped answers
+    """
+    values = np.array([-1 if v is None else v for v in answer_values], dtype=np.int64)
+    scores = np.zeros(len(values))
+    valid = (values >= 0) & (values < len(_SCORE_TABLE))
+    scores[valid] = _SCORE_TABLE[values[valid]]
+    return scores
+
+
+def aggregate_scores(group_index, n_groups, categories, answer_values, scores, weights=None):
+    """
+    Aggregate response scores into assessment-level scores
+
+    Mirrors the per-assessment rules: N/A answers (value 0) are excluded from
+    averages but still count as answered questions. Scores are weighted means
+    using the question weights (1.0 when not provided).
+
+    Args:
+        group_index: Assessment position (0..n_groups-1) for each response
+        n_groups: Number of assessments being scored
+        categories: Category key for each response
+        answer_values: Answer value for each response (None allowed)
+        scores: Score for each response (see score_answers)
+        weights: Optional question weight for each response
+
+    Returns:
+        Dict with 'answered_questions', 'overall_score' and 'category_scores'
+        arrays; 'category_scores' is shaped (n_groups, len(CATEGORIES))
+    """
+    group_index = np.asarray(group_index, dtype=np.int64)
+    scores = np.asarray(scores, dtype=float)
+    n = len(group_index)
+
+    if weights is None:
+        weights = np.ones(n)
+    else:
+        weights = np.asarray(weights, dtype=float)
+
+    included = np.array([v != 0 for v in answer_values], dtype=bool)
+    effective_weights = np.where(included, weights, 0.0)
+    weighted_scores = effective_weights * scores
+
+    answered = np.bincount(group_index, minlength=n_groups)
+    overall_total = np.bincount(group_index, weights=weighted_scores, minlength=n_groups)
+    overall_weight = np.bincount(group_index, weights=effective_weights, minlength=n_groups)
+
+    category_index = np.array([_CATEGORY_INDEX.get(c, -1) for c in categories], dtype=np.int64)
+    known = category_index >= 0
+    flat_index = group_index[known] * len(CATEGORIES) + category_index[known]
+    size = n_groups * len(CATEGORIES)
+    category_total = np.bincount(flat_index, weights=weighted_scores[known], minlength=size)
+    category_weight = np.bincount(flat_index, weights=effective_weights[known], minlength=size)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        overall_score = np.where(overall_weight > 0, overall_total / overall_weight, 0.0)
+        category_scores = np.where(category_weight > 0, category_total / category_weight, 0.0)
+
+    return {
+        'answered_questions': answered,
+        'overall_score': overall_score,
+        'category_scores': category_scores.reshape(n_groups, len(CATEGORIES))
+    }
+
+
+def assessment_score_fields(aggregates, position):
+    """
+    Build the Assessment column values for one scored assessment
+
+    Args:
+        aggregates: Result of aggregate_scores
+        position: Assessment position within the aggregated batch
+
+    Returns:
+        Dict of Assessment column name -> value
+    """
+    overall_score = float(aggregates['overall_score'][position])
+    fields = {
+        'answered_questions': int(aggregates['answered_questions'][position]),
+        'overall_score': overall_score,
+        'attractiveness_score': overall_score
+    }
+    category_row = aggregates['category_scores'][position]
+    for i, category in enumerate(CATEGORIES):
+        fields[CATEGORY_SCORE_FIELDS[category]] = float(category_row[i])
+    return fields
@@ -0,0 +1,78 @@
+"""
+Cohort Benchmarking Engine
+Fixed-bin score histograms used to rank an assessment against its peers
+"""
+from app.services.assessment_scoring import CATEGORY_SCORE_FIELDS
+
+
+# Scores are 0-100; half-point bins keep percentiles exact to within 0.5 points
+BIN_WIDTH = 0.5
+NUM_BINS = int(100 / BIN_WIDTH) + 1
+
+# Smallest cohort we report against (also keeps individual scores private)
+MIN_COHORT_SIZE = 5
+
+# Wildcard used for the broader fallback cohorts
+ALL = 'all'
+UNKNOWN = 'unknown'
+
+# Benchmark key -> Assessment score column
+BENCHMARK_FIELDS = {'overall': 'overall_score', **CATEGORY_SCORE_FIELDS}
+
+# Upper revenue bound -> band key (same bands as the exit quiz revenue question)
+REVENUE_BANDS = [
+    (1_000_000, 'under_1m'),
+    (5_000_000, '1m_5m'),
+    (20_000_000, '5m_20m'),
+    (50_000_000, '20m_50m')
+]
+
+
+def revenue_band(revenue):
+    """Map annual revenue to a size band"""
+    if revenue is None or revenue <= 0:
+        return UNKNOWN
+    for upper, band in REVENUE_BANDS:
+        if revenue < upper:
+            return band
+    return 'over_50m'
+
+
+def normalize_industry(industry):
+    """Normalize an industry name into a cohort key"""
+    industry = (industry or '').strip().lower()
+    return industry or UNKNOWN
+
+
+def cohort_keys(industry, band):
+    """Cohorts a sample belongs to, most specific first"""
+    return [(industry, band), (industry, ALL), (ALL, ALL)]
+
+
+def score_bin(score):
+    """Histogram bin for a 0-100 score"""
+    index = int(round((score or 0.0) / BIN_WIDTH))
+    return min(max(index, 0), NUM_BINS - 1)
+
+
+def empty_histogram():
+    return [0] * NUM_BINS
+
+
+def sample_bins(scores):
+    """Map benchmark key -> bin for a sample's scores"""
+    return {key: score_bin(scores.get(key)) for key in BENCHMARK_FIELDS}
+
+
+def percentile_rank(counts, total, score):
+    """
+    Percentile rank of a score within a histogram
+
+    Uses the mid-rank convention: peers below plus half of the peers in the
+    same bin. Cost depends only on the bin count, not the cohort size.
+    """
+    if not total:
+        return None
+    index = score_bin(score)
+    below = sum(counts[:index])
+    return round((below + 0.5 * counts[index]) / total * 100, 1)
@@ -0,0 +1,147 @@
+"""
+Exit Coverage
+Keeps each user's wealth-gap coverage cached on their WealthGap row
+
+Coverage is how much of the wealth gap (goal minus net worth) the after-tax
+proceeds of the latest business valuation would close. Saving a Valuation
+or ValuationHistory publishes valuation_saved, and archiving or deleting
+one publishes valuation_removed, from a before_flush hook. The subscribers
+update the WealthGap row inside the same flush, so the cached figures
+commit or roll back together with the valuation. Dashboards then read the
+stored ratio instead of joining three tables.
+"""
+from datetime import datetime
+from blinker import Namespace
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.models.valuation import Valuation
+from app.models.valuation_history import ValuationHistory
+from app.models.wealth_gap import WealthGap
+from app.services.wealth_projection import after_tax_proceeds, coverage_ratio
+
+
+_signals = Namespace()
+
+# Sent with the session as sender and user_id, exit_value, valued_at
+valuation_saved = _signals.signal('valuation-saved')
+# Sent with the session as sender and user_id, removed (the valuation objects going away)
+valuation_removed = _signals.signal('valuation-removed')
+
+
+def valuation_exit_value(valuation):
+    """Exit value a valuation implies, or None"""
+    if isinstance(valuation, Valuation):
+        return None if valuation.is_archived else valuation.valuation_amount
+    data = valuation.valuation_data or {}
+    return data.get('weighted_valuation') if isinstance(data, dict) else None
+
+
+def latest_exit_value(session, user_id, exclude=()):
+    """(exit_value, valued_at) from the user's most recent valuation, or (None, None)"""
+    excluded = {(type(obj), obj.id) for obj in exclude if obj.id is not None}
+    candidates = []
+
+    with session.no_autoflush:
+        query = session.query(Valuation)\
+            .filter(Valuation.user_id == user_id, Valuation.is_archived.isnot(True))\
+            .order_by(Valuation.created_at.desc(), Valuation.id.desc())
+        candidates.extend(v for v in query.limit(len(excluded) + 1) if (Valuation, v.id) not in excluded)
+
+        query = session.query(ValuationHistory)\
+            .filter(ValuationHistory.user_id == user_id)\
+            .order_by(ValuationHistory.created_at.desc(), ValuationHistory.id.desc())
+        candidates.extend(h for h in query.limit(len(excluded) + 1) if (ValuationHistory, h.id) not in excluded)
+
+    for valuation in sorted(candidates, key=lambda v: v.created_at or datetime.min, reverse=True):
+        value = valuation_exit_value(valuation)
+        if value is not None:
+            return value, valuation.created_at
+    return None, None
+
+
+def update_coverage(wealth_gap):
+    """Recompute the cached proceeds and ratio from the cached exit value"""
+    if wealth_gap.exit_value is None:
+        wealth_gap.exit_after_tax_proceeds = None
+        wealth_gap.exit_coverage_ratio = None
+    else:
+        proceeds = after_tax_proceeds(wealth_gap.exit_value)
+        wealth_gap.exit_after_tax_proceeds = proceeds
+        wealth_gap.exit_coverage_ratio = coverage_ratio(proceeds, wealth_gap.calculate_wealth_gap())
+    wealth_gap.coverage_updated_at = datetime.utcnow()
+
+
+def set_exit_value(wealth_gap, exit_value, valued_at):
+    wealth_gap.exit_value = exit_value
+    wealth_gap.exit_value_date = valued_at
+    update_coverage(wealth_gap)
+
+
+def refresh_exit_coverage(session, wealth_gap):
+    """Re-read the latest valuation for a wealth gap and update its coverage"""
+    exit_value, valued_at = latest_exit_value(session, int(wealth_gap.user_id))
+    set_exit_value(wealth_gap, exit_value, valued_at)
+
+
+def _user_wealth_gap(session, user_id):
+    with session.no_autoflush:
+        return session.query(WealthGap).filter_by(user_id=user_id).first()
+
+
+def _on_valuation_saved(session, user_id, exit_value, valued_at):
+    wealth_gap = _user_wealth_gap(session, user_id)
+    if wealth_gap is None:
+        return
+    # Several valuations may be flushed together; the newest one wins
+    if wealth_gap.exit_value_date is None or valued_at >= wealth_gap.exit_value_date:
+        set_exit_value(wealth_gap, exit_value, valued_at)
+
+
+def _on_valuation_removed(session, user_id, removed):
+    wealth_gap = _user_wealth_gap(session, user_id)
+    if wealth_gap is not None:
+        exit_value, valued_at = latest_exit_value(session, user_id, exclude=removed)
+        set_exit_value(wealth_gap, exit_value, valued_at)
+
+
+def _before_flush(session, flush_context, instances):
+    wealth_gaps = [obj for obj in list(session.new) + list(session.dirty) if isinstance(obj, WealthGap)]
+
+    removed = {}
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, (Valuation, ValuationHistory)) or not session.is_modified(obj):
+            continue
+        user_id = int(obj.user_id)
+        exit_value = valuation_exit_value(obj)
+        if exit_value is None:
+            removed.setdefault(user_id, []).append(obj)
+        else:
+            valued_at = obj.created_at or datetime.utcnow()
+            valuation_saved.send(session, user_id=user_id, exit_value=exit_value, valued_at=valued_at)
+    for obj in session.deleted:
+        if isinstance(obj, (Valuation, ValuationHistory)):
+            removed.setdefault(int(obj.user_id), []).append(obj)
+
+    for user_id, objs in removed.items():
+        valuation_removed.send(session, user_id=user_id, removed=objs)
+
+    # Goal or net worth edits change the ratio; new rows pick up the latest valuation
+    for wealth_gap in wealth_gaps:
+        if wealth_gap.id is None and wealth_gap.exit_value is None:
+            refresh_exit_coverage(session, wealth_gap)
+        else:
+            update_coverage(wealth_gap)
+
+
+_listeners_registered = False
+
+
+def init_exit_coverage(app):
+    """Wire the valuation events to the wealth-gap coverage cache"""
+    global _listeners_registered
+    if _listeners_registered:
+        return
+    event.listen(Session, 'before_flush', _before_flush)
+    valuation_saved.connect(_on_valuation_saved)
+    valuation_removed.connect(_on_valuation_removed)
+    _listeners_registered = True
@@ -1,7 +1,14 @@
 """
 Exit Strategy Quiz Engine
 Contains quiz questions and scoring algorithm
+
+Scoring is table driven: SCORING_RULES lists, for every answer option, the
+points it adds to (or takes from) each exit strategy. At import the rules
+are compiled into SCORE_MATRIX, one row per answer option and one column
+per strategy, so a set of answers scores as the sum of the rows it picks.
+Many stored responses score together as one gather-and-sum over that matrix.
 """
+import numpy as np
 
 # Quiz questions - 20 strategic questions to determine best exit options
 QUIZ_QUESTIONS = [
@@ -337,519 +344,269 @@ EXIT_STRATEGIES = {
 }
 
 
-def calculate_exit_scores(responses):
-    """
-    Calculate scores for each exit strategy based on quiz responses.
-    Returns a dictionary of scores and top 3 recommendations.
-    """
-    scores = {strategy: 0 for strategy in EXIT_STRATEGIES.keys()}
-
-    # Extract responses for easier access
-    r = {q['id']: responses.get(q['id']) for q in QUIZ_QUESTIONS}
-
+# Points each answer option adds to (or takes from) each strategy;
+# strategies an option does not mention are unaffected by it
+SCORING_RULES = {
     # Q1: Primary goal
-    if r['Q1'] == 'max_price':
-        scores['strategic_sale'] += 10
-        scores['pe_full_sale'] += 8
-        scores['ipo_spac'] += 6
-    elif r['Q1'] == 'preserve_legacy':
-        scores['esop'] += 10
-        scores['family_succession'] += 9
-        scores['employee_coop'] += 8
-        scores['mbo'] += 7
-    elif r['Q1'] == 'support_team':
-        scores['esop'] += 10
-        scores['employee_coop'] += 9
-        scores['mbo'] += 7
-    elif r['Q1'] == 'quick_liquidity':
-        scores['strategic_sale'] += 9
-        scores['pe_full_sale'] += 10
-        scores['dividend_recap'] += 7
-    elif r['Q1'] == 'gradual_transition':
-        scores['pe_recap'] += 10
-        scores['minority_sale'] += 9
-        scores['family_succession'] += 7
-
+    'Q1': {
+        'max_price': {'strategic_sale': 10, 'pe_full_sale': 8, 'ipo_spac': 6},
+        'preserve_legacy': {'esop': 10, 'family_succession': 9, 'employee_coop': 8, 'mbo': 7},
+        'support_team': {'esop': 10, 'employee_coop': 9, 'mbo': 7},
+        'quick_liquidity': {'strategic_sale': 9, 'pe_full_sale': 10, 'dividend_recap': 7},
+        'gradual_transition': {'pe_recap': 10, 'minority_sale': 9, 'family_succession': 7}
+    },
     # Q2: Timeline
-    if r['Q2'] == 'immediate':
-        scores['strategic_sale'] += 8
-        scores['dividend_recap'] += 7
-        scores['orderly_liquidation'] += 5
-    elif r['Q2'] == 'near_term':
-        scores['pe_full_sale'] += 8
-        scores['strategic_sale'] += 7
-        scores['mbo'] += 6
-    elif r['Q2'] == 'medium_term':
-        scores['pe_recap'] += 8
-        scores['minority_sale'] += 7
-        scores['esop'] += 7
-        scores['family_succession'] += 6
-    elif r['Q2'] == 'long_term':
-        scores['family_succession'] += 9
-        scores['esop'] += 8
-        scores['minority_sale'] += 7
-        scores['ipo_spac'] += 6
-    elif r['Q2'] == 'flexible':
-        # Add small bonus to all viable options
-        for strategy in ['strategic_sale', 'pe_full_sale', 'mbo', 'minority_sale']:
-            scores[strategy] += 3
-
+    'Q2': {
+        'immediate': {'strategic_sale': 8, 'dividend_recap': 7, 'orderly_liquidation': 5},
+        'near_term': {'pe_full_sale': 8, 'strategic_sale': 7, 'mbo': 6},
+        'medium_term': {'pe_recap': 8, 'minority_sale': 7, 'esop': 7, 'family_succession': 6},
+        'long_term': {'family_succession': 9, 'esop': 8, 'minority_sale': 7, 'ipo_spac': 6},
+        # Small bonus to all viable options
+        'flexible': {'strategic_sale': 3, 'pe_full_sale': 3, 'mbo': 3, 'minority_sale': 3}
+    },
     # Q3: Post-transaction involvement
-    if r['Q3'] == 'not_important':
-        scores['strategic_sale'] += 8
-        scores['pe_full_sale'] += 7
-        scores['orderly_liquidation'] += 5
-    elif r['Q3'] == 'short_transition':
-        scores['pe_full_sale'] += 8
-        scores['strategic_sale'] += 7
-        scores['mbo'] += 6
-    elif r['Q3'] == 'moderate':
-        scores['pe_recap'] += 9
-        scores['minority_sale'] += 8
-        scores['family_succession'] += 6
-    elif r['Q3'] == 'very_important':
-        scores['pe_recap'] += 10
-        scores['minority_sale'] += 9
-        scores['family_succession'] += 8
-        scores['royalty_licensing'] += 7
-    elif r['Q3'] == 'advisory':
-        scores['mbo'] += 8
-        scores['esop'] += 7
-        scores['family_succession'] += 6
-
+    'Q3': {
+        'not_important': {'strategic_sale': 8, 'pe_full_sale': 7, 'orderly_liquidation': 5},
+        'short_transition': {'pe_full_sale': 8, 'strategic_sale': 7, 'mbo': 6},
+        'moderate': {'pe_recap': 9, 'minority_sale': 8, 'family_succession': 6},
+        'very_important': {'pe_recap': 10, 'minority_sale': 9, 'family_succession': 8, 'royalty_licensing': 7},
+        'advisory': {'mbo': 8, 'esop': 7, 'family_succession': 6}
+    },
     # Q4: Revenue range
-    if r['Q4'] == 'under_1m':
-        scores['family_succession'] += 6
-        scores['mbo'] += 5
-        scores['orderly_liquidation'] += 4
+    'Q4': {
         # Penalize options requiring scale
-        scores['ipo_spac'] -= 10
-        scores['pe_full_sale'] -= 3
-    elif r['Q4'] == '1m_5m':
-        scores['mbo'] += 7
-        scores['strategic_sale'] += 6
-        scores['family_succession'] += 5
-        scores['esop'] += 5
-        scores['ipo_spac'] -= 8
-    elif r['Q4'] == '5m_20m':
-        scores['pe_full_sale'] += 8
-        scores['strategic_sale'] += 8
-        scores['esop'] += 7
-        scores['pe_recap'] += 6
-        scores['mbo'] += 6
-    elif r['Q4'] == '20m_50m':
-        scores['pe_full_sale'] += 10
-        scores['strategic_sale'] += 9
-        scores['pe_recap'] += 8
-        scores['esop'] += 7
-        scores['ipo_spac'] += 4
-    elif r['Q4'] == 'over_50m':
-        scores['strategic_sale'] += 10
-        scores['pe_full_sale'] += 9
-        scores['ipo_spac'] += 8
-        scores['merger_equals'] += 7
-        scores['pe_recap'] += 7
-
+        'under_1m': {'family_succession': 6, 'mbo': 5, 'orderly_liquidation': 4, 'ipo_spac': -10, 'pe_full_sale': -3},
+        '1m_5m': {'mbo': 7, 'strategic_sale': 6, 'family_succession': 5, 'esop': 5, 'ipo_spac': -8},
+        '5m_20m': {'pe_full_sale': 8, 'strategic_sale': 8, 'esop': 7, 'pe_recap': 6, 'mbo': 6},
+        '20m_50m': {'pe_full_sale': 10, 'strategic_sale': 9, 'pe_recap': 8, 'esop': 7, 'ipo_spac': 4},
+        'over_50m': {'strategic_sale': 10, 'pe_full_sale': 9, 'ipo_spac': 8, 'merger_equals': 7, 'pe_recap': 7}
+    },
     # Q5: EBITDA margin
-    if r['Q5'] == 'negative':
-        scores['orderly_liquidation'] += 8
-        scores['spin_off'] += 5
+    'Q5': {
         # Penalize all M&A options
-        for strategy in ['strategic_sale', 'pe_full_sale', 'pe_recap', 'mbo', 'esop']:
-            scores[strategy] -= 5
-    elif r['Q5'] == 'low':
-        scores['strategic_sale'] += 5
-        scores['spin_off'] += 4
-        scores['minority_sale'] += 4
-        scores['pe_full_sale'] -= 2
-    elif r['Q5'] == 'moderate':
-        scores['pe_full_sale'] += 7
-        scores['strategic_sale'] += 7
-        scores['mbo'] += 6
-        scores['esop'] += 6
-    elif r['Q5'] == 'strong':
-        scores['pe_full_sale'] += 10
-        scores['strategic_sale'] += 9
-        scores['pe_recap'] += 8
-        scores['esop'] += 8
-        scores['dividend_recap'] += 7
-    elif r['Q5'] == 'very_strong':
-        scores['strategic_sale'] += 10
-        scores['pe_full_sale'] += 10
-        scores['dividend_recap'] += 9
-        scores['pe_recap'] += 9
-        scores['esop'] += 8
-
+        'negative': {'orderly_liquidation': 8, 'spin_off': 5, 'strategic_sale': -5, 'pe_full_sale': -5, 'pe_recap': -5, 'mbo': -5, 'esop': -5},
+        'low': {'strategic_sale': 5, 'spin_off': 4, 'minority_sale': 4, 'pe_full_sale': -2},
+        'moderate': {'pe_full_sale': 7, 'strategic_sale': 7, 'mbo': 6, 'esop': 6},
+        'strong': {'pe_full_sale': 10, 'strategic_sale': 9, 'pe_recap': 8, 'esop': 8, 'dividend_recap': 7},
+        'very_strong': {'strategic_sale': 10, 'pe_full_sale': 10, 'dividend_recap': 9, 'pe_recap': 9, 'esop': 8}
+    },
     # Q6: Management team capability
-    if r['Q6'] == 'highly_capable':
-        scores['mbo'] += 10
-        scores['esop'] += 9
-        scores['pe_full_sale'] += 8
-        scores['strategic_sale'] += 7
-    elif r['Q6'] == 'mostly_capable':
-        scores['mbo'] += 7
-        scores['esop'] += 6
-        scores['pe_recap'] += 7
-        scores['minority_sale'] += 6
-    elif r['Q6'] == 'developing':
-        scores['pe_recap'] += 6
-        scores['minority_sale'] += 6
-        scores['family_succession'] += 5
-        scores['mbo'] -= 3
-        scores['esop'] -= 3
-    elif r['Q6'] == 'limited':
-        scores['strategic_sale'] += 5  # Buyer brings management
-        scores['family_succession'] += 4
-        scores['mbo'] -= 7
-        scores['esop'] -= 7
-        scores['pe_full_sale'] -= 3
-    elif r['Q6'] == 'none':
-        scores['strategic_sale'] += 6  # Asset value focus
-        scores['orderly_liquidation'] += 5
-        scores['mbo'] -= 10
-        scores['esop'] -= 10
-        scores['pe_full_sale'] -= 5
-
+    'Q6': {
+        'highly_capable': {'mbo': 10, 'esop': 9, 'pe_full_sale': 8, 'strategic_sale': 7},
+        'mostly_capable': {'mbo': 7, 'esop': 6, 'pe_recap': 7, 'minority_sale': 6},
+        'developing': {'pe_recap': 6, 'minority_sale': 6, 'family_succession': 5, 'mbo': -3, 'esop': -3},
+        'limited': {'strategic_sale': 5, 'family_succession': 4, 'mbo': -7, 'esop': -7, 'pe_full_sale': -3},
+        'none': {'strategic_sale': 6, 'orderly_liquidation': 5, 'mbo': -10, 'esop': -10, 'pe_full_sale': -5}
+    },
     # Q7: Internal successor
-    if r['Q7'] == 'yes_ready':
-        scores['family_succession'] += 10
-        scores['mbo'] += 7
-    elif r['Q7'] == 'yes_training':
-        scores['family_succession'] += 8
-        scores['mbo'] += 5
-        scores['minority_sale'] += 5  # Get partner to help develop
-    elif r['Q7'] == 'maybe':
-        scores['family_succession'] += 5
-        scores['mbo'] += 4
-    elif r['Q7'] == 'no':
-        scores['strategic_sale'] += 5
-        scores['pe_full_sale'] += 5
-        scores['esop'] += 4
-    elif r['Q7'] == 'not_interested':
-        scores['strategic_sale'] += 6
-        scores['pe_full_sale'] += 6
-        scores['esop'] += 5
-        scores['family_succession'] -= 10
-
+    'Q7': {
+        'yes_ready': {'family_succession': 10, 'mbo': 7},
+        'yes_training': {'family_succession': 8, 'mbo': 5, 'minority_sale': 5},
+        'maybe': {'family_succession': 5, 'mbo': 4},
+        'no': {'strategic_sale': 5, 'pe_full_sale': 5, 'esop': 4},
+        'not_interested': {'strategic_sale': 6, 'pe_full_sale': 6, 'esop': 5, 'family_succession': -10}
+    },
     # Q8: Culture/employee preservation importance
-    if r['Q8'] == 'critical':
-        scores['esop'] += 10
-        scores['employee_coop'] += 9
-        scores['family_succession'] += 7
-        scores['mbo'] += 7
-        scores['strategic_sale'] -= 5
-    elif r['Q8'] == 'very_important':
-        scores['esop'] += 8
-        scores['mbo'] += 7
-        scores['family_succession'] += 6
-        scores['pe_recap'] += 5
-    elif r['Q8'] == 'somewhat_important':
-        scores['esop'] += 5
-        scores['mbo'] += 5
-        scores['pe_full_sale'] += 3
-    elif r['Q8'] == 'not_priority':
-        scores['strategic_sale'] += 4
-        scores['pe_full_sale'] += 4
-    elif r['Q8'] == 'indifferent':
-        scores['strategic_sale'] += 5
-        scores['pe_full_sale'] += 5
-        scores['orderly_liquidation'] += 3
-
+    'Q8': {
+        'critical': {'esop': 10, 'employee_coop': 9, 'family_succession': 7, 'mbo': 7, 'strategic_sale': -5},
+        'very_important': {'esop': 8, 'mbo': 7, 'family_succession': 6, 'pe_recap': 5},
+        'somewhat_important': {'esop': 5, 'mbo': 5, 'pe_full_sale': 3},
+        'not_priority': {'strategic_sale': 4, 'pe_full_sale': 4},
+        'indifferent': {'strategic_sale': 5, 'pe_full_sale': 5, 'orderly_liquidation': 3}
+    },
     # Q9: Customer concentration
-    if r['Q9'] == 'highly_diversified':
-        scores['pe_full_sale'] += 8
-        scores['strategic_sale'] += 7
-        scores['esop'] += 7
-        scores['ipo_spac'] += 6
-    elif r['Q9'] == 'diversified':
-        scores['pe_full_sale'] += 7
-        scores['strategic_sale'] += 6
-        scores['esop'] += 6
-        scores['mbo'] += 6
-    elif r['Q9'] == 'moderate':
-        scores['strategic_sale'] += 5
-        scores['pe_recap'] += 5
-        scores['mbo'] += 4
-    elif r['Q9'] == 'concentrated':
-        scores['strategic_sale'] += 6  # May be valuable to strategic
-        scores['minority_sale'] += 4  # Partner can help diversify
-        scores['pe_full_sale'] -= 3
-        scores['esop'] -= 3
-    elif r['Q9'] == 'highly_concentrated':
-        scores['strategic_sale'] += 5
-        scores['orderly_liquidation'] += 3
-        scores['pe_full_sale'] -= 5
-        scores['esop'] -= 5
-        scores['mbo'] -= 4
-
+    'Q9': {
+        'highly_diversified': {'pe_full_sale': 8, 'strategic_sale': 7, 'esop': 7, 'ipo_spac': 6},
+        'diversified': {'pe_full_sale': 7, 'strategic_sale': 6, 'esop': 6, 'mbo': 6},
+        'moderate': {'strategic_sale': 5, 'pe_recap': 5, 'mbo': 4},
+        'concentrated': {'strategic_sale': 6, 'minority_sale': 4, 'pe_full_sale': -3, 'esop': -3},
+        'highly_concentrated': {'strategic_sale': 5, 'orderly_liquidation': 3, 'pe_full_sale': -5, 'esop': -5, 'mbo': -4}
+    },
     # Q10: Recurring revenue
-    if r['Q10'] == 'high_recurring':
-        scores['pe_full_sale'] += 10
-        scores['strategic_sale'] += 8
-        scores['esop'] += 8
-        scores['dividend_recap'] += 7
-    elif r['Q10'] == 'moderate_recurring':
-        scores['pe_full_sale'] += 7
-        scores['strategic_sale'] += 6
-        scores['esop'] += 6
-        scores['mbo'] += 6
-    elif r['Q10'] == 'some_recurring':
-        scores['strategic_sale'] += 5
-        scores['pe_recap'] += 5
-        scores['mbo'] += 4
-    elif r['Q10'] == 'low_recurring':
-        scores['strategic_sale'] += 4
-        scores['minority_sale'] += 3
-        scores['pe_full_sale'] -= 2
-        scores['esop'] -= 2
-    elif r['Q10'] == 'project_based':
-        scores['strategic_sale'] += 3
-        scores['orderly_liquidation'] += 2
-        scores['pe_full_sale'] -= 3
-        scores['esop'] -= 4
-
+    'Q10': {
+        'high_recurring': {'pe_full_sale': 10, 'strategic_sale': 8, 'esop': 8, 'dividend_recap': 7},
+        'moderate_recurring': {'pe_full_sale': 7, 'strategic_sale': 6, 'esop': 6, 'mbo': 6},
+        'some_recurring': {'strategic_sale': 5, 'pe_recap': 5, 'mbo': 4},
+        'low_recurring': {'strategic_sale': 4, 'minority_sale': 3, 'pe_full_sale': -2, 'esop': -2},
+        'project_based': {'strategic_sale': 3, 'orderly_liquidation': 2, 'pe_full_sale': -3, 'esop': -4}
+    },
     # Q11: Debt capacity
-    if r['Q11'] == 'strong':
-        scores['mbo'] += 9
-        scores['esop'] += 9
-        scores['dividend_recap'] += 8
-        scores['pe_recap'] += 7
-    elif r['Q11'] == 'moderate':
-        scores['mbo'] += 6
-        scores['esop'] += 6
-        scores['dividend_recap'] += 5
-    elif r['Q11'] == 'limited':
-        scores['strategic_sale'] += 4
-        scores['pe_full_sale'] += 3
-        scores['mbo'] -= 3
-        scores['esop'] -= 3
-        scores['dividend_recap'] -= 5
-    elif r['Q11'] == 'none':
-        scores['strategic_sale'] += 4
-        scores['family_succession'] += 3
-        scores['mbo'] -= 7
-        scores['esop'] -= 7
-        scores['dividend_recap'] -= 10
-    elif r['Q11'] == 'uncertain':
-        # Neutral - add to strategies that can work either way
-        scores['strategic_sale'] += 2
-        scores['minority_sale'] += 2
-
+    'Q11': {
+        'strong': {'mbo': 9, 'esop': 9, 'dividend_recap': 8, 'pe_recap': 7},
+        'moderate': {'mbo': 6, 'esop': 6, 'dividend_recap': 5},
+        'limited': {'strategic_sale': 4, 'pe_full_sale': 3, 'mbo': -3, 'esop': -3, 'dividend_recap': -5},
+        'none': {'strategic_sale': 4, 'family_succession': 3, 'mbo': -7, 'esop': -7, 'dividend_recap': -10},
+        # Neutral - strategies that can work either way
+        'uncertain': {'strategic_sale': 2, 'minority_sale': 2}
+    },
     # Q12: Seller financing willingness
-    if r['Q12'] == 'no_cash_only':
-        scores['strategic_sale'] += 7
-        scores['pe_full_sale'] += 7
-        scores['dividend_recap'] += 6
-        scores['mbo'] -= 5
-        scores['family_succession'] -= 3
-    elif r['Q12'] == 'small_portion':
-        scores['pe_full_sale'] += 5
-        scores['strategic_sale'] += 4
-        scores['mbo'] += 3
-    elif r['Q12'] == 'moderate':
-        scores['mbo'] += 7
-        scores['family_succession'] += 6
-        scores['pe_full_sale'] += 4
-    elif r['Q12'] == 'substantial':
-        scores['mbo'] += 9
-        scores['family_succession'] += 8
-        scores['esop'] += 5
-    elif r['Q12'] == 'flexible':
-        scores['mbo'] += 10
-        scores['family_succession'] += 9
-        scores['esop'] += 7
-        scores['employee_coop'] += 6
-
+    'Q12': {
+        'no_cash_only': {'strategic_sale': 7, 'pe_full_sale': 7, 'dividend_recap': 6, 'mbo': -5, 'family_succession': -3},
+        'small_portion': {'pe_full_sale': 5, 'strategic_sale': 4, 'mbo': 3},
+        'moderate': {'mbo': 7, 'family_succession': 6, 'pe_full_sale': 4},
+        'substantial': {'mbo': 9, 'family_succession': 8, 'esop': 5},
+        'flexible': {'mbo': 10, 'family_succession': 9, 'esop': 7, 'employee_coop': 6}
+    },
     # Q13: IP/Strategic assets
-    if r['Q13'] == 'strong_ip':
-        scores['strategic_sale'] += 10
-        scores['ipo_spac'] += 7
-        scores['royalty_licensing'] += 10
-        scores['minority_sale'] += 6
-    elif r['Q13'] == 'proprietary':
-        scores['strategic_sale'] += 9
-        scores['pe_full_sale'] += 7
-        scores['royalty_licensing'] += 8
-        scores['minority_sale'] += 6
-    elif r['Q13'] == 'strategic_assets':
-        scores['strategic_sale'] += 9
-        scores['merger_equals'] += 6
-        scores['pe_full_sale'] += 6
-    elif r['Q13'] == 'some':
-        scores['strategic_sale'] += 5
-        scores['pe_full_sale'] += 4
-    elif r['Q13'] == 'commodity':
-        scores['mbo'] += 4
-        scores['esop'] += 4
-        scores['orderly_liquidation'] += 3
-        scores['strategic_sale'] -= 3
-
+    'Q13': {
+        'strong_ip': {'strategic_sale': 10, 'ipo_spac': 7, 'royalty_licensing': 10, 'minority_sale': 6},
+        'proprietary': {'strategic_sale': 9, 'pe_full_sale': 7, 'royalty_licensing': 8, 'minority_sale': 6},
+        'strategic_assets': {'strategic_sale': 9, 'merger_equals': 6, 'pe_full_sale': 6},
+        'some': {'strategic_sale': 5, 'pe_full_sale': 4},
+        'commodity': {'mbo': 4, 'esop': 4, 'orderly_liquidation': 3, 'strategic_sale': -3}
+    },
     # Q14: Scalability
-    if r['Q14'] == 'highly_scalable':
-        scores['ipo_spac'] += 10
-        scores['pe_recap'] += 9
-        scores['minority_sale'] += 9
-        scores['strategic_sale'] += 7
-        scores['pe_full_sale'] += 7
-    elif r['Q14'] == 'moderately_scalable':
-        scores['pe_recap'] += 7
-        scores['minority_sale'] += 7
-        scores['strategic_sale'] += 6
-        scores['pe_full_sale'] += 6
-    elif r['Q14'] == 'steady_growth':
-        scores['mbo'] += 6
-        scores['esop'] += 6
-        scores['family_succession'] += 5
-        scores['pe_full_sale'] += 4
-    elif r['Q14'] == 'mature':
-        scores['strategic_sale'] += 5
-        scores['dividend_recap'] += 5
-        scores['mbo'] += 4
-        scores['orderly_liquidation'] += 3
-    elif r['Q14'] == 'declining':
-        scores['orderly_liquidation'] += 8
-        scores['strategic_sale'] += 4  # May have value to consolidator
-        for strategy in ['ipo_spac', 'pe_recap', 'minority_sale', 'pe_full_sale']:
-            scores[strategy] -= 5
-
+    'Q14': {
+        'highly_scalable': {'ipo_spac': 10, 'pe_recap': 9, 'minority_sale': 9, 'strategic_sale': 7, 'pe_full_sale': 7},
+        'moderately_scalable': {'pe_recap': 7, 'minority_sale': 7, 'strategic_sale': 6, 'pe_full_sale': 6},
+        'steady_growth': {'mbo': 6, 'esop': 6, 'family_succession': 5, 'pe_full_sale': 4},
+        'mature': {'strategic_sale': 5, 'dividend_recap': 5, 'mbo': 4, 'orderly_liquidation': 3},
+        'declining': {'orderly_liquidation': 8, 'strategic_sale': 4, 'ipo_spac': -5, 'pe_recap': -5, 'minority_sale': -5, 'pe_full_sale': -5}
+    },
     # Q15: Strategic buyers
-    if r['Q15'] == 'multiple_strategic':
-        scores['strategic_sale'] += 10
-        scores['merger_equals'] += 7
-    elif r['Q15'] == 'some_strategic':
-        scores['strategic_sale'] += 8
-        scores['merger_equals'] += 5
-    elif r['Q15'] == 'maybe':
-        scores['strategic_sale'] += 5
-        scores['pe_full_sale'] += 3
-    elif r['Q15'] == 'unlikely':
-        scores['mbo'] += 5
-        scores['esop'] += 5
-        scores['family_succession'] += 4
-        scores['strategic_sale'] -= 5
-    elif r['Q15'] == 'dont_know':
+    'Q15': {
+        'multiple_strategic': {'strategic_sale': 10, 'merger_equals': 7},
+        'some_strategic': {'strategic_sale': 8, 'merger_equals': 5},
+        'maybe': {'strategic_sale': 5, 'pe_full_sale': 3},
+        'unlikely': {'mbo': 5, 'esop': 5, 'family_succession': 4, 'strategic_sale': -5},
         # Neutral - no impact
-        pass
-
+        'dont_know': {}
+    },
     # Q16: Due diligence readiness
-    if r['Q16'] == 'full_scrutiny':
-        scores['strategic_sale'] += 8
-        scores['pe_full_sale'] += 8
-        scores['ipo_spac'] += 6
-    elif r['Q16'] == 'standard':
-        scores['strategic_sale'] += 6
-        scores['pe_full_sale'] += 6
-        scores['mbo'] += 5
-    elif r['Q16'] == 'light_preferred':
-        scores['family_succession'] += 6
-        scores['mbo'] += 5
-        scores['minority_sale'] += 4
-    elif r['Q16'] == 'concerns':
-        scores['family_succession'] += 5
-        scores['mbo'] += 4
-        scores['strategic_sale'] -= 3
-        scores['pe_full_sale'] -= 3
-    elif r['Q16'] == 'significant_concerns':
-        scores['orderly_liquidation'] += 4
-        scores['family_succession'] += 3
-        for strategy in ['strategic_sale', 'pe_full_sale', 'ipo_spac', 'esop']:
-            scores[strategy] -= 5
-
+    'Q16': {
+        'full_scrutiny': {'strategic_sale': 8, 'pe_full_sale': 8, 'ipo_spac': 6},
+        'standard': {'strategic_sale': 6, 'pe_full_sale': 6, 'mbo': 5},
+        'light_preferred': {'family_succession': 6, 'mbo': 5, 'minority_sale': 4},
+        'concerns': {'family_succession': 5, 'mbo': 4, 'strategic_sale': -3, 'pe_full_sale': -3},
+        'significant_concerns': {'orderly_liquidation': 4, 'family_succession': 3, 'strategic_sale': -5, 'pe_full_sale': -5, 'ipo_spac': -5, 'esop': -5}
+    },
     # Q17: Partner vs. full sale
-    if r['Q17'] == 'prefer_partner':
-        scores['pe_recap'] += 10
-        scores['minority_sale'] += 10
-        scores['strategic_sale'] -= 5
-        scores['pe_full_sale'] -= 5
-    elif r['Q17'] == 'open':
-        scores['pe_recap'] += 7
-        scores['minority_sale'] += 7
-        scores['strategic_sale'] += 3
-        scores['pe_full_sale'] += 3
-    elif r['Q17'] == 'prefer_full_sale':
-        scores['strategic_sale'] += 7
-        scores['pe_full_sale'] += 7
-        scores['mbo'] += 5
-    elif r['Q17'] == 'full_sale_only':
-        scores['strategic_sale'] += 9
-        scores['pe_full_sale'] += 9
-        scores['mbo'] += 7
-        scores['esop'] += 7
-        scores['pe_recap'] -= 5
-        scores['minority_sale'] -= 5
-    elif r['Q17'] == 'uncertain':
-        # Add small bonus to flexible options
-        for strategy in ['pe_recap', 'minority_sale', 'strategic_sale']:
-            scores[strategy] += 2
-
+    'Q17': {
+        'prefer_partner': {'pe_recap': 10, 'minority_sale': 10, 'strategic_sale': -5, 'pe_full_sale': -5},
+        'open': {'pe_recap': 7, 'minority_sale': 7, 'strategic_sale': 3, 'pe_full_sale': 3},
+        'prefer_full_sale': {'strategic_sale': 7, 'pe_full_sale': 7, 'mbo': 5},
+        'full_sale_only': {'strategic_sale': 9, 'pe_full_sale': 9, 'mbo': 7, 'esop': 7, 'pe_recap': -5, 'minority_sale': -5},
+        # Small bonus to flexible options
+        'uncertain': {'pe_recap': 2, 'minority_sale': 2, 'strategic_sale': 2}
+    },
     # Q18: Tax considerations
-    if r['Q18'] == 'critical':
-        scores['esop'] += 9  # Tax-advantaged
-        scores['family_succession'] += 8  # Estate planning
-        scores['pe_recap'] += 5  # Partial gain recognition
-    elif r['Q18'] == 'very_important':
-        scores['esop'] += 7
-        scores['family_succession'] += 6
-        scores['pe_recap'] += 4
-    elif r['Q18'] == 'important':
-        scores['esop'] += 5
-        scores['family_succession'] += 4
-    elif r['Q18'] == 'minor':
+    'Q18': {
+        'critical': {'esop': 9, 'family_succession': 8, 'pe_recap': 5},
+        'very_important': {'esop': 7, 'family_succession': 6, 'pe_recap': 4},
+        'important': {'esop': 5, 'family_succession': 4},
         # Neutral
-        pass
-    elif r['Q18'] == 'not_concerned':
-        scores['strategic_sale'] += 3
-        scores['pe_full_sale'] += 3
-
+        'minor': {},
+        'not_concerned': {'strategic_sale': 3, 'pe_full_sale': 3}
+    },
     # Q19: Risk tolerance
-    if r['Q19'] == 'no_tolerance':
-        scores['strategic_sale'] += 8
-        scores['pe_full_sale'] += 8
-        scores['dividend_recap'] += 6
-        scores['pe_recap'] -= 5
-        scores['minority_sale'] -= 3
-    elif r['Q19'] == 'minimal':
-        scores['pe_full_sale'] += 6
-        scores['strategic_sale'] += 6
-        scores['mbo'] += 4
-    elif r['Q19'] == 'moderate':
-        scores['pe_recap'] += 7
-        scores['minority_sale'] += 6
-        scores['mbo'] += 5
-    elif r['Q19'] == 'high':
-        scores['pe_recap'] += 9
-        scores['minority_sale'] += 9
-        scores['ipo_spac'] += 6
-    elif r['Q19'] == 'entrepreneur':
-        scores['minority_sale'] += 10
-        scores['pe_recap'] += 10
-        scores['ipo_spac'] += 8
-        scores['royalty_licensing'] += 7
-
+    'Q19': {
+        'no_tolerance': {'strategic_sale': 8, 'pe_full_sale': 8, 'dividend_recap': 6, 'pe_recap': -5, 'minority_sale': -3},
+        'minimal': {'pe_full_sale': 6, 'strategic_sale': 6, 'mbo': 4},
+        'moderate': {'pe_recap': 7, 'minority_sale': 6, 'mbo': 5},
+        'high': {'pe_recap': 9, 'minority_sale': 9, 'ipo_spac': 6},
+        'entrepreneur': {'minority_sale': 10, 'pe_recap': 10, 'ipo_spac': 8, 'royalty_licensing': 7}
+    },
     # Q20: Employee benefit priority
-    if r['Q20'] == 'critical_priority':
-        scores['esop'] += 10
-        scores['employee_coop'] += 10
-        scores['mbo'] += 7
-    elif r['Q20'] == 'very_important':
-        scores['esop'] += 8
-        scores['employee_coop'] += 7
-        scores['mbo'] += 6
-    elif r['Q20'] == 'somewhat_important':
-        scores['esop'] += 5
-        scores['mbo'] += 4
-    elif r['Q20'] == 'not_priority':
-        scores['strategic_sale'] += 3
-        scores['pe_full_sale'] += 3
-    elif r['Q20'] == 'no_employees':
-        scores['family_succession'] += 4
-        scores['strategic_sale'] += 3
-        scores['esop'] -= 10
-        scores['employee_coop'] -= 10
-        scores['mbo'] -= 5
+    'Q20': {
+        'critical_priority': {'esop': 10, 'employee_coop': 10, 'mbo': 7},
+        'very_important': {'esop': 8, 'employee_coop': 7, 'mbo': 6},
+        'somewhat_important': {'esop': 5, 'mbo': 4},
+        'not_priority': {'strategic_sale': 3, 'pe_full_sale': 3},
+        'no_employees': {'family_succession': 4, 'strategic_sale': 3, 'esop': -10, 'employee_coop': -10, 'mbo': -5}
+    }
+}
+
+# Strategies must score above this to be recommended
+VIABLE_SCORE = 10
+
+STRATEGY_KEYS = list(EXIT_STRATEGIES.keys())
+QUESTION_IDS = [q['id'] for q in QUIZ_QUESTIONS]
+
+
+def _compile_rules():
+    """
+    Compile SCORING_RULES into (option_index, score_matrix)
+
+    option_index maps (question_id, option value) to a score_matrix row.
+    Row 0 is all zeros and stands for unanswered or unknown answers.
+    """
+    strategy_position = {strategy: i for i, strategy in enumerate(STRATEGY_KEYS)}
+    option_index = {}
+    rows = [np.zeros(len(STRATEGY_KEYS), dtype=np.int64)]
+
+    for question_id, options in SCORING_RULES.items():
+        for value, points in options.items():
+            row = np.zeros(len(STRATEGY_KEYS), dtype=np.int64)
+            for strategy, score in points.items():
+                row[strategy_position[strategy]] = score
+            option_index[(question_id, value)] = len(rows)
+            rows.append(row)
+
+    score_matrix = np.vstack(rows)
+    score_matrix.setflags(write=False)
+    return option_index, score_matrix
+
+
+OPTION_INDEX, SCORE_MATRIX = _compile_rules()
+
+# Question position of every SCORE_MATRIX row after the zero row
+_OPTION_QUESTION = np.array([QUESTION_IDS.index(question_id) for question_id, _ in OPTION_INDEX], dtype=np.intp)
+
+
+def option_rows(responses_list):
+    """
+    SCORE_MATRIX rows picked by each set of responses
+
+    Returns:
+        int array of shape (len(responses_list), len(QUESTION_IDS))
+    """
+    rows = np.zeros((len(responses_list), len(QUESTION_IDS)), dtype=np.intp)
+    for i, responses in enumerate(responses_list):
+        for j, question_id in enumerate(QUESTION_IDS):
+            value = responses.get(question_id)
+            if isinstance(value, str):
+                rows[i, j] = OPTION_INDEX.get((question_id, value), 0)
+    return rows
+
+
+def score_responses(responses_list):
+    """
+    Score many sets of quiz responses in one pass
+
+    Returns:
+        int array of shape (len(responses_list), len(STRATEGY_KEYS)),
+        columns in EXIT_STRATEGIES order
+    """
+    return SCORE_MATRIX[option_rows(responses_list)].sum(axis=1)
+
+
+def rank_strategies(scores, top=3):
+    """
+    Top strategies for each row of score_responses(), best first
+
+    Same ranking as summarize_scores: only viable strategies unless none
+    are, ties kept in EXIT_STRATEGIES order. Rows with fewer than `top`
+    viable strategies get shorter lists.
+    """
+    viable = scores > VIABLE_SCORE
+    eligible = viable | ~viable.any(axis=1, keepdims=True)
+    order = np.argsort(np.where(eligible, -scores, np.iinfo(np.int64).max), axis=1, kind='stable')[:, :top]
+    picked = np.take_along_axis(eligible, order, axis=1)
+    return [
+        [STRATEGY_KEYS[i] for i, ok in zip(row, ok_row) if ok]
+        for row, ok_row in zip(order.tolist(), picked.tolist())
+    ]
+
+
+def summarize_scores(score_row):
+    """
+    Turn one row of strategy scores into the quiz result
+    Returns a dictionary of scores and top 3 recommendations.
+    """
+    scores = dict(zip(STRATEGY_KEYS, score_row.tolist()))
 
     # Filter out strategies with negative or very low scores
-    viable_scores = {k: v for k, v in scores.items() if v > 10}
+    viable_scores = {k: v for k, v in scores.items() if v > VIABLE_SCORE}
 
     # If no viable scores, take top scores anyway
     if not viable_scores:
@@ -874,3 +631,80 @@ def calculate_exit_scores(responses):
             for strategy, score in sorted_strategies[:10]  # Top 10 for detailed view
         ]
     }
+
+
+def calculate_exit_scores(responses):
+    """
+    Calculate scores for each exit strategy based on quiz responses.
+    Returns a dictionary of scores and top 3 recommendations.
+    """
+    return summarize_scores(score_responses([responses])[0])
+
+
+def answer_sensitivity(responses):
+    """
+    What-if table for one set of quiz responses
+
+    For every question, the score change each alternative answer would make
+    on every strategy, holding the other answers fixed, and the top 3 it
+    would lead to. Each alternative's scores are the current scores plus the
+    difference of two SCORE_MATRIX rows, so every alternative is scored and
+    ranked in one pass.
+
+    Returns:
+        Dictionary with the current result, per-question contributions and
+        alternatives, and a summary of how stable the ranking is.
+    """
+    current_rows = option_rows([responses])[0]
+    scores = SCORE_MATRIX[current_rows].sum(axis=0)
+    result = summarize_scores(scores)
+    top_3 = result['top_recommendations']
+
+    # One row per answer option: swap it in for the current answer to its question
+    alternative_rows = np.arange(1, len(SCORE_MATRIX))
+    deltas = SCORE_MATRIX[alternative_rows] - SCORE_MATRIX[current_rows[_OPTION_QUESTION]]
+    rankings = rank_strategies(scores + deltas)
+
+    questions = [
+        {
+            'question_id': question_id,
+            'answer': responses.get(question_id) if current_rows[j] else None,
+            'contribution': dict(zip(STRATEGY_KEYS, SCORE_MATRIX[current_rows[j]].tolist())),
+            'alternatives': []
+        }
+        for j, question_id in enumerate(QUESTION_IDS)
+    ]
+
+    flips = []
+    alternatives = top_unchanged = top_3_unchanged = 0
+    for (question_id, value), row, j, delta, ranking in zip(
+        OPTION_INDEX, alternative_rows.tolist(), _OPTION_QUESTION.tolist(), deltas.tolist(), rankings
+    ):
+        if row == current_rows[j]:
+            continue
+        alternatives += 1
+        top_changed = ranking[:1] != top_3[:1]
+        top_unchanged += not top_changed
+        top_3_unchanged += ranking == top_3
+        if top_changed:
+            flips.append({'question_id': question_id, 'value': value, 'top_recommendation': ranking[0]})
+        questions[j]['alternatives'].append({
+            'value': value,
+            'deltas': dict(zip(STRATEGY_KEYS, delta)),
+            'top_recommendations': ranking,
+            'top_changed': top_changed
+        })
+
+    ranked = sorted(result['all_scores'].values(), reverse=True)
+    return {
+        'all_scores': result['all_scores'],
+        'top_recommendations': top_3,
+        'questions': questions,
+        'stability': {
+            'margin': ranked[0] - ranked[1],
+            'alternatives': alternatives,
+            'top_unchanged_share': top_unchanged / alternatives if alternatives else 1.0,
+            'top_3_unchanged_share': top_3_unchanged / alternatives if alternatives else 1.0,
+            'top_changing_answers': flips
+        }
+    }
@@ -0,0 +1,199 @@
+"""
+Exit Quiz Results
+Versioned quiz snapshots and memoized results payloads
+
+Submitting the quiz appends a new ExitQuizResponse version rather than
+overwriting the previous one; resubmitting the same answers keeps the
+current version. A snapshot's answers never change afterwards, so the
+rendered results payload is memoized per snapshot and served again while
+its stored scores match (a bulk rescore rewrites them). A results read is
+one indexed lookup of the user's newest version and no JSON parsing.
+Strategy details come from the static EXIT_STRATEGIES and are built once
+per process for every user's results.
+"""
+import json
+import threading
+from collections import OrderedDict
+from sqlalchemy.exc import IntegrityError
+from app.models import db
+from app.models.exit_quiz import ExitQuizResponse
+from app.services.exit_quiz_engine import EXIT_STRATEGIES
+
+
+MAX_MEMOIZED_RESULTS = 4096
+
+# Inserts tried per submission when overlapping submits race for a version number
+MAX_VERSION_ATTEMPTS = 3
+
+# Strategy detail fields shared by every recommendation payload
+STRATEGY_DETAILS = {
+    key: {
+        'key': key,
+        'name': info.get('name', ''),
+        'category': info.get('category', ''),
+        'description': info.get('description', ''),
+        'best_for': info.get('best_for', '')
+    }
+    for key, info in EXIT_STRATEGIES.items()
+}
+
+_RESULT_COLUMNS = (
+    ExitQuizResponse.id,
+    ExitQuizResponse.version,
+    ExitQuizResponse.top_recommendation,
+    ExitQuizResponse.second_recommendation,
+    ExitQuizResponse.third_recommendation,
+    ExitQuizResponse.all_scores,
+    ExitQuizResponse.created_at
+)
+
+_payloads = OrderedDict()  # snapshot id -> (stored results, payload)
+_payloads_lock = threading.Lock()
+
+
+def encode_responses(responses):
+    """Canonical compact JSON for a set of answers"""
+    return json.dumps(responses, sort_keys=True, separators=(',', ':'))
+
+
+def encode_scores(scores):
+    return json.dumps(scores, separators=(',', ':'))
+
+
+def build_recommendations(top_3, all_scores):
+    """Ranked recommendation entries with full strategy details"""
+    return [
+        {
+            'rank': rank,
+            **STRATEGY_DETAILS.get(strategy_key, {'key': strategy_key, 'name': '', 'category': '',
+                                                  'description': '', 'best_for': ''}),
+            'score': all_scores.get(strategy_key, 0)
+        }
+        for rank, strategy_key in enumerate(top_3, 1)
+        if strategy_key
+    ]
+
+
+def save_snapshot(user_id, responses, results):
+    """
+    Record a quiz submission as the user's next version
+
+    The version is inserted under a savepoint; when an overlapping submit
+    (double click, second tab) took the same number first, the unique
+    constraint rejects it and the newest version is read again, so the
+    submission either matches that version or goes in after it. The caller
+    commits.
+
+    Returns:
+        Tuple of (snapshot, created). When the answers and scores match the
+        current version, that version is returned and nothing is added.
+    """
+    encoded_responses = encode_responses(responses)
+    encoded_scores = encode_scores(results['all_scores'])
+    top_3 = results['top_recommendations']
+
+    for attempt in range(MAX_VERSION_ATTEMPTS):
+        latest = ExitQuizResponse.query.filter_by(user_id=int(user_id))\
+            .order_by(ExitQuizResponse.version.desc())\
+            .first()
+        if latest and latest.responses == encoded_responses and latest.all_scores == encoded_scores:
+            return latest, False
+
+        snapshot = ExitQuizResponse(
+            user_id=int(user_id),
+            version=latest.version + 1 if latest else 1,
+            responses=encoded_responses,
+            top_recommendation=top_3[0] if len(top_3) > 0 else None,
+            second_recommendation=top_3[1] if len(top_3) > 1 else None,
+            third_recommendation=top_3[2] if len(top_3) > 2 else None,
+            all_scores=encoded_scores
+        )
+        try:
+            with db.session.begin_nested():
+                db.session.add(snapshot)
+        except IntegrityError:
+            if attempt == MAX_VERSION_ATTEMPTS - 1:
+                raise
+            continue
+        return snapshot, True
+
+
+def latest_responses(user_id):
+    """Answers from the user's newest quiz version, or None"""
+    raw = db.session.query(ExitQuizResponse.responses)\
+        .filter(ExitQuizResponse.user_id == int(user_id))\
+        .order_by(ExitQuizResponse.version.desc())\
+        .limit(1)\
+        .scalar()
+    if raw is None:
+        return None
+    return json.loads(raw) if raw else {}
+
+
+def _render(row):
+    all_scores = json.loads(row.all_scores) if row.all_scores else {}
+    return {
+        'quiz_id': row.id,
+        'version': row.version,
+        'recommendations': build_recommendations(
+            [row.top_recommendation, row.second_recommendation, row.third_recommendation],
+            all_scores
+        ),
+        'completed_at': row.created_at.isoformat() if row.created_at else None,
+        'all_scores': all_scores
+    }
+
+
+def results_payload(user_id, version=None):
+    """
+    Results payload for the user's newest (or a given) quiz version, or None
+
+    The payload is shared between requests and must not be modified.
+    """
+    query = db.session.query(*_RESULT_COLUMNS).filter(ExitQuizResponse.user_id == int(user_id))
+    if version is not None:
+        query = query.filter(ExitQuizResponse.version == version)
+    row = query.order_by(ExitQuizResponse.version.desc()).first()
+    if row is None:
+        return None
+
+    stored = (row.top_recommendation, row.second_recommendation, row.third_recommendation, row.all_scores)
+    with _payloads_lock:
+        cached = _payloads.get(row.id)
+        if cached is not None and cached[0] == stored:
+            _payloads.move_to_end(row.id)
+            return cached[1]
+
+    payload = _render(row)
+    with _payloads_lock:
+        _payloads[row.id] = (stored, payload)
+        _payloads.move_to_end(row.id)
+        while len(_payloads) > MAX_MEMOIZED_RESULTS:
+            _payloads.popitem(last=False)
+    return payload
+
+
+def quiz_history(user_id):
+    """Every quiz version for the user, newest first"""
+    rows = db.session.query(
+        ExitQuizResponse.id,
+        ExitQuizResponse.version,
+        ExitQuizResponse.top_recommendation,
+        ExitQuizResponse.second_recommendation,
+        ExitQuizResponse.third_recommendation,
+        ExitQuizResponse.created_at
+    )\
+        .filter(ExitQuizResponse.user_id == int(user_id))\
+        .order_by(ExitQuizResponse.version.desc())\
+        .all()
+    return [
+        {
+            'id': row.id,
+            'version': row.version,
+            'top_recommendation': row.top_recommendation,
+            'second_recommendation': row.second_recommendation,
+            'third_recommendation': row.third_recommendation,
+            'completed_at': row.created_at.isoformat() if row.created_at else None
+        }
+        for row in rows
+    ]
@@ -0,0 +1,164 @@
+"""
+PDF Report Cache
+Content-addressed on-disk store for rendered PDF reports
+
+A report is keyed by the SHA-256 of its kind, its normalized payload (the
+valuation inputs and business profile, or the assessment data), the
+report TEMPLATE_VERSION and the date printed on it. Identical requests
+therefore map to the same file and a repeat download is a file read
+instead of a ReportLab + matplotlib render. The key doubles as the ETag.
+
+Files live under PDF_CACHE_DIR (default: <instance>/pdf_cache) and are
+written to a temp file and renamed into place, so concurrent renders of
+the same report never see a partial file. When the store grows past
+PDF_CACHE_MAX_BYTES the least recently used files are removed; a cache
+hit bumps the file's mtime.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from datetime import date
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+
+# Bump when a report layout changes so cached PDFs are not served for it
+TEMPLATE_VERSION = 1
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Eviction trims the store to this share of the limit
+EVICT_TO = 0.9
+
+_EXTENSION_KEY = 'pdf_cache'
+_create_lock = threading.Lock()
+
+
+def report_cache_key(kind, payload):
+    """Hex digest identifying a rendered report"""
+    normalized = json.dumps(
+        {
+            'kind': kind,
+            'payload': payload,
+            'template_version': TEMPLATE_VERSION,
+            # Reports print the date they were generated
+            'date': date.today().isoformat()
+        },
+        sort_keys=True,
+        separators=(',', ':'),
+        default=str
+    )
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class PDFCache:
+    """Bounded directory of PDFs named by their cache key"""
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._size = None  # bytes stored, counted on first write
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.pdf")
+
+    def get(self, key):
+        """Path of the cached PDF, or None; marks it recently used"""
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def read(self, key):
+        """Bytes of the cached PDF, or None"""
+        path = self.get(key)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, data):
+        """Store a rendered PDF (bytes or a binary file object) and return its path"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                if isinstance(data, (bytes, bytearray)):
+                    f.write(data)
+                else:
+                    shutil.copyfileobj(data, f)
+                size = f.tell()
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += size
+            if self._size > self.max_bytes:
+                self._evict()
+        return path
+
+    def _entries(self):
+        """(mtime, size, path) of every cached PDF"""
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.pdf'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield stat.st_mtime, stat.st_size, path
+
+    def _evict(self):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * EVICT_TO
+        removed = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        self._size = total
+        logger.info(f"Evicted {removed} cached PDFs, {total} bytes kept")
+
+
+def get_pdf_cache(app=None):
+    """The app's PDF cache, created on first use"""
+    app = app or current_app._get_current_object()
+    cache = app.extensions.get(_EXTENSION_KEY)
+    if cache is None:
+        with _create_lock:
+            cache = app.extensions.get(_EXTENSION_KEY)
+            if cache is None:
+                cache = PDFCache(
+                    app.config.get('PDF_CACHE_DIR') or os.path.join(app.instance_path, 'pdf_cache'),
+                    max_bytes=app.config.get('PDF_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+                )
+                app.extensions[_EXTENSION_KEY] = cache
+    return cache
@@ -0,0 +1,214 @@
+"""
+PDF Report Charts
+Chart images for the PDF reports, rendered without pyplot and cached
+
+Charts are drawn on a standalone matplotlib Figure with its own Agg canvas
+instead of through pyplot, so there is no global figure state to manage or
+close and renders on different threads do not share a figure. Rendered
+images are cached in process, keyed by the SHA-256 of the chart type,
+output format and data, so reports that plot the same numbers (e.g. a
+re-download after the PDF cache expired, or the same valuation printed as
+several reports) reuse the image instead of rendering it again.
+
+Besides PNG, charts can be rendered as SVG or PDF for vector output, or
+built as native ReportLab drawings (chart_drawing) which are embedded in
+the report as vector graphics without going through matplotlib at all.
+"""
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.piecharts import Pie
+from reportlab.graphics.shapes import Drawing, Group, String
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+from reportlab.platypus import Image
+
+
+# Bump when the chart styling changes so cached images are not reused
+CHART_VERSION = 1
+
+CHART_COLORS = ['#3b82f6', '#10b981', '#f59e0b', '#ef4444', '#8b5cf6']
+
+FORMATS = ('png', 'svg', 'pdf')
+
+DEFAULT_DPI = 150
+CHART_WIDTH = 6 * inch
+CHART_HEIGHT = 3.75 * inch
+
+MAX_CACHED_CHART_BYTES = 32 * 1024 * 1024
+
+_charts = OrderedDict()  # chart key -> image bytes
+_charts_size = 0
+_charts_lock = threading.Lock()
+
+
+def chart_key(data_dict, chart_type='bar', fmt='png', dpi=DEFAULT_DPI):
+    """Hex digest identifying a rendered chart image"""
+    normalized = json.dumps(
+        {
+            'type': chart_type,
+            'format': fmt,
+            'dpi': dpi,
+            'data': list(data_dict.items()),
+            'version': CHART_VERSION
+        },
+        separators=(',', ':'),
+        default=str
+    )
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def _draw(data_dict, chart_type):
+    # matplotlib is only loaded by the first PNG/SVG/PDF chart; vector reports never need it
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(8, 5))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    labels = list(data_dict.keys())
+    values = list(data_dict.values())
+
+    if chart_type == 'bar':
+        bars = ax.bar(labels, values, color=CHART_COLORS[:len(labels)])
+
+        # Add value labels on bars
+        for bar in bars:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2., height,
+                    f'${height:,.0f}',
+                    ha='center', va='bottom', fontsize=10, fontweight='bold')
+
+        ax.set_ylabel('Business Value ($)', fontsize=12, fontweight='bold')
+        ax.set_xlabel('Valuation Method', fontsize=12, fontweight='bold')
+        ax.set_title('Valuation Methods Comparison', fontsize=14, fontweight='bold', pad=20)
+
+        # Rotate x-axis labels for better readability
+        for label in ax.get_xticklabels():
+            label.set_rotation(15)
+            label.set_horizontalalignment('right')
+
+    elif chart_type == 'pie':
+        ax.pie(values, labels=labels, autopct='%1.1f%%', startangle=90,
+               colors=CHART_COLORS[:len(labels)])
+        ax.set_title('Valuation Distribution', fontsize=14, fontweight='bold', pad=20)
+
+    else:
+        raise ValueError(f'Unknown chart type: {chart_type}')
+
+    # Style improvements
+    ax.grid(axis='y', alpha=0.3, linestyle='--')
+    fig.tight_layout()
+    return fig
+
+
+def render_chart(data_dict, chart_type='bar', fmt='png', dpi=DEFAULT_DPI):
+    """
+    Chart image bytes in the given format ('png', 'svg' or 'pdf')
+
+    The bytes are cached by chart_key; callers get the shared copy.
+    """
+    global _charts_size
+
+    if fmt not in FORMATS:
+        raise ValueError(f'Unknown chart format: {fmt}')
+
+    key = chart_key(data_dict, chart_type, fmt, dpi)
+    with _charts_lock:
+        image = _charts.get(key)
+        if image is not None:
+            _charts.move_to_end(key)
+            return image
+
+    buf = io.BytesIO()
+    _draw(data_dict, chart_type).savefig(buf, format=fmt, dpi=dpi, bbox_inches='tight')
+    image = buf.getvalue()
+
+    with _charts_lock:
+        if key not in _charts:
+            _charts[key] = image
+            _charts_size += len(image)
+        while _charts_size > MAX_CACHED_CHART_BYTES and len(_charts) > 1:
+            _, evicted = _charts.popitem(last=False)
+            _charts_size -= len(evicted)
+    return image
+
+
+def chart_drawing(data_dict, chart_type='bar', width=CHART_WIDTH, height=CHART_HEIGHT):
+    """Native ReportLab drawing of the chart (vector, no matplotlib)"""
+    labels = list(data_dict.keys())
+    values = [float(value or 0) for value in data_dict.values()]
+    fills = [colors.HexColor(CHART_COLORS[i % len(CHART_COLORS)]) for i in range(len(labels))]
+
+    drawing = Drawing(width, height)
+    title = 'Valuation Methods Comparison' if chart_type == 'bar' else 'Valuation Distribution'
+    drawing.add(String(width / 2, height - 16, title, fontName='Helvetica-Bold',
+                       fontSize=12, textAnchor='middle'))
+
+    if chart_type == 'bar':
+        chart = VerticalBarChart()
+        chart.x, chart.y = 80, 50
+        chart.width, chart.height = width - 100, height - 90
+        chart.data = [values]
+        chart.categoryAxis.categoryNames = labels
+        chart.categoryAxis.labels.angle = 15
+        chart.categoryAxis.labels.boxAnchor = 'ne'
+        chart.categoryAxis.labels.fontName = 'Helvetica'
+        chart.categoryAxis.labels.fontSize = 8
+        chart.valueAxis.valueMin = 0
+        chart.valueAxis.labels.fontName = 'Helvetica'
+        chart.valueAxis.labels.fontSize = 8
+        chart.valueAxis.labelTextFormat = lambda value: f'${value:,.0f}'
+        chart.valueAxis.visibleGrid = True
+        chart.valueAxis.gridStrokeColor = colors.HexColor('#e5e7eb')
+        chart.valueAxis.gridStrokeDashArray = (2, 2)
+        chart.barLabelFormat = lambda value: f'${value:,.0f}'
+        chart.barLabels.nudge = 7
+        chart.barLabels.fontName = 'Helvetica-Bold'
+        chart.barLabels.fontSize = 8
+        chart.bars.strokeColor = None
+        chart.categoryAxis.style = 'parallel'
+        for i, fill in enumerate(fills):
+            chart.bars[(0, i)].fillColor = fill
+
+        drawing.add(String(chart.x + chart.width / 2, 4, 'Valuation Method',
+                           fontName='Helvetica-Bold', fontSize=9, textAnchor='middle'))
+        y_title = Group(String(0, 0, 'Business Value ($)', fontName='Helvetica-Bold',
+                               fontSize=9, textAnchor='middle'))
+        y_title.translate(12, chart.y + chart.height / 2)
+        y_title.rotate(90)
+        drawing.add(y_title)
+
+    elif chart_type == 'pie':
+        chart = Pie()
+        size = min(width, height) - 60
+        chart.x, chart.y = (width - size) / 2, 20
+        chart.width = chart.height = size
+        chart.data = values
+        total = sum(values)
+        chart.labels = [f'{label} ({value / total:.1%})' if total else label
+                        for label, value in zip(labels, values)]
+        chart.startAngle = 90
+        chart.direction = 'anticlockwise'
+        chart.slices.strokeColor = colors.white
+        chart.slices.fontName = 'Helvetica'
+        chart.slices.fontSize = 8
+        for i, fill in enumerate(fills):
+            chart.slices[i].fillColor = fill
+
+    else:
+        raise ValueError(f'Unknown chart type: {chart_type}')
+
+    drawing.add(chart)
+    return drawing
+
+
+def chart_flowable(data_dict, chart_type='bar', vector=False, width=CHART_WIDTH, height=CHART_HEIGHT):
+    """Report flowable for the chart: a ReportLab drawing when vector, else a cached PNG"""
+    if vector:
+        return chart_drawing(data_dict, chart_type, width, height)
+    return Image(io.BytesIO(render_chart(data_dict, chart_type)), width=width, height=height)
@@ -4,69 +4,64 @@ Generates professional valuation reports with charts, disclosures, and methodolo
 """
 
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, Image
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
 from reportlab.lib import colors
 from reportlab.pdfgen import canvas
 from reportlab.lib.utils import ImageReader
 from datetime import datetime
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
+from xml.sax.saxutils import escape
+from app.services.pdf_charts import chart_flowable
+from app.services.pdf_templates import report_styles, static_paragraph
 import io
 import os
 
+# Table styles are the same in every report, so they are built once
+SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 1), (-1, -1), 10),
+    ('PADDING', (0, 0), (-1, -1), 8),
+])
+
+RESULTS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 11),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+    ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#fef3c7')),
+    ('FONTSIZE', (0, 1), (-1, -1), 10),
+    ('PADDING', (0, 0), (-1, -1), 8),
+])
+
+PROFILE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e5e7eb')),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('PADDING', (0, 0), (-1, -1), 8),
+])
+
+
 class ValuationPDFGenerator:
     """Generate professional PDF reports for business valuations"""
     
-    def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
-        
-    def _setup_custom_styles(self):
-        """Setup custom paragraph styles"""
-        # Title style
-        self.styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1e40af'),
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        ))
-        
-        # Subtitle style
-        self.styles.add(ParagraphStyle(
-            name='SubTitle',
-            parent=self.styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#3b82f6'),
-            spaceAfter=12,
-            spaceBefore=12,
-            fontName='Helvetica-Bold'
-        ))
-        
-        # Disclosure style
-        self.styles.add(ParagraphStyle(
-            name='Disclosure',
-            parent=self.styles['Normal'],
-            fontSize=9,
-            textColor=colors.HexColor('#6b7280'),
-            alignment=TA_JUSTIFY,
-            leading=12
-        ))
-        
-        # Method description style
-        self.styles.add(ParagraphStyle(
-            name='MethodDesc',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            leading=14,
-            spaceAfter=8
-        ))
+    def __init__(self, vector_charts=False):
+        # vector_charts draws charts as ReportLab vector graphics instead of PNG images
+        self.vector_charts = vector_charts
+        self.styles = report_styles()
         
     def _create_header_footer(self, canvas_obj, doc):
         """Add header and footer to each page"""
@@ -94,55 +89,18 @@ class ValuationPDFGenerator:
         canvas_obj.restoreState()
         
     def _create_chart(self, data_dict, chart_type='bar'):
-        """Create matplotlib chart and return as image buffer"""
-        fig, ax = plt.subplots(figsize=(8, 5))
-        
-        if chart_type == 'bar':
-            methods = list(data_dict.keys())
-            values = list(data_dict.values())
-            
-            colors_list = ['#3b82f6', '#10b981', '#f59e0b', '#ef4444', '#8b5cf6']
-            bars = ax.bar(methods, values, color=colors_list[:len(methods)])
-            
-            # Add value labels on bars
-            for bar in bars:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                       f'${height:,.0f}',
-                       ha='center', va='bottom', fontsize=10, fontweight='bold')
-            
-            ax.set_ylabel('Business Value ($)', fontsize=12, fontweight='bold')
-            ax.set_xlabel('Valuation Method', fontsize=12, fontweight='bold')
-            ax.set_title('Valuation Methods Comparison', fontsize=14, fontweight='bold', pad=20)
-            
-            # Rotate x-axis labels for better readability
-            plt.xticks(rotation=15, ha='right')
-            
-        elif chart_type == 'pie':
-            methods = list(data_dict.keys())
-            values = list(data_dict.values())
-            colors_list = ['#3b82f6', '#10b981', '#f59e0b', '#ef4444', '#8b5cf6']
-            
-            ax.pie(values, labels=methods, autopct='%1.1f%%', startangle=90,
-                  colors=colors_list[:len(methods)])
-            ax.set_title('Valuation Distribution', fontsize=14, fontweight='bold', pad=20)
-        
-        # Style improvements
-        ax.grid(axis='y', alpha=0.3, linestyle='--')
-        plt.tight_layout()
-        
-        # Save to buffer
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=150, bbox_inches='tight')
-        buf.seek(0)
-        plt.close()
+        """Chart flowable for the report (see pdf_charts.py)"""
+        return chart_flowable(data_dict, chart_type, vector=self.vector_charts)
         
-        return buf
-        
-    def generate_advanced_report(self, valuation_data, business_profile, filename):
-        """Generate comprehensive PDF report for advanced valuation"""
-        
-        doc = SimpleDocTemplate(filename, pagesize=letter,
+    def generate_advanced_report(self, valuation_data, business_profile, output=None):
+        """
+        Generate comprehensive PDF report for advanced valuation
+
+        Writes into output (a binary file object, or a new BytesIO when
+        omitted) and returns it rewound to the start.
+        """
+        output = output if output is not None else io.BytesIO()
+        doc = SimpleDocTemplate(output, pagesize=letter,
                                topMargin=1*inch, bottomMargin=0.75*inch,
                                leftMargin=0.75*inch, rightMargin=0.75*inch)
         
@@ -151,7 +109,7 @@ class ValuationPDFGenerator:
         # ===== COVER PAGE =====
         story.append(Spacer(1, 2*inch))
         
-        story.append(Paragraph("Business Valuation Report", self.styles['CustomTitle']))
+        story.append(static_paragraph("Business Valuation Report", 'CustomTitle'))
         story.append(Spacer(1, 0.3*inch))
         
         story.append(Paragraph(f"<b>{business_profile.get('business_name', 'Your Business')}</b>", 
@@ -171,25 +129,13 @@ class ValuationPDFGenerator:
         ]
         
         summary_table = Table(summary_data, colWidths=[3*inch, 2.5*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('PADDING', (0, 0), (-1, -1), 8),
-        ]))
+        summary_table.setStyle(SUMMARY_TABLE_STYLE)
         
         story.append(summary_table)
         story.append(PageBreak())
         
         # ===== DISCLOSURE & DISCLAIMER =====
-        story.append(Paragraph("Important Disclosure", self.styles['SubTitle']))
+        story.append(static_paragraph("Important Disclosure", 'SubTitle'))
         
         disclosure_text = """
         <b>PROFESSIONAL DISCLOSURE:</b> This valuation report has been prepared using automated valuation 
@@ -215,12 +161,12 @@ class ValuationPDFGenerator:
         accordingly. Unauthorized distribution or use is prohibited.
         """
         
-        story.append(Paragraph(disclosure_text, self.styles['Disclosure']))
+        story.append(static_paragraph(disclosure_text, 'Disclosure'))
         story.append(Spacer(1, 0.3*inch))
         story.append(PageBreak())
         
         # ===== BUSINESS PROFILE =====
-        story.append(Paragraph("Business Profile", self.styles['SubTitle']))
+        story.append(static_paragraph("Business Profile", 'SubTitle'))
         
         profile_data = [
             ['Business Name', business_profile.get('business_name', 'N/A')],
@@ -232,21 +178,14 @@ class ValuationPDFGenerator:
         ]
         
         profile_table = Table(profile_data, colWidths=[2.5*inch, 4*inch])
-        profile_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e5e7eb')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('PADDING', (0, 0), (-1, -1), 8),
-        ]))
+        profile_table.setStyle(PROFILE_TABLE_STYLE)
         
         story.append(profile_table)
         story.append(Spacer(1, 0.3*inch))
         story.append(PageBreak())
         
         # ===== VALUATION RESULTS =====
-        story.append(Paragraph("Valuation Results", self.styles['SubTitle']))
+        story.append(static_paragraph("Valuation Results", 'SubTitle'))
         
         # Create results table
         results_data = [
@@ -278,19 +217,7 @@ class ValuationPDFGenerator:
         ])
         
         results_table = Table(results_data, colWidths=[2.2*inch, 1.8*inch, 1*inch, 1.8*inch])
-        results_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#fef3c7')),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('PADDING', (0, 0), (-1, -1), 8),
-        ]))
+        results_table.setStyle(RESULTS_TABLE_STYLE)
         
         story.append(results_table)
         story.append(Spacer(1, 0.4*inch))
@@ -299,13 +226,11 @@ class ValuationPDFGenerator:
         chart_data = {method_key.replace('_', ' ').title(): method_info.get('value', 0) 
                       for method_key, method_info in methods.items()}
         
-        chart_buffer = self._create_chart(chart_data, chart_type='bar')
-        chart_image = Image(chart_buffer, width=6*inch, height=3.75*inch)
-        story.append(chart_image)
+        story.append(self._create_chart(chart_data, chart_type='bar'))
         story.append(PageBreak())
         
         # ===== METHODOLOGY SECTION =====
-        story.append(Paragraph("Valuation Methodologies", self.styles['SubTitle']))
+        story.append(static_paragraph("Valuation Methodologies", 'SubTitle'))
         
         methodologies = {
             'SDE Multiple': """
@@ -359,14 +284,14 @@ class ValuationPDFGenerator:
         
         for method_name, description in methodologies.items():
             if any(method_name.lower().replace(' ', '_') in key.lower() for key in methods.keys()):
-                story.append(Paragraph(method_name, self.styles['Heading3']))
-                story.append(Paragraph(description, self.styles['MethodDesc']))
+                story.append(static_paragraph(method_name, 'Heading3'))
+                story.append(static_paragraph(description, 'MethodDesc'))
                 story.append(Spacer(1, 0.2*inch))
         
         story.append(PageBreak())
         
         # ===== KEY FINANCIAL RATIOS & BENCHMARKS =====
-        story.append(Paragraph("Key Financial Ratios & Industry Benchmarks", self.styles['SubTitle']))
+        story.append(static_paragraph("Key Financial Ratios & Industry Benchmarks", 'SubTitle'))
         
         # Calculate ratios
         revenue = business_profile.get('revenue', 0)
@@ -404,7 +329,7 @@ class ValuationPDFGenerator:
         story.append(PageBreak())
         
         # ===== NEXT STEPS =====
-        story.append(Paragraph("Recommended Next Steps", self.styles['SubTitle']))
+        story.append(static_paragraph("Recommended Next Steps", 'SubTitle'))
         
         next_steps_text = """
         <b>1. Validate and Refine Assumptions</b>
@@ -433,18 +358,24 @@ class ValuationPDFGenerator:
         Well-documented businesses command premium valuations.
         """
         
-        story.append(Paragraph(next_steps_text, self.styles['MethodDesc']))
+        story.append(static_paragraph(next_steps_text, 'MethodDesc'))
         
         # Build PDF with custom header/footer
         doc.build(story, onFirstPage=self._create_header_footer, 
                  onLaterPages=self._create_header_footer)
         
-        return filename
+        output.seek(0)
+        return output
     
-    def generate_basic_report(self, valuation_data, business_profile, filename):
-        """Generate simplified PDF report for basic valuation"""
-        
-        doc = SimpleDocTemplate(filename, pagesize=letter,
+    def generate_basic_report(self, valuation_data, business_profile, output=None):
+        """
+        Generate simplified PDF report for basic valuation
+
+        Writes into output (a binary file object, or a new BytesIO when
+        omitted) and returns it rewound to the start.
+        """
+        output = output if output is not None else io.BytesIO()
+        doc = SimpleDocTemplate(output, pagesize=letter,
                                topMargin=1*inch, bottomMargin=0.75*inch,
                                leftMargin=0.75*inch, rightMargin=0.75*inch)
         
@@ -452,7 +383,7 @@ class ValuationPDFGenerator:
         
         # ===== COVER PAGE =====
         story.append(Spacer(1, 2*inch))
-        story.append(Paragraph("Quick Business Valuation", self.styles['CustomTitle']))
+        story.append(static_paragraph("Quick Business Valuation", 'CustomTitle'))
         story.append(Spacer(1, 0.3*inch))
         
         story.append(Paragraph(f"<b>{business_profile.get('business_name', 'Your Business')}</b>", 
@@ -476,25 +407,13 @@ class ValuationPDFGenerator:
         ]
         
         result_table = Table(result_data, colWidths=[2.5*inch, 3*inch])
-        result_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('PADDING', (0, 0), (-1, -1), 8),
-        ]))
+        result_table.setStyle(SUMMARY_TABLE_STYLE)
         
         story.append(result_table)
         story.append(PageBreak())
         
         # ===== DISCLOSURE (Shorter version) =====
-        story.append(Paragraph("Important Notice", self.styles['SubTitle']))
+        story.append(static_paragraph("Important Notice", 'SubTitle'))
         
         disclosure_text = """
         <b>INFORMATIONAL PURPOSES ONLY:</b> This quick valuation is a preliminary estimate based on limited 
@@ -508,12 +427,12 @@ class ValuationPDFGenerator:
         by credentialed valuators are required for regulatory, litigation, or tax purposes.
         """
         
-        story.append(Paragraph(disclosure_text, self.styles['Disclosure']))
+        story.append(static_paragraph(disclosure_text, 'Disclosure'))
         story.append(Spacer(1, 0.3*inch))
         story.append(PageBreak())
         
         # ===== BUSINESS INFO & CALCULATION =====
-        story.append(Paragraph("Your Business Information", self.styles['SubTitle']))
+        story.append(static_paragraph("Your Business Information", 'SubTitle'))
         
         profile_data = [
             ['Business Name', business_profile.get('business_name', 'N/A')],
@@ -523,14 +442,7 @@ class ValuationPDFGenerator:
         ]
         
         profile_table = Table(profile_data, colWidths=[2*inch, 4.5*inch])
-        profile_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e5e7eb')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('PADDING', (0, 0), (-1, -1), 8),
-        ]))
+        profile_table.setStyle(PROFILE_TABLE_STYLE)
         
         story.append(profile_table)
         story.append(Spacer(1, 0.3*inch))
@@ -554,13 +466,11 @@ class ValuationPDFGenerator:
             'High Range': value_range_high
         }
         
-        chart_buffer = self._create_chart(chart_data, chart_type='bar')
-        chart_image = Image(chart_buffer, width=6*inch, height=3.75*inch)
-        story.append(chart_image)
+        story.append(self._create_chart(chart_data, chart_type='bar'))
         story.append(PageBreak())
         
         # ===== NEXT STEPS (Simplified) =====
-        story.append(Paragraph("Next Steps", self.styles['SubTitle']))
+        story.append(static_paragraph("Next Steps", 'SubTitle'))
         
         next_steps = """
         <b>1. Verify Your Numbers</b>
@@ -576,10 +486,115 @@ class ValuationPDFGenerator:
         <br/>Work on improving profitability, reducing owner dependency, and diversifying your customer base to increase value.
         """
         
-        story.append(Paragraph(next_steps, self.styles['MethodDesc']))
+        story.append(static_paragraph(next_steps, 'MethodDesc'))
         
         # Build PDF
         doc.build(story, onFirstPage=self._create_header_footer, 
                  onLaterPages=self._create_header_footer)
         
-        return filename
+        output.seek(0)
+        return output
+
+
+class ClientPackPDFGenerator(ValuationPDFGenerator):
+    """Quarterly client pack: valuation, assessment, wealth gap and exit quiz on a few pages"""
+
+    def _key_value_table(self, rows, col_widths=(2.5*inch, 4*inch)):
+        table = Table(rows, colWidths=list(col_widths))
+        table.setStyle(PROFILE_TABLE_STYLE)
+        return table
+
+    def _section(self, story, title, rows, missing, col_widths=(2.5*inch, 4*inch)):
+        story.append(static_paragraph(title, 'SubTitle'))
+        if rows:
+            story.append(self._key_value_table(rows, col_widths))
+        else:
+            story.append(static_paragraph(missing, 'MethodDesc'))
+        story.append(Spacer(1, 0.3*inch))
+
+    @staticmethod
+    def _money(value):
+        return f"${value:,.0f}" if value is not None else 'N/A'
+
+    def generate_client_pack(self, pack, output=None):
+        """
+        Generate one client's pack from a plain-dict pack (see report_packs.py)
+
+        Writes into output (a binary file object, or a new BytesIO when
+        omitted) and returns it rewound to the start.
+        """
+        output = output if output is not None else io.BytesIO()
+        doc = SimpleDocTemplate(output, pagesize=letter,
+                               topMargin=1*inch, bottomMargin=0.75*inch,
+                               leftMargin=0.75*inch, rightMargin=0.75*inch)
+
+        client = pack.get('client') or {}
+        business = pack.get('business') or {}
+        story = []
+
+        # ===== COVER =====
+        story.append(Spacer(1, 0.5*inch))
+        story.append(static_paragraph("Client Exit Planning Pack", 'CustomTitle'))
+        story.append(Paragraph(f"<b>{escape(business.get('business_name') or 'Business')}</b>",
+                               self.styles['Heading2']))
+        story.append(Paragraph(
+            f"Prepared for {escape(client.get('name') or 'N/A')} | {escape(pack.get('period', ''))}",
+            self.styles['Normal']))
+        story.append(Spacer(1, 0.3*inch))
+
+        self._section(story, "Business Profile", [
+            ['Industry', business.get('industry') or 'N/A'],
+            ['Annual Revenue', self._money(business.get('revenue'))],
+            ['EBITDA', self._money(business.get('ebitda'))],
+            ['Number of Employees', str(business.get('employees') or 'N/A')],
+            ['Exit Horizon', business.get('exit_horizon') or 'N/A'],
+            ['Preferred Exit', business.get('preferred_exit_type') or 'N/A'],
+        ] if business else None, "No business profile yet.")
+
+        # ===== VALUATION =====
+        valuation = pack.get('valuation')
+        self._section(story, "Valuation", [
+            ['Estimated Value', self._money(valuation.get('valuation_amount'))],
+            ['Value Range', f"{self._money(valuation.get('low_range'))} - {self._money(valuation.get('high_range'))}"],
+            ['Method', (valuation.get('method') or 'N/A').upper()],
+            ['Valuation Date', (valuation.get('valuation_date') or 'N/A')[:10]],
+        ] if valuation else None, "No valuation has been completed.")
+
+        # ===== WEALTH GAP =====
+        wealth_gap = pack.get('wealth_gap')
+        coverage = (wealth_gap or {}).get('exit_coverage_ratio')
+        self._section(story, "Wealth Gap", [
+            ['Wealth Goal', self._money(wealth_gap.get('wealth_goal'))],
+            ['Current Net Worth', self._money(wealth_gap.get('current_net_worth'))],
+            ['Wealth Gap', self._money(wealth_gap.get('wealth_gap'))],
+            ['After-Tax Exit Proceeds', self._money(wealth_gap.get('exit_after_tax_proceeds'))],
+            ['Gap Covered by Exit', f"{coverage:.0%}" if coverage is not None else 'N/A'],
+        ] if wealth_gap else None, "No wealth gap analysis yet.")
+
+        story.append(PageBreak())
+
+        # ===== ASSESSMENT =====
+        assessment = pack.get('assessment')
+        rows = None
+        if assessment:
+            rows = [
+                ['Overall Score', f"{assessment.get('overall_score') or 0:.1f}"],
+                ['Questions Answered', str(assessment.get('answered_questions') or 0)],
+            ] + [
+                [category.replace('_', ' ').title(), f"{score or 0:.1f}"]
+                for category, score in (assessment.get('category_scores') or {}).items()
+            ]
+        self._section(story, "Attractiveness Assessment", rows, "No assessment has been started.")
+
+        # ===== EXIT QUIZ =====
+        exit_quiz = pack.get('exit_quiz')
+        self._section(story, "Exit Strategy Fit", [
+            [f"{rec.get('rank')}. {rec.get('name') or rec.get('key')}", f"Score {rec.get('score', 0)}"]
+            for rec in (exit_quiz or {}).get('recommendations', [])
+        ], "The exit strategy quiz has not been taken.", col_widths=(4.5*inch, 2*inch))
+
+        doc.build(story, onFirstPage=self._create_header_footer,
+                  onLaterPages=self._create_header_footer)
+
+        output.seek(0)
+        return output
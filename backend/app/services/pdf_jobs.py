@@ -0,0 +1,487 @@
+"""
+PDF Job Queue
+Renders PDF reports in a process pool so requests return straight away
+
+A report is submitted as a kind plus a plain-dict payload and gets a job id
+back; the client polls the job status and downloads the PDF once it is
+done. Rendering runs in worker processes because matplotlib and ReportLab
+are not thread-safe and a render would otherwise hold a request thread for
+seconds. Reports already in the PDF cache (see pdf_cache.py) finish on
+submit without touching the pool, and every render is stored there once it
+completes.
+
+Job records are JSON files under <PDF_CACHE_DIR>/jobs and the PDFs live in
+the cache itself, so any web worker sharing that directory can answer
+status and download requests, not only the one that accepted the job. The
+process that accepted a job renders it and records the result. A job it
+never finishes (the process died) is dropped: a running job once its
+record has not been updated for PDF_JOB_TTL seconds, a queued one - which
+may wait behind a batch - once it is PDF_QUEUED_JOB_TIMEOUT seconds old.
+New jobs are refused once PDF_MAX_PENDING_JOBS are queued or running
+(503), or once a user has PDF_MAX_JOBS_PER_USER of their own in flight
+(429); the check and the new record are made under a file lock on the job
+directory, so the limits hold across web workers. Finished jobs are kept
+for PDF_JOB_TTL seconds; their PDFs for as long as the cache keeps them.
+
+Batch jobs (submit_batch) build one file from many renders, e.g. a ZIP of
+client packs. They run on a background thread that feeds the same process
+pool, write their file next to the job record and report progress in it;
+at most PDF_MAX_BATCH_JOBS run at once across the processes sharing the
+directory.
+"""
+import io
+import json
+import logging
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from flask import current_app
+from app.services.pdf_cache import get_pdf_cache, report_cache_key
+
+try:
+    import fcntl
+except ImportError:  # Windows: the limits are only enforced per process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_PENDING_JOBS = 32
+DEFAULT_MAX_JOBS_PER_USER = 2
+DEFAULT_MAX_BATCH_JOBS = 1
+DEFAULT_JOB_TTL = 600  # seconds
+DEFAULT_QUEUED_JOB_TIMEOUT = 3600  # seconds a job may wait for a pool worker
+
+# Batch progress is written to the job record at most this often (seconds)
+PROGRESS_INTERVAL = 1.0
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+FINISHED = (DONE, FAILED)
+
+JOB_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+_EXTENSION_KEY = 'pdf_jobs'
+_create_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------------
+# Renderers (run in the worker processes; payloads are plain dicts)
+# ---------------------------------------------------------------------------
+
+def _render_advanced_valuation(payload, output):
+    from app.services.pdf_generator import ValuationPDFGenerator
+    return ValuationPDFGenerator(payload.get('vector_charts', False)).generate_advanced_report(payload['valuation_data'], payload['business_profile'], output)
+
+
+def _render_basic_valuation(payload, output):
+    from app.services.pdf_generator import ValuationPDFGenerator
+    return ValuationPDFGenerator(payload.get('vector_charts', False)).generate_basic_report(payload['valuation_data'], payload['business_profile'], output)
+
+
+def _render_assessment(payload, output):
+    from app.utils.pdf_generator import AssessmentPDFGenerator
+    return AssessmentPDFGenerator().generate_report(payload['assessment_data'], output=output)
+
+
+def _render_assessment_appendix(payload, output):
+    from app.utils.pdf_generator import AssessmentPDFGenerator
+    return AssessmentPDFGenerator().generate_appendix(payload['appendix_data'], output)
+
+
+def _render_client_pack(payload, output):
+    from app.services.pdf_generator import ClientPackPDFGenerator
+    return ClientPackPDFGenerator().generate_client_pack(payload['pack'], output)
+
+
+def load_renderers():
+    """
+    Pool initializer: import ReportLab and matplotlib once per worker
+
+    The web process only loads them if it renders a report itself, so their
+    import time and memory stay in the workers rather than every web worker.
+    """
+    from app.services.pdf_generator import ValuationPDFGenerator
+    from app.utils.pdf_generator import AssessmentPDFGenerator
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+def worker_context():
+    """
+    Multiprocessing context for render pools
+
+    Workers are spawned as fresh interpreters: a forked web worker would
+    carry its threads, locks and DB connections. A spawned worker re-imports
+    the parent's __main__ script as __mp_main__ before it runs anything, so
+    entry scripts must not do work at import time outside that guard;
+    run.py skips create_app() there, and the other scripts only act under
+    if __name__ == '__main__'.
+    """
+    return multiprocessing.get_context('spawn')
+
+
+RENDERERS = {
+    'advanced-valuation': _render_advanced_valuation,
+    'basic-valuation': _render_basic_valuation,
+    'assessment': _render_assessment,
+    'assessment-appendix': _render_assessment_appendix,
+    'client-pack': _render_client_pack
+}
+
+
+def render_report(kind, payload, output=None):
+    """
+    Render one report into output and return it rewound
+
+    output is any writable binary file object; a new BytesIO by default.
+    """
+    return RENDERERS[kind](payload, output if output is not None else io.BytesIO())
+
+
+def render_report_bytes(kind, payload):
+    """Render one report to PDF bytes (what the worker processes send back)"""
+    return render_report(kind, payload).getvalue()
+
+
+def _render_job(job_directory, job_id, kind, payload):
+    """Worker entry point: mark the job running, then render it"""
+    try:
+        JobStore(job_directory).update(job_id, status=RUNNING)
+    except OSError as e:
+        logger.warning(f"Could not mark PDF job {job_id} running: {e}")
+    return render_report_bytes(kind, payload)
+
+
+# ---------------------------------------------------------------------------
+# Queue
+# ---------------------------------------------------------------------------
+
+class JobLimitError(Exception):
+    """A job was refused; status_code is 429 (per user) or 503 (queue full)"""
+
+    def __init__(self, message, status_code, retry_after):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def job_status(job):
+    """The client-facing fields of a job record"""
+    data = {
+        'job_id': job['job_id'],
+        'kind': job['kind'],
+        'status': job['status'],
+        'filename': job['filename'],
+        'cached': job['cached'],
+        'created_at': job['created_at'],
+        'finished_at': job['finished_at']
+    }
+    if job.get('progress') is not None:
+        data['progress'] = job['progress']
+    if job['status'] == FAILED:
+        data['error'] = 'Failed to generate PDF'
+    return data
+
+
+class JobStore:
+    """
+    Job records as one JSON file per job
+
+    Files are written to a temp file and renamed into place, so readers in
+    other processes never see a partial record.
+    """
+
+    def __init__(self, directory, ttl=DEFAULT_JOB_TTL, queued_timeout=DEFAULT_QUEUED_JOB_TIMEOUT):
+        self.directory = directory
+        self.ttl = ttl
+        self.queued_timeout = queued_timeout
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, job_id):
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    def output_path(self, job_id):
+        """Where a batch job's file is written"""
+        return os.path.join(self.directory, f"{job_id}.out")
+
+    def _expired(self, job, now):
+        if job['status'] in FINISHED:
+            return job['finished_at'] < now - self.ttl
+        if job['status'] == QUEUED:
+            # Nothing updates a job while it waits in the pool queue
+            return job['created_at'] < now - self.queued_timeout
+        # Running but not updated for a whole TTL: the process running it is gone
+        return job['updated_at'] < now - self.ttl
+
+    @contextmanager
+    def locked(self):
+        """Hold an exclusive lock on the job directory, across processes"""
+        with open(os.path.join(self.directory, '.lock'), 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def save(self, job):
+        job['updated_at'] = time.time()
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(job, f)
+            os.replace(tmp_path, self._path(job['job_id']))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _read(self, job_id):
+        if not JOB_ID_PATTERN.match(job_id):
+            return None
+        try:
+            with open(self._path(job_id)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def load(self, job_id):
+        """The job record, or None if it is unknown or expired"""
+        job = self._read(job_id)
+        return None if job is None or self._expired(job, time.time()) else job
+
+    def update(self, job_id, **changes):
+        # No expiry check: the process still working on a job may always record it
+        job = self._read(job_id)
+        if job is None:
+            return None
+        # A late 'running' must not overwrite the finished state
+        if job['status'] in FINISHED and changes.get('status') not in FINISHED:
+            return job
+        job.update(changes)
+        self.save(job)
+        return job
+
+    def active(self):
+        """Queued and running jobs; removes expired records on the way"""
+        now = time.time()
+        jobs = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path) as f:
+                    job = json.load(f)
+            except (FileNotFoundError, ValueError):
+                continue
+            if self._expired(job, now):
+                for expired_path in (path, self.output_path(job['job_id'])):
+                    try:
+                        os.remove(expired_path)
+                    except FileNotFoundError:
+                        pass
+            elif job['status'] not in FINISHED:
+                jobs.append(job)
+        return jobs
+
+
+class PDFJobQueue:
+    """Bounded queue of PDF renders backed by a process pool"""
+
+    def __init__(self, cache, workers=DEFAULT_WORKERS, max_pending=DEFAULT_MAX_PENDING_JOBS,
+                 max_per_user=DEFAULT_MAX_JOBS_PER_USER, max_batches=DEFAULT_MAX_BATCH_JOBS,
+                 ttl=DEFAULT_JOB_TTL, queued_timeout=DEFAULT_QUEUED_JOB_TIMEOUT):
+        self.cache = cache
+        self.jobs = JobStore(os.path.join(cache.directory, 'jobs'), ttl, queued_timeout)
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_per_user = max_per_user
+        self.max_batches = max_batches
+        self._executor = None
+        self._batch_runner = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=worker_context(),
+                initializer=load_renderers
+            )
+        return self._executor
+
+    def _new_job(self, kind, user_id, filename, **fields):
+        job = {
+            'job_id': uuid.uuid4().hex,
+            'kind': kind,
+            'user_id': user_id,
+            'filename': filename,
+            'cache_key': None,
+            'mimetype': 'application/pdf',
+            'status': QUEUED,
+            'cached': False,
+            'progress': None,
+            'created_at': time.time(),
+            'finished_at': None
+        }
+        job.update(fields)
+        return job
+
+    def _check_limits(self, active, user_id):
+        if len(active) >= self.max_pending:
+            raise JobLimitError('PDF queue is full, try again shortly', 503, retry_after=10)
+        if sum(1 for other in active if other['user_id'] == user_id) >= self.max_per_user:
+            raise JobLimitError('Too many PDF reports in progress', 429, retry_after=5)
+
+    def submit(self, kind, payload, user_id, filename):
+        """Queue a render and return its job record; raises JobLimitError when over capacity"""
+        if kind not in RENDERERS:
+            raise ValueError(f'Unknown report kind: {kind}')
+
+        cache_key = report_cache_key(kind, payload)
+        job = self._new_job(kind, user_id, filename, cache_key=cache_key)
+
+        if self.cache.get(cache_key) is not None:
+            job.update(status=DONE, cached=True, finished_at=job['created_at'])
+            self.jobs.save(job)
+            return job
+
+        with self._lock, self.jobs.locked():
+            self._check_limits(self.jobs.active(), user_id)
+            self.jobs.save(job)
+            render = partial(_render_job, self.jobs.directory, job['job_id'], kind, payload)
+            try:
+                try:
+                    future = self._get_executor().submit(render)
+                except BrokenProcessPool:
+                    # A worker died (e.g. killed for memory); start a new pool
+                    logger.warning('PDF worker pool was broken, restarting it')
+                    self._executor = None
+                    future = self._get_executor().submit(render)
+            except BaseException:
+                self.jobs.update(job['job_id'], status=FAILED, finished_at=time.time())
+                raise
+
+        future.add_done_callback(partial(self._finished, job['job_id'], cache_key))
+        return job
+
+    def _finished(self, job_id, cache_key, future):
+        status = FAILED
+        if future.cancelled():
+            logger.error(f"PDF job {job_id} was cancelled")
+        elif future.exception() is not None:
+            logger.error(f"PDF job {job_id} failed: {future.exception()}")
+        else:
+            try:
+                self.cache.put(cache_key, future.result())
+                status = DONE
+            except OSError as e:
+                logger.error(f"Could not store PDF of job {job_id}: {e}")
+        try:
+            self.jobs.update(job_id, status=status, finished_at=time.time())
+        except OSError as e:
+            logger.error(f"Could not record PDF job {job_id} as {status}: {e}")
+
+    def submit_batch(self, kind, user_id, filename, mimetype, build, total=None):
+        """
+        Queue a job that builds one file from many renders
+
+        build(output, executor, progress) runs on a background thread and
+        writes the file to the binary file object output, rendering in the
+        queue's process pool (executor) and calling progress(done, total,
+        failed) as it goes. It must set up its own app context. Returns the
+        job record; raises JobLimitError when over capacity.
+        """
+        job = self._new_job(kind, user_id, filename, mimetype=mimetype,
+                            progress={'done': 0, 'total': total, 'failed': 0})
+
+        with self._lock, self.jobs.locked():
+            active = self.jobs.active()
+            self._check_limits(active, user_id)
+            if sum(1 for other in active if other['progress'] is not None) >= self.max_batches:
+                raise JobLimitError('Another batch report is being generated, try again shortly', 503,
+                                    retry_after=30)
+
+            self.jobs.save(job)
+            if self._batch_runner is None:
+                self._batch_runner = ThreadPoolExecutor(max_workers=self.max_batches,
+                                                        thread_name_prefix='pdf-batch')
+            self._batch_runner.submit(self._run_batch, job['job_id'], build)
+        return job
+
+    def _run_batch(self, job_id, build):
+        self.jobs.update(job_id, status=RUNNING)
+        last_update = [0.0]
+
+        def progress(done, total, failed):
+            now = time.monotonic()
+            # Also keeps the record fresh so a long batch is not taken for a lost one
+            if now - last_update[0] >= PROGRESS_INTERVAL or done == total:
+                last_update[0] = now
+                self.jobs.update(job_id, progress={'done': done, 'total': total, 'failed': failed})
+
+        output_path = self.jobs.output_path(job_id)
+        fd, tmp_path = tempfile.mkstemp(dir=self.jobs.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as output:
+                with self._lock:
+                    executor = self._get_executor()
+                build(output, executor, progress)
+            os.replace(tmp_path, output_path)
+            self.jobs.update(job_id, status=DONE, finished_at=time.time())
+        except Exception as e:
+            logger.exception(f"Batch PDF job {job_id} failed: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if isinstance(e, BrokenProcessPool):
+                with self._lock:
+                    self._executor = None
+            self.jobs.update(job_id, status=FAILED, finished_at=time.time())
+
+    def get(self, job_id, user_id):
+        """The user's job record with this id, or None"""
+        job = self.jobs.load(job_id)
+        return job if job is not None and job['user_id'] == user_id else None
+
+    def shutdown(self):
+        if self._batch_runner is not None:
+            self._batch_runner.shutdown(wait=False, cancel_futures=True)
+            self._batch_runner = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def get_job_queue():
+    """The current app's PDF job queue, created on first use"""
+    app = current_app._get_current_object()
+    queue = app.extensions.get(_EXTENSION_KEY)
+    if queue is None:
+        with _create_lock:
+            queue = app.extensions.get(_EXTENSION_KEY)
+            if queue is None:
+                queue = PDFJobQueue(
+                    get_pdf_cache(app),
+                    workers=app.config.get('PDF_WORKERS', DEFAULT_WORKERS),
+                    max_pending=app.config.get('PDF_MAX_PENDING_JOBS', DEFAULT_MAX_PENDING_JOBS),
+                    max_per_user=app.config.get('PDF_MAX_JOBS_PER_USER', DEFAULT_MAX_JOBS_PER_USER),
+                    max_batches=app.config.get('PDF_MAX_BATCH_JOBS', DEFAULT_MAX_BATCH_JOBS),
+                    ttl=app.config.get('PDF_JOB_TTL', DEFAULT_JOB_TTL),
+                    queued_timeout=app.config.get('PDF_QUEUED_JOB_TIMEOUT', DEFAULT_QUEUED_JOB_TIMEOUT)
+                )
+                app.extensions[_EXTENSION_KEY] = queue
+    return queue
@@ -0,0 +1,200 @@
+"""
+PDF Report Templates
+Styles and static content shared by the PDF reports, built once per process
+
+Every report used to rebuild its stylesheet and re-parse and re-wrap the
+same disclosure, methodology and next-steps text on each render. Here the
+stylesheet is built on first use and shared, and static text becomes a
+PreflowedParagraph: its markup is parsed once, and the line breaks for a
+given frame width are computed once and reused by every later report, so
+a render only lays out its dynamic sections. Reports use the standard
+Type 1 fonts, whose metrics ReportLab already loads once per process, so
+there are no fonts to register.
+
+StreamingDocTemplate lays out flowables as a generator produces them, so a
+report whose sections are generators never holds more than a short
+look-ahead of flowables; each page is compressed as soon as it is drawn.
+"""
+import copy
+import threading
+from itertools import islice
+from functools import lru_cache
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import Paragraph, SimpleDocTemplate
+
+
+@lru_cache(maxsize=None)
+def report_styles():
+    """Stylesheet shared by all reports; styles must not be modified"""
+    styles = getSampleStyleSheet()
+
+    # Title style
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1e40af'),
+        spaceAfter=30,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    ))
+
+    # Subtitle style (valuation reports)
+    styles.add(ParagraphStyle(
+        name='SubTitle',
+        parent=styles['Heading2'],
+        fontSize=14,
+        textColor=colors.HexColor('#3b82f6'),
+        spaceAfter=12,
+        spaceBefore=12,
+        fontName='Helvetica-Bold'
+    ))
+
+    # Disclosure style
+    styles.add(ParagraphStyle(
+        name='Disclosure',
+        parent=styles['Normal'],
+        fontSize=9,
+        textColor=colors.HexColor('#6b7280'),
+        alignment=TA_JUSTIFY,
+        leading=12
+    ))
+
+    # Method description style
+    styles.add(ParagraphStyle(
+        name='MethodDesc',
+        parent=styles['Normal'],
+        fontSize=10,
+        leading=14,
+        spaceAfter=8
+    ))
+
+    # Assessment report headings and body
+    styles.add(ParagraphStyle(
+        name='CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#1e40af'),
+        spaceAfter=12,
+        spaceBefore=12,
+        fontName='Helvetica-Bold'
+    ))
+
+    styles.add(ParagraphStyle(
+        name='CustomSubHeading',
+        parent=styles['Heading3'],
+        fontSize=12,
+        textColor=colors.HexColor('#374151'),
+        spaceAfter=8,
+        fontName='Helvetica-Bold'
+    ))
+
+    styles.add(ParagraphStyle(
+        name='CustomNormal',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor=colors.HexColor('#374151'),
+        spaceAfter=6
+    ))
+
+    # Assessment appendix: one entry per question
+    styles.add(ParagraphStyle(
+        name='AppendixQuestion',
+        parent=styles['Normal'],
+        fontSize=10,
+        leading=13,
+        textColor=colors.HexColor('#1f2937'),
+        spaceBefore=8,
+        spaceAfter=2,
+        fontName='Helvetica-Bold'
+    ))
+
+    styles.add(ParagraphStyle(
+        name='AppendixDetail',
+        parent=styles['Normal'],
+        fontSize=9,
+        leading=12,
+        textColor=colors.HexColor('#374151'),
+        leftIndent=12,
+        spaceAfter=2
+    ))
+
+    return styles
+
+
+class PreflowedParagraph(Paragraph):
+    """Paragraph that remembers its line breaks per frame width"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._flows = {}  # available width -> (wrap widths, broken lines, height)
+        self._flows_lock = threading.Lock()
+
+    def wrap(self, availWidth, availHeight):
+        flowed = self._flows.get(availWidth)
+        if flowed is None:
+            width, height = super().wrap(availWidth, availHeight)
+            with self._flows_lock:
+                self._flows[availWidth] = (self._wrapWidths, self.blPara, height)
+            return width, height
+
+        self.width = availWidth
+        self._wrapWidths, self.blPara, self.height = flowed
+        return availWidth, self.height
+
+
+@lru_cache(maxsize=256)
+def _static_template(text, style_name):
+    return PreflowedParagraph(text, report_styles()[style_name])
+
+
+def static_paragraph(text, style_name):
+    """
+    Paragraph for text that is the same in every report
+
+    The markup is parsed and the lines are broken once per process; each
+    call returns a copy so documents built at the same time do not share
+    wrap state.
+    """
+    return copy.copy(_static_template(text, style_name))
+
+
+class StreamingDocTemplate(SimpleDocTemplate):
+    """
+    SimpleDocTemplate that pulls its flowables from an iterable
+
+    ReportLab lays out a list front to back; here the list is only a
+    look-ahead buffer, refilled from the iterable as flowables are drawn,
+    so flowables that are already on a page can be freed. The look-ahead
+    covers keepWithNext chains, which ReportLab resolves from the buffer.
+    """
+
+    LOOKAHEAD = 16
+    _pending_flowables = None
+    _buffer = None
+
+    def build_stream(self, flowables, **kwargs):
+        """Build the document from any iterable of flowables (takes build()'s keyword arguments)"""
+        self._pending_flowables = iter(flowables)
+        self._buffer = []
+        self._refill(self._buffer)
+        try:
+            self.build(self._buffer, **kwargs)
+        finally:
+            self._pending_flowables = self._buffer = None
+
+    def _refill(self, flowables):
+        # ReportLab also handles flowables from lists of its own; only top up ours
+        if flowables is not self._buffer:
+            return
+        missing = self.LOOKAHEAD - len(flowables)
+        if missing > 0:
+            flowables.extend(islice(self._pending_flowables, missing))
+
+    def handle_flowable(self, flowables):
+        self._refill(flowables)
+        super().handle_flowable(flowables)
+        # Refill before build() checks whether the buffer is empty
+        self._refill(flowables)
@@ -0,0 +1,326 @@
+"""
+Book of Business Reports
+Quarterly PDF packs for every client of an advisor, rendered in bulk
+
+A client pack is one PDF covering the client's business profile, latest
+valuation, wealth gap, attractiveness assessment and exit quiz result. An
+advisor's clients are the users who granted the advisor's account access
+to their reports (BusinessAdvisor.advisor_user_id / access_granted_at).
+
+Client ids are consumed as a stream and loaded in chunks with one set-based
+query per table (users, businesses, and the latest valuation, assessment,
+wealth gap and quiz version of every client in the chunk), so a batch costs
+six queries per chunk rather than several per client. Packs render across
+a process pool with a bounded number in flight and are written into a ZIP
+as they finish, which is streamed out chunk by chunk; memory stays bounded
+by the chunk size and the pool window, not the number of clients. Packs
+already in the PDF cache are reused, and every render is stored there.
+"""
+import json
+import logging
+import re
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date, datetime
+from itertools import islice
+from sqlalchemy import func
+from app.models import db, User, Business, BusinessAdvisor, Valuation, Assessment, WealthGap, ExitQuizResponse
+from app.services.exit_quiz_results import build_recommendations
+from app.services.pdf_cache import report_cache_key
+from app.services.pdf_jobs import load_renderers, render_report_bytes, worker_context
+
+logger = logging.getLogger(__name__)
+
+
+PACK_KIND = 'client-pack'
+
+DEFAULT_CHUNK_SIZE = 100
+DEFAULT_PACK_WORKERS = 4
+IN_FLIGHT_PER_WORKER = 2
+
+
+def current_period(today=None):
+    """Reporting quarter, e.g. '2026-Q4'"""
+    today = today or date.today()
+    return f"{today.year}-Q{(today.month - 1) // 3 + 1}"
+
+
+def advisor_client_ids(advisor_user_id):
+    """
+    Ids of the users who granted this advisor account access, in id order
+
+    Only engaged advisor slots whose client accepted the account's access
+    request count; the free-text advisor email is never enough.
+    """
+    rows = db.session.query(Business.user_id)\
+        .join(BusinessAdvisor, BusinessAdvisor.business_id == Business.id)\
+        .filter(BusinessAdvisor.advisor_user_id == advisor_user_id,
+                BusinessAdvisor.access_granted_at.isnot(None),
+                BusinessAdvisor.engaged.is_(True))\
+        .distinct()\
+        .order_by(Business.user_id)\
+        .all()
+    return [row.user_id for row in rows]
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _latest_by_user(model, user_ids, order_by, *criteria):
+    """The first row per user under order_by, as {user_id: row}, in one query"""
+    rank = func.row_number().over(partition_by=model.user_id, order_by=order_by).label('rank')
+    ranked = db.session.query(model.id.label('id'), rank)\
+        .filter(model.user_id.in_(user_ids), *criteria)\
+        .subquery()
+    rows = db.session.query(model)\
+        .join(ranked, model.id == ranked.c.id)\
+        .filter(ranked.c.rank == 1)\
+        .all()
+    return {row.user_id: row for row in rows}
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def _slug(text):
+    return re.sub(r'[^A-Za-z0-9]+', '_', text or '').strip('_')[:60] or 'client'
+
+
+def _build_pack(user, business, valuation, assessment, wealth_gap, quiz, period):
+    """Plain-dict pack for ClientPackPDFGenerator"""
+    client_name = ' '.join(filter(None, [business and business.client_first_name,
+                                         business and business.client_last_name]))
+    pack = {
+        'period': period,
+        'client': {'user_id': user.id, 'name': client_name or user.full_name, 'email': user.email},
+        'business': None,
+        'valuation': None,
+        'assessment': None,
+        'wealth_gap': None,
+        'exit_quiz': None
+    }
+
+    if business:
+        pack['business'] = {
+            'business_name': business.name,
+            'industry': business.industry,
+            'revenue': business.revenue,
+            'ebitda': business.ebitda,
+            'employees': business.employees,
+            'exit_horizon': business.exit_horizon,
+            'preferred_exit_type': business.preferred_exit_type
+        }
+
+    if valuation:
+        pack['valuation'] = {
+            'method': valuation.method,
+            'valuation_amount': valuation.valuation_amount,
+            'low_range': valuation.low_range,
+            'high_range': valuation.high_range,
+            'valuation_date': _isoformat(valuation.valuation_date)
+        }
+
+    if assessment:
+        pack['assessment'] = {
+            'overall_score': assessment.overall_score,
+            'answered_questions': assessment.answered_questions,
+            'updated_at': _isoformat(assessment.updated_at),
+            'category_scores': {
+                'financial_performance': assessment.financial_performance_score,
+                'revenue_quality': assessment.revenue_quality_score,
+                'customer_concentration': assessment.customer_concentration_score,
+                'management_team': assessment.management_team_score,
+                'competitive_position': assessment.competitive_position_score,
+                'growth_potential': assessment.growth_potential_score,
+                'intellectual_property': assessment.intellectual_property_score,
+                'legal_compliance': assessment.legal_compliance_score,
+                'owner_dependency': assessment.owner_dependency_score,
+                'strategic_positioning': assessment.strategic_positioning_score
+            }
+        }
+
+    if wealth_gap:
+        pack['wealth_gap'] = {
+            'wealth_goal': wealth_gap.calculate_wealth_goal(),
+            'current_net_worth': wealth_gap.current_net_worth,
+            'wealth_gap': wealth_gap.calculate_wealth_gap(),
+            'exit_value': wealth_gap.exit_value,
+            'exit_after_tax_proceeds': wealth_gap.exit_after_tax_proceeds,
+            'exit_coverage_ratio': wealth_gap.exit_coverage_ratio
+        }
+
+    if quiz:
+        all_scores = json.loads(quiz.all_scores) if quiz.all_scores else {}
+        pack['exit_quiz'] = {
+            'version': quiz.version,
+            'completed_at': _isoformat(quiz.created_at),
+            'recommendations': build_recommendations(
+                [quiz.top_recommendation, quiz.second_recommendation, quiz.third_recommendation],
+                all_scores
+            )
+        }
+
+    return pack
+
+
+def load_packs(user_ids, period):
+    """
+    Packs for one chunk of clients, in the order given
+
+    Returns:
+        List of (user_id, filename, pack); unknown ids are skipped
+    """
+    users = {user.id: user for user in User.query.filter(User.id.in_(user_ids)).all()}
+    businesses = _latest_by_user(Business, user_ids, Business.id.asc())
+    valuations = _latest_by_user(Valuation, user_ids, (Valuation.created_at.desc(), Valuation.id.desc()),
+                                 Valuation.is_archived.isnot(True))
+    assessments = _latest_by_user(Assessment, user_ids, (Assessment.created_at.desc(), Assessment.id.desc()))
+    wealth_gaps = _latest_by_user(WealthGap, user_ids, WealthGap.id.asc())
+    quizzes = _latest_by_user(ExitQuizResponse, user_ids, ExitQuizResponse.version.desc())
+
+    packs = []
+    for user_id in user_ids:
+        user = users.get(user_id)
+        if user is None:
+            continue
+        business = businesses.get(user_id)
+        pack = _build_pack(user, business, valuations.get(user_id), assessments.get(user_id),
+                           wealth_gaps.get(user_id), quizzes.get(user_id), period)
+        name = business.name if business else user.full_name
+        packs.append((user_id, f"{user_id}_{_slug(name)}_{period}.pdf", pack))
+    return packs
+
+
+def iter_packs(user_ids, chunk_size=DEFAULT_CHUNK_SIZE, period=None):
+    """Yield (user_id, filename, pack) for a stream of client ids, a chunk at a time"""
+    period = period or current_period()
+    for chunk in _chunks(user_ids, chunk_size):
+        yield from load_packs(chunk, period)
+
+
+def render_packs(packs, workers=DEFAULT_PACK_WORKERS, cache=None, pool=None):
+    """
+    Render packs across a process pool as they are consumed
+
+    pool is an existing executor with this many workers to render in (the
+    PDF job queue's); without one a pool is started and shut down here.
+    Yields (user_id, filename, pdf_bytes, error) in completion order; a
+    failed render yields pdf_bytes None and the error message.
+    """
+    own_pool = pool is None
+    if own_pool:
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=worker_context(),
+            initializer=load_renderers
+        )
+    window = workers * IN_FLIGHT_PER_WORKER
+    pending = {}
+
+    def finished(future):
+        user_id, filename, cache_key = pending.pop(future)
+        try:
+            data = future.result()
+        except Exception as e:
+            logger.error(f"Client pack for user {user_id} failed: {e}")
+            return user_id, filename, None, str(e)
+        if cache is not None:
+            try:
+                cache.put(cache_key, data)
+            except OSError as e:
+                logger.warning(f"Could not cache client pack: {e}")
+        return user_id, filename, data, None
+
+    try:
+        for user_id, filename, pack in packs:
+            payload = {'pack': pack}
+            cache_key = report_cache_key(PACK_KIND, payload)
+            cached = cache.read(cache_key) if cache is not None else None
+            if cached is not None:
+                yield user_id, filename, cached, None
+                continue
+
+            while len(pending) >= window:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield finished(future)
+            pending[pool.submit(render_report_bytes, PACK_KIND, payload)] = (user_id, filename, cache_key)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield finished(future)
+    finally:
+        # Also reached when the consumer stops early
+        for future in pending:
+            future.cancel()
+        if own_pool:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+class _ZipStream:
+    """Write-only sink for ZipFile that hands out what was written so far"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_packs_zip(packs, workers=DEFAULT_PACK_WORKERS, cache=None, total=None, progress=None, pool=None):
+    """
+    Render packs into a ZIP and yield it as byte chunks
+
+    progress, when given, is called as progress(done, total, failed) after
+    each pack. The archive ends with manifest.json listing the files and
+    any clients whose pack failed.
+    """
+    sink = _ZipStream()
+    done = 0
+    files, failed = [], []
+
+    # PDF pages are already compressed; storing them keeps the CPU on rendering
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for user_id, filename, data, error in render_packs(packs, workers, cache, pool):
+            done += 1
+            if data is None:
+                failed.append({'user_id': user_id, 'error': error})
+            else:
+                archive.writestr(filename, data)
+                files.append({'user_id': user_id, 'file': filename})
+            if progress is not None:
+                progress(done, total, len(failed))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+
+        archive.writestr('manifest.json', json.dumps({
+            'generated_at': datetime.utcnow().isoformat(),
+            'files': files,
+            'failed': failed
+        }, indent=2))
+    yield sink.drain()
+
+
+def write_packs_zip(packs, output, **kwargs):
+    """Write the ZIP from stream_packs_zip into a binary file object"""
+    for chunk in stream_packs_zip(packs, **kwargs):
+        output.write(chunk)
+    return output
@@ -0,0 +1,520 @@
+"""
+Full-Text Search
+Ranked search over a user's tasks, the system task catalog and question guidance
+
+Three interchangeable backends, chosen once at startup:
+    fts5:       SQLite FTS5 table kept current by triggers on the source tables
+    postgresql: generated tsvector columns with GIN indexes, added by
+                add_search_index.py
+    memory:     in-process inverted index kept current by ORM events, for
+                databases without full-text support
+
+All three index on write, so a search is a single indexed query.
+"""
+import logging
+import time
+from flask import current_app, has_app_context
+from sqlalchemy import bindparam, event, text
+from sqlalchemy.orm import Session
+from app.models import db
+from app.models.task import Task, TaskTemplate
+from app.models.assessment import AssessmentQuestion
+from app.services.search_index import InvertedIndex, make_snippet, query_terms
+from app.services.task_catalog import virtual_task_id
+
+logger = logging.getLogger(__name__)
+
+_EXTENSION_KEY = 'search'
+
+# Public result types -> indexed document types
+SEARCH_TYPES = {
+    'task': ('task', 'template'),
+    'question': ('question',)
+}
+
+# Rebuild the in-process index periodically so writes from other workers show up
+MEMORY_INDEX_TTL = 300  # seconds
+
+# Indexed text per document type, as SQL over a row alias
+SEARCH_SOURCES = {
+    'task': {
+        'table': 'tasks',
+        'code': 0,
+        'title': '{row}.title',
+        'body': "coalesce({row}.description, '') || ' ' || coalesce({row}.notes, '')",
+        'user_id': '{row}.user_id',
+        'question_id': '{row}.question_id',
+        'columns': 'title, description, notes'
+    },
+    'template': {
+        'table': 'task_templates',
+        'code': 1,
+        'title': '{row}.title',
+        'body': "coalesce({row}.description, '')",
+        'user_id': 'NULL',
+        'question_id': '{row}.question_id',
+        'columns': 'title, description'
+    },
+    'question': {
+        'table': 'assessment_questions',
+        'code': 2,
+        'title': '{row}.subject',
+        'body': "coalesce({row}.question_text, '') || ' ' || coalesce({row}.rule_of_thumb, '') "
+                "|| ' ' || coalesce({row}.considerations, '')",
+        'user_id': 'NULL',
+        'question_id': '{row}.question_id',
+        'columns': 'subject, question_text, rule_of_thumb, considerations'
+    }
+}
+_DOC_TYPE_CODES = len(SEARCH_SOURCES)
+
+
+# ---------------------------------------------------------------------------
+# Setup
+# ---------------------------------------------------------------------------
+
+def _fts5_available():
+    try:
+        db.session.execute(text("CREATE VIRTUAL TABLE IF NOT EXISTS temp.fts5_probe USING fts5(x)"))
+        db.session.execute(text("DROP TABLE temp.fts5_probe"))
+        return True
+    except Exception:
+        db.session.rollback()
+        return False
+
+
+def _fts5_row_values(doc_type, row):
+    source = SEARCH_SOURCES[doc_type]
+    return (
+        f"{row}.id * {_DOC_TYPE_CODES} + {source['code']}, "
+        f"{source['title'].format(row=row)}, {source['body'].format(row=row)}, "
+        f"'{doc_type}', {row}.id, {source['user_id'].format(row=row)}, {source['question_id'].format(row=row)}"
+    )
+
+
+_FTS5_COLUMNS = 'rowid, title, body, doc_type, doc_id, user_id, question_id'
+
+
+def _setup_fts5():
+    """Create the FTS5 table and the triggers that maintain it"""
+    db.session.execute(text("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+            title, body,
+            doc_type UNINDEXED, doc_id UNINDEXED, user_id UNINDEXED, question_id UNINDEXED,
+            tokenize = 'porter unicode61'
+        )
+    """))
+
+    for doc_type, source in SEARCH_SOURCES.items():
+        table = source['table']
+        rowid = f"old.id * {_DOC_TYPE_CODES} + {source['code']}"
+        db.session.execute(text(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_search_insert AFTER INSERT ON {table} BEGIN
+                INSERT INTO search_index ({_FTS5_COLUMNS}) VALUES ({_fts5_row_values(doc_type, 'new')});
+            END
+        """))
+        db.session.execute(text(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_search_update AFTER UPDATE OF {source['columns']} ON {table} BEGIN
+                DELETE FROM search_index WHERE rowid = {rowid};
+                INSERT INTO search_index ({_FTS5_COLUMNS}) VALUES ({_fts5_row_values(doc_type, 'new')});
+            END
+        """))
+        db.session.execute(text(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_search_delete AFTER DELETE ON {table} BEGIN
+                DELETE FROM search_index WHERE rowid = {rowid};
+            END
+        """))
+
+    if not db.session.execute(text("SELECT count(*) FROM search_index")).scalar():
+        _rebuild_fts5()
+
+
+def _rebuild_fts5():
+    db.session.execute(text("DELETE FROM search_index"))
+    for doc_type, source in SEARCH_SOURCES.items():
+        db.session.execute(text(
+            f"INSERT INTO search_index ({_FTS5_COLUMNS}) "
+            f"SELECT {_fts5_row_values(doc_type, source['table'])} FROM {source['table']}"
+        ))
+
+
+def search_vector_ddl(doc_type):
+    """
+    PostgreSQL DDL for one source table: the generated tsvector column and its GIN index
+
+    Run by add_search_index.py, never at startup: adding the column takes
+    an ACCESS EXCLUSIVE lock, and the index is built CONCURRENTLY.
+    """
+    source = SEARCH_SOURCES[doc_type]
+    table = source['table']
+    title = source['title'].format(row=table)
+    body = source['body'].format(row=table)
+    add_column = f"""
+        ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce({title}, '')), 'A') ||
+            setweight(to_tsvector('english', {body}), 'B')
+        ) STORED
+    """
+    create_index = f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_search ON {table} USING GIN (search_vector)"
+    return add_column, create_index
+
+
+def missing_search_vectors():
+    """Source tables that do not have the search_vector column yet (PostgreSQL)"""
+    tables = [source['table'] for source in SEARCH_SOURCES.values()]
+    present = {row[0] for row in db.session.execute(
+        text("""
+            SELECT table_name FROM information_schema.columns
+            WHERE table_schema = current_schema() AND column_name = 'search_vector'
+              AND table_name IN :tables
+        """).bindparams(bindparam('tables', expanding=True)),
+        {'tables': tables}
+    )}
+    return [table for table in tables if table not in present]
+
+
+def init_search(app):
+    """
+    Pick the search backend for this app and make sure its index exists
+
+    Must run inside an app context, after db.create_all(). On PostgreSQL
+    this only checks for the search columns; without them (before
+    add_search_index.py has run) the in-process index is used.
+    """
+    backend = app.config.get('SEARCH_BACKEND')
+    dialect = db.engine.dialect.name
+    if not backend:
+        if dialect == 'postgresql':
+            backend = 'postgresql'
+        elif dialect == 'sqlite' and _fts5_available():
+            backend = 'fts5'
+        else:
+            backend = 'memory'
+
+    try:
+        if backend == 'fts5':
+            _setup_fts5()
+        elif backend == 'postgresql':
+            # Only detect the columns: the DDL locks tables, so it is a migration
+            missing = missing_search_vectors()
+            if missing:
+                raise RuntimeError(f"no search_vector column on {', '.join(missing)}; run add_search_index.py")
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.warning(f"Full-text search setup failed, using in-process index: {e}")
+        backend = 'memory'
+
+    app.extensions[_EXTENSION_KEY] = {'backend': backend, 'index': None, 'loaded_at': 0.0}
+    if backend == 'memory':
+        _register_memory_listeners()
+    logger.info(f"Search backend: {backend}")
+    return backend
+
+
+def rebuild_search_index():
+    """Rebuild the index from the source tables (generated columns need no rebuild)"""
+    state = current_app.extensions[_EXTENSION_KEY]
+    if state['backend'] == 'fts5':
+        _rebuild_fts5()
+        db.session.commit()
+    elif state['backend'] == 'memory':
+        state['index'] = None
+    return state['backend']
+
+
+# ---------------------------------------------------------------------------
+# In-process fallback
+# ---------------------------------------------------------------------------
+
+def _task_document(task):
+    return ('task', task.id), {
+        'user_id': int(task.user_id),  # routes pass the JWT identity string
+        'question_id': task.question_id,
+        'title': task.title,
+        'body': f"{task.description or ''} {task.notes or ''}"
+    }
+
+
+def _template_document(template):
+    return ('template', template.id), {
+        'user_id': None,
+        'question_id': template.question_id,
+        'title': template.title,
+        'body': template.description or ''
+    }
+
+
+def _question_document(question):
+    return ('question', question.id), {
+        'user_id': None,
+        'question_id': question.question_id,
+        'title': question.subject,
+        'body': ' '.join(filter(None, [question.question_text, question.rule_of_thumb, question.considerations]))
+    }
+
+
+_DOCUMENT_BUILDERS = {
+    Task: _task_document,
+    TaskTemplate: _template_document,
+    AssessmentQuestion: _question_document
+}
+
+
+def _build_memory_index():
+    index = InvertedIndex()
+    documents = {}
+    for model, builder in _DOCUMENT_BUILDERS.items():
+        for row in model.query.all():
+            key, document = builder(row)
+            index.add(key, document['title'], document['body'])
+            documents[key] = document
+    return {'index': index, 'documents': documents}
+
+
+def _memory_state():
+    state = current_app.extensions[_EXTENSION_KEY]
+    if state['index'] is None or time.monotonic() - state['loaded_at'] > MEMORY_INDEX_TTL:
+        state['index'] = _build_memory_index()
+        state['loaded_at'] = time.monotonic()
+    return state['index']
+
+
+def _live_memory_state():
+    """The built in-process index for the current app, if any"""
+    if not has_app_context():
+        return None
+    state = current_app.extensions.get(_EXTENSION_KEY)
+    if not state or state['backend'] != 'memory':
+        return None
+    return state
+
+
+def _after_flush(session, flush_context):
+    if _live_memory_state() is None:
+        return
+    pending = session.info.setdefault('search_pending', [])
+    for obj in list(session.new) + list(session.dirty):
+        builder = _DOCUMENT_BUILDERS.get(type(obj))
+        if builder:
+            pending.append(('add',) + builder(obj))
+    for obj in session.deleted:
+        builder = _DOCUMENT_BUILDERS.get(type(obj))
+        if builder:
+            pending.append(('remove', builder(obj)[0], None))
+
+
+def _after_bulk_statement(orm_execute_state):
+    # Bulk INSERT/UPDATE/DELETE statements bypass the flush; rebuild after commit
+    if _live_memory_state() is None:
+        return
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and mapper.class_ in _DOCUMENT_BUILDERS:
+            orm_execute_state.session.info['search_stale'] = True
+
+
+def _after_commit(session):
+    pending = session.info.pop('search_pending', [])
+    stale = session.info.pop('search_stale', False)
+    state = _live_memory_state()
+    if state is None or state['index'] is None:
+        return
+    if stale:
+        state['index'] = None
+        return
+    for action, key, document in pending:
+        if action == 'add':
+            state['index']['index'].add(key, document['title'], document['body'])
+            state['index']['documents'][key] = document
+        else:
+            state['index']['index'].remove(key)
+            state['index']['documents'].pop(key, None)
+
+
+def _after_rollback(session):
+    session.info.pop('search_pending', None)
+    session.info.pop('search_stale', None)
+
+
+_listeners_registered = False
+
+
+def _register_memory_listeners():
+    global _listeners_registered
+    if _listeners_registered:
+        return
+    event.listen(Session, 'after_flush', _after_flush)
+    event.listen(Session, 'do_orm_execute', _after_bulk_statement)
+    event.listen(Session, 'after_commit', _after_commit)
+    event.listen(Session, 'after_soft_rollback', lambda session, previous_transaction: _after_rollback(session))
+    _listeners_registered = True
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+def _materialized_template_ids(user_id):
+    return {
+        template_id for (template_id,) in
+        db.session.query(Task.template_id).filter(Task.user_id == user_id, Task.template_id.isnot(None)).all()
+    }
+
+
+def _search_memory(user_id, terms, doc_types, limit, offset):
+    state = _memory_state()
+    documents = state['documents']
+    user_id = int(user_id)
+    materialized = _materialized_template_ids(user_id) if 'template' in doc_types else set()
+
+    def accept(key):
+        doc_type, doc_id = key
+        if doc_type not in doc_types:
+            return False
+        if doc_type == 'task':
+            return documents[key]['user_id'] == user_id
+        if doc_type == 'template':
+            return doc_id not in materialized
+        return True
+
+    ranked = state['index'].search(' '.join(terms), accept)
+    rows = []
+    for (doc_type, doc_id), score in ranked[offset:offset + limit]:
+        document = documents[(doc_type, doc_id)]
+        rows.append((doc_type, doc_id, document['question_id'], document['title'],
+                     make_snippet(document['body'], terms), score))
+    return rows, len(ranked)
+
+
+_FTS5_FILTER = """
+    FROM search_index
+    WHERE search_index MATCH :match
+      AND doc_type IN :doc_types
+      AND (
+            (doc_type = 'task' AND user_id = :user_id)
+         OR (doc_type = 'template' AND doc_id NOT IN (
+                SELECT template_id FROM tasks WHERE user_id = :user_id AND template_id IS NOT NULL))
+         OR doc_type = 'question'
+      )
+"""
+
+# FTS5 auxiliary functions cannot be mixed with window functions, so the
+# total comes from a separate count over the same match
+_FTS5_QUERY = text(f"""
+    SELECT doc_type, doc_id, question_id, title,
+           snippet(search_index, 1, '', '', '…', 20) AS snippet,
+           -bm25(search_index, 10.0, 1.0) AS score
+    {_FTS5_FILTER}
+    ORDER BY bm25(search_index, 10.0, 1.0), doc_type, doc_id
+    LIMIT :limit OFFSET :offset
+""").bindparams(bindparam('doc_types', expanding=True))
+
+_FTS5_COUNT = text(f"SELECT count(*) {_FTS5_FILTER}").bindparams(bindparam('doc_types', expanding=True))
+
+
+def _search_fts5(user_id, terms, doc_types, limit, offset):
+    params = {
+        'match': ' '.join(f'"{term}"*' for term in terms),
+        'doc_types': list(doc_types),
+        'user_id': int(user_id)
+    }
+    rows = db.session.execute(_FTS5_QUERY, dict(params, limit=limit, offset=offset)).all()
+    if offset == 0 and len(rows) < limit:
+        total = len(rows)
+    else:
+        total = db.session.execute(_FTS5_COUNT, params).scalar()
+    return [tuple(row) for row in rows], total
+
+
+_POSTGRESQL_QUERY = text("""
+    WITH search AS (SELECT to_tsquery('english', :tsquery) AS query),
+    documents AS (
+        SELECT 'task' AS doc_type, t.id AS doc_id, t.question_id, t.title,
+               coalesce(t.description, '') || ' ' || coalesce(t.notes, '') AS body,
+               ts_rank(t.search_vector, search.query) AS score
+        FROM tasks t, search
+        WHERE t.user_id = :user_id AND t.search_vector @@ search.query
+        UNION ALL
+        SELECT 'template', tt.id, tt.question_id, tt.title, coalesce(tt.description, ''),
+               ts_rank(tt.search_vector, search.query)
+        FROM task_templates tt, search
+        WHERE tt.search_vector @@ search.query
+          AND NOT EXISTS (SELECT 1 FROM tasks t WHERE t.user_id = :user_id AND t.template_id = tt.id)
+        UNION ALL
+        SELECT 'question', aq.id, aq.question_id, aq.subject,
+               concat_ws(' ', aq.question_text, aq.rule_of_thumb, aq.considerations),
+               ts_rank(aq.search_vector, search.query)
+        FROM assessment_questions aq, search
+        WHERE aq.search_vector @@ search.query
+    ),
+    page AS (
+        SELECT *, count(*) OVER () AS total
+        FROM documents
+        WHERE doc_type IN :doc_types
+        ORDER BY score DESC, doc_type, doc_id
+        LIMIT :limit OFFSET :offset
+    )
+    SELECT page.doc_type, page.doc_id, page.question_id, page.title,
+           ts_headline('english', page.body, search.query,
+                       'StartSel="", StopSel="", MaxWords=20, MinWords=8, MaxFragments=1') AS snippet,
+           page.score, page.total
+    FROM page, search
+    ORDER BY page.score DESC, page.doc_type, page.doc_id
+""").bindparams(bindparam('doc_types', expanding=True))
+
+
+def _search_postgresql(user_id, terms, doc_types, limit, offset):
+    rows = db.session.execute(_POSTGRESQL_QUERY, {
+        'tsquery': ' & '.join(f'{term}:*' for term in terms), 'doc_types': list(doc_types),
+        'user_id': int(user_id), 'limit': limit, 'offset': offset
+    }).all()
+    total = rows[0].total if rows else 0
+    return [tuple(row)[:6] for row in rows], total
+
+
+_BACKENDS = {
+    'fts5': _search_fts5,
+    'postgresql': _search_postgresql,
+    'memory': _search_memory
+}
+
+
+def search(user_id, query, types=None, page=1, per_page=20):
+    """
+    Ranked search for one user
+
+    Args:
+        user_id: searching user (only their own tasks are visible)
+        query: free text; every word must match as a prefix
+        types: iterable of SEARCH_TYPES keys (default: all)
+        page, per_page: 1-based paging
+
+    Returns:
+        Tuple of (results, total)
+    """
+    terms = query_terms(query)
+    if not terms:
+        return [], 0
+
+    doc_types = set()
+    for search_type in (types or SEARCH_TYPES):
+        doc_types.update(SEARCH_TYPES[search_type])
+
+    backend = current_app.extensions[_EXTENSION_KEY]['backend']
+    offset = (page - 1) * per_page
+    rows, total = _BACKENDS[backend](user_id, terms, doc_types, per_page, offset)
+
+    results = []
+    for doc_type, doc_id, question_id, title, snippet, score in rows:
+        results.append({
+            'type': 'question' if doc_type == 'question' else 'task',
+            # Catalog templates surface as the user's virtual task
+            'id': virtual_task_id(doc_id) if doc_type == 'template' else doc_id,
+            'question_id': question_id,
+            'title': title,
+            'snippet': snippet,
+            'score': round(float(score), 4)
+        })
+    return results, total
@@ -0,0 +1,157 @@
+"""
+Search Index
+Tokenizer and in-process BM25 inverted index used when the database has no
+full-text search support
+"""
+import math
+import re
+from bisect import bisect_left
+
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+# Most query terms honoured; keeps pathological queries cheap
+MAX_QUERY_TERMS = 8
+
+# BM25 parameters and the weight of a title match relative to the body
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 10.0
+
+
+def tokenize(text):
+    """Lower-cased word tokens"""
+    return TOKEN_PATTERN.findall((text or '').lower())
+
+
+def query_terms(query):
+    """Distinct search terms from user input, in order"""
+    terms = []
+    for token in tokenize(query):
+        if token not in terms:
+            terms.append(token)
+    return terms[:MAX_QUERY_TERMS]
+
+
+class InvertedIndex:
+    """
+    Prefix-matching BM25 index over documents with a title and a body
+
+    Every query term must match (as a word prefix) in the title or body.
+    """
+
+    def __init__(self):
+        self._postings = {}  # term -> {key: weighted term frequency}
+        self._lengths = {}   # key -> weighted document length
+        self._doc_terms = {}  # key -> terms it is posted under
+        self._terms = None   # sorted vocabulary, rebuilt lazily after writes
+        self._total_length = 0.0
+
+    def __len__(self):
+        return len(self._lengths)
+
+    def __contains__(self, key):
+        return key in self._lengths
+
+    def add(self, key, title, body):
+        """Index (or re-index) a document"""
+        self.remove(key)
+
+        frequencies = {}
+        for token in tokenize(title):
+            frequencies[token] = frequencies.get(token, 0.0) + TITLE_WEIGHT
+        for token in tokenize(body):
+            frequencies[token] = frequencies.get(token, 0.0) + 1.0
+
+        for term, frequency in frequencies.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._terms = None
+            postings[key] = frequency
+
+        length = sum(frequencies.values())
+        self._doc_terms[key] = list(frequencies)
+        self._lengths[key] = length
+        self._total_length += length
+
+    def remove(self, key):
+        """Drop a document if present"""
+        length = self._lengths.pop(key, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for term in self._doc_terms.pop(key):
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+                self._terms = None
+
+    def _expand(self, prefix):
+        """Vocabulary terms starting with prefix"""
+        if self._terms is None:
+            self._terms = sorted(self._postings)
+        start = bisect_left(self._terms, prefix)
+        end = start
+        while end < len(self._terms) and self._terms[end].startswith(prefix):
+            end += 1
+        return self._terms[start:end]
+
+    def search(self, query, accept=None):
+        """
+        Rank documents matching every query term
+
+        Args:
+            query: user search text
+            accept: optional predicate on keys (e.g. ownership)
+
+        Returns:
+            List of (key, score), best first
+        """
+        terms = query_terms(query)
+        if not terms or not self._lengths:
+            return []
+
+        n_docs = len(self._lengths)
+        average_length = self._total_length / n_docs
+        scores = None
+
+        for term in terms:
+            term_scores = {}
+            for expanded in self._expand(term):
+                postings = self._postings[expanded]
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, frequency in postings.items():
+                    if accept is not None and not accept(key):
+                        continue
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[key] / average_length)
+                    score = idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+                    term_scores[key] = max(term_scores.get(key, 0.0), score)
+
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {key: scores[key] + value for key, value in term_scores.items() if key in scores}
+            if not scores:
+                return []
+
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+def make_snippet(text, terms, words=20):
+    """Window of about `words` words around the first matching term"""
+    tokens = (text or '').split()
+    if not tokens:
+        return ''
+
+    start = 0
+    for position, token in enumerate(tokens):
+        if any(word.startswith(term) for word in tokenize(token) for term in terms):
+            start = max(position - words // 4, 0)
+            break
+
+    window = tokens[start:start + words]
+    prefix = '…' if start > 0 else ''
+    suffix = '…' if start + words < len(tokens) else ''
+    return prefix + ' '.join(window) + suffix
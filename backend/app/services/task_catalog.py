@@ -0,0 +1,153 @@
+"""
+Task Catalog
+Shared system task templates overlaid with each user's own task rows
+
+System tasks are no longer copied into the tasks table for every user. The
+catalog is loaded once per process and presented to each user as virtual
+tasks; a Task row is only written (copy-on-write) when the user edits one.
+Virtual tasks use the negated template id as their task id.
+"""
+import time
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from app.models import db
+from app.models.task import Task, TaskTemplate
+from app.models.assessment import AssessmentQuestion
+
+
+# Reload the catalog periodically so re-seeded templates show up without a restart
+CATALOG_TTL = 300  # seconds
+
+_EXTENSION_KEY = 'task_catalog'
+
+
+def _load_catalog():
+    """Load every active template with its question in one query"""
+    rows = db.session.query(TaskTemplate, AssessmentQuestion)\
+        .join(AssessmentQuestion, AssessmentQuestion.question_id == TaskTemplate.question_id)\
+        .filter(AssessmentQuestion.active == True)\
+        .order_by(AssessmentQuestion.order, TaskTemplate.question_id, TaskTemplate.position, TaskTemplate.id)\
+        .all()
+
+    templates = []
+    for template, question in rows:
+        templates.append({
+            'template_id': template.id,
+            'question_id': template.question_id,
+            'title': template.title,
+            'description': template.description,
+            'priority': template.priority or 'medium',
+            'created_at': template.created_at.isoformat() if template.created_at else None,
+            'question': question.to_summary_dict()
+        })
+
+    return {
+        'templates': templates,
+        'by_id': {template['template_id']: template for template in templates},
+        'loaded_at': time.monotonic()
+    }
+
+
+def get_task_catalog():
+    """The cached template catalog for this app"""
+    catalog = current_app.extensions.get(_EXTENSION_KEY)
+    if catalog is None or time.monotonic() - catalog['loaded_at'] > CATALOG_TTL:
+        catalog = _load_catalog()
+        current_app.extensions[_EXTENSION_KEY] = catalog
+    return catalog
+
+
+def clear_task_catalog():
+    """Drop the cached catalog (call after changing templates in-process)"""
+    current_app.extensions.pop(_EXTENSION_KEY, None)
+
+
+def virtual_task_id(template_id):
+    return -template_id
+
+
+def template_id_from_task_id(task_id):
+    """Template id for a virtual task id, or None for a stored task"""
+    return -task_id if task_id < 0 else None
+
+
+def virtual_task(template, user_id):
+    """Task payload for a template the user has not touched yet"""
+    return {
+        'id': virtual_task_id(template['template_id']),
+        'user_id': user_id,
+        'question_id': template['question_id'],
+        'title': template['title'],
+        'description': template['description'],
+        'status': 'not_started',
+        'priority': template['priority'],
+        'is_system_task': True,
+        'template_id': template['template_id'],
+        'start_date': None,
+        'due_date': None,
+        'completed_at': None,
+        'notes': None,
+        'created_at': template['created_at'],
+        'updated_at': None,
+        'question': template['question']
+    }
+
+
+def task_with_question(task):
+    task_dict = task.to_dict()
+    if task.question:
+        task_dict['question'] = task.question.to_summary_dict()
+    return task_dict
+
+
+def overlay_user_tasks(catalog, user_id, user_tasks):
+    """
+    Merge a user's stored tasks over the template catalog
+
+    Stored rows replace the template they were copied from; templates the
+    user never touched are returned as virtual tasks.
+    """
+    materialized = {task.template_id for task in user_tasks if task.template_id is not None}
+
+    tasks = [task_with_question(task) for task in user_tasks]
+    tasks.extend(
+        virtual_task(template, user_id)
+        for template in catalog['templates']
+        if template['template_id'] not in materialized
+    )
+    return tasks
+
+
+def materialize_template(user_id, template_id):
+    """
+    Get or create the user's Task row for a template
+
+    Returns None when the template does not exist. The caller commits.
+    """
+    task = Task.query.filter_by(user_id=user_id, template_id=template_id).first()
+    if task:
+        return task
+
+    template = db.session.get(TaskTemplate, template_id)
+    if not template:
+        return None
+
+    task = Task(
+        user_id=user_id,
+        question_id=template.question_id,
+        template_id=template.id,
+        title=template.title,
+        description=template.description,
+        priority=template.priority or 'medium',
+        status='not_started',
+        is_system_task=True
+    )
+
+    # A concurrent request may have copied the same template first
+    try:
+        with db.session.begin_nested():
+            db.session.add(task)
+    except IntegrityError:
+        task = Task.query.filter_by(user_id=user_id, template_id=template_id).first()
+
+    return task
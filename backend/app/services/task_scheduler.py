@@ -0,0 +1,158 @@
+"""
+Task Dependency Scheduler
+Critical path scheduling over a user's task dependency graph
+
+Dates are handled as day ordinals. Each node carries:
+    anchor:   earliest day the task may start on its own (its own start date)
+    duration: days between start and due date
+    finish:   fixed finish day for completed tasks (None otherwise)
+
+A task starts the day after its last prerequisite finishes. Forward and
+backward passes are O(V+E); an incremental run only revisits tasks
+downstream (earliest dates) or upstream (latest dates) of the changed ones.
+"""
+from collections import deque
+
+
+# Duration assumed for tasks without both a start and a due date
+DEFAULT_DURATION_DAYS = 7
+
+
+def reachable(starts, edges):
+    """Every node reachable from starts (inclusive) following edges"""
+    seen = set(starts)
+    stack = list(starts)
+    while stack:
+        for neighbour in edges.get(stack.pop(), ()):
+            if neighbour not in seen:
+                seen.add(neighbour)
+                stack.append(neighbour)
+    return seen
+
+
+def topological_order(ids, predecessors, successors):
+    """
+    Kahn's algorithm over the subgraph induced by ids
+    Raises ValueError if the subgraph contains a cycle
+    """
+    ids = set(ids)
+    indegree = {node: sum(1 for p in predecessors.get(node, ()) if p in ids) for node in ids}
+    queue = deque(sorted(node for node, degree in indegree.items() if degree == 0))
+
+    order = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for successor in successors.get(node, ()):
+            if successor in indegree:
+                indegree[successor] -= 1
+                if indegree[successor] == 0:
+                    queue.append(successor)
+
+    if len(order) != len(ids):
+        raise ValueError('Task dependencies contain a cycle')
+    return order
+
+
+def would_create_cycle(successors, task_id, depends_on_id):
+    """True if making task_id depend on depends_on_id would close a cycle"""
+    return depends_on_id in reachable([task_id], successors)
+
+
+def schedule_tasks(nodes, predecessors, successors, previous=None, changed=None):
+    """
+    Compute earliest/latest start and finish for every node
+
+    Args:
+        nodes: Dict of id -> {'anchor', 'duration', 'finish'}
+        predecessors, successors: Dict of id -> list of ids
+        previous: Dict of id -> {'es', 'ef', 'ls', 'lf'} from the last run;
+            None for a full schedule
+        changed: ids whose inputs or edges changed since the last run
+
+    Returns:
+        Tuple of (schedule, touched) where schedule maps every node to
+        {'es', 'ef', 'ls', 'lf'} and touched is the set of nodes whose
+        values differ from previous
+    """
+    previous = previous or {}
+    result = {node: dict(previous[node]) for node in nodes if node in previous}
+    changed = (set(changed) if changed is not None else set(nodes)) & set(nodes)
+    changed |= set(nodes) - set(result)  # new to the graph
+
+    # Forward pass over the changed tasks and their descendants
+    dirty = set(changed)
+    for node in topological_order(reachable(changed, successors), predecessors, successors):
+        if node not in dirty:
+            continue
+        spec = nodes[node]
+        if spec['finish'] is not None:
+            ef = spec['finish']
+            es = ef - spec['duration']
+        else:
+            es = max([spec['anchor']] + [result[p]['ef'] + 1 for p in predecessors.get(node, ())])
+            ef = es + spec['duration']
+
+        old = result.get(node)
+        result[node] = {'es': es, 'ef': ef,
+                        'ls': old['ls'] if old else None, 'lf': old['lf'] if old else None}
+        if old is None or old['ef'] != ef or node in changed:
+            dirty.update(successors.get(node, ()))
+
+    # Backward pass; a new project finish moves every sink, so it runs in full
+    finish = max((values['ef'] for values in result.values()), default=None)
+    old_finish = max((values['lf'] for values in previous.values() if values.get('lf') is not None),
+                     default=None)
+    if not previous or finish != old_finish:
+        backward_dirty = set(nodes)
+        backward_ids = set(nodes)
+    else:
+        moved = {node for node in result if node in previous and result[node]['ef'] != previous[node]['ef']}
+        backward_dirty = changed | moved
+        backward_ids = reachable(backward_dirty, predecessors)
+
+    for node in reversed(topological_order(backward_ids, predecessors, successors)):
+        if node not in backward_dirty:
+            continue
+        values = result[node]
+        if nodes[node]['finish'] is not None:
+            lf = values['ef']
+        else:
+            lf = min([result[s]['ls'] - 1 for s in successors.get(node, ())] or [finish])
+        ls = lf - nodes[node]['duration']
+
+        if values['ls'] != ls or node in changed:
+            backward_dirty.update(predecessors.get(node, ()))
+        values['ls'], values['lf'] = ls, lf
+
+    touched = {node for node, values in result.items() if previous.get(node) != values}
+    return result, touched
+
+
+def critical_path(schedule, predecessors, successors, completed=()):
+    """
+    Longest chain of zero-slack open tasks, in order
+
+    Follows edges between critical tasks where the successor starts the day
+    after its prerequisite finishes.
+    """
+    critical = {
+        node for node, values in schedule.items()
+        if node not in completed and values['ls'] - values['es'] <= 0
+    }
+    if not critical:
+        return []
+
+    best = {}  # node -> (length, previous node)
+    for node in topological_order(critical, predecessors, successors):
+        best[node] = (1, None)
+        for p in predecessors.get(node, ()):
+            if p in critical and schedule[node]['es'] == schedule[p]['ef'] + 1 and best[p][0] + 1 > best[node][0]:
+                best[node] = (best[p][0] + 1, p)
+
+    node = max(best, key=lambda n: (best[n][0], schedule[n]['ef'], -n))
+    path = []
+    while node is not None:
+        path.append(node)
+        node = best[node][1]
+    return list(reversed(path))
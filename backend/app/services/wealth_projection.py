@@ -0,0 +1,208 @@
+"""
+Wealth Projection Engine
+Monte Carlo projection of net worth through a business exit and retirement
+
+Plain numbers in, plain numbers out; nothing here touches the database.
+Every scenario is simulated at once as a scenarios x years matrix:
+
+    year 0 .. years_to_exit-1     net worth grows, plus annual contributions
+    year years_to_exit            after-tax sale proceeds are added
+    following years_of_income     inflation-adjusted withdrawals are taken
+
+Cash flows land at the start of each year and the balance then earns that
+year's return, so with G_t the cumulative growth factor to year t:
+
+    net_worth_t = G_t * (net_worth_0 + sum_{j<t} flow_j / G_j)
+
+which is a cumulative product and a cumulative sum along the year axis.
+"""
+import numpy as np
+
+
+DEFAULT_SCENARIOS = 1000
+MAX_SCENARIOS = 50000
+MAX_YEARS = 100
+
+# Fixed seed so repeated requests with the same inputs give the same answer
+DEFAULT_SEED = 20240101
+
+# Percentiles reported for each projected year
+PERCENTILES = (10, 50, 90)
+
+# Assumption defaults (percent)
+DEFAULTS = {
+    'annual_return_rate': 7.0,
+    'return_volatility': 12.0,
+    'annual_inflation_rate': 3.0,
+    'inflation_volatility': 1.0,
+    'exit_value_volatility': 25.0,
+    'exit_tax_rate': 20.0,
+    'transaction_cost_rate': 5.0,
+}
+
+
+def wealth_goal(method, wealth_goal_amount=0.0, monthly_cash_need=0.0, years_of_income=20,
+                annual_inflation_rate=3.0, annual_return_rate=7.0):
+    """
+    Wealth needed at exit, in today's dollars
+
+    single_number: the amount given
+    monthly_needs: present value of the monthly need over years_of_income,
+        discounted at the real (return minus inflation) monthly rate
+    """
+    if method == 'single_number':
+        return wealth_goal_amount
+    if method == 'monthly_needs':
+        # PV = PMT * [(1 - (1 + r)^-n) / r]
+        monthly_rate = (annual_return_rate - annual_inflation_rate) / 100 / 12
+        num_months = years_of_income * 12
+        if monthly_rate == 0:
+            return monthly_cash_need * num_months
+        return monthly_cash_need * ((1 - (1 + monthly_rate) ** -num_months) / monthly_rate)
+    return 0.0
+
+
+def after_tax_proceeds(exit_value, exit_tax_rate=None, transaction_cost_rate=None):
+    """
+    Sale proceeds after transaction costs and tax (zero cost basis)
+
+    Rates are percentages; works elementwise on numpy arrays.
+    """
+    tax_rate = (DEFAULTS['exit_tax_rate'] if exit_tax_rate is None else exit_tax_rate) / 100
+    cost_rate = (DEFAULTS['transaction_cost_rate'] if transaction_cost_rate is None else transaction_cost_rate) / 100
+    return exit_value * (1 - cost_rate) * (1 - tax_rate)
+
+
+def coverage_ratio(proceeds, wealth_gap):
+    """Share of the wealth gap the proceeds close; None when there is no gap"""
+    if wealth_gap is None or wealth_gap <= 0:
+        return None
+    return proceeds / wealth_gap
+
+
+def _percent(params, key):
+    value = params.get(key)
+    return float(DEFAULTS[key] if value is None else value) / 100
+
+
+def _as_number(params, key, default, cast=float):
+    value = params.get(key)
+    return cast(default if value is None or value == '' else value)
+
+
+def project_scenarios(params):
+    """
+    Project net worth under many return/inflation/exit value scenarios
+
+    Args:
+        params: dict with
+            wealth_goal_method, wealth_goal_amount, monthly_cash_need,
+            years_of_income, current_net_worth   (as on WealthGap)
+            exit_value, years_to_exit, annual_contribution
+            annual_return_rate, return_volatility,
+            annual_inflation_rate, inflation_volatility,
+            exit_value_volatility, exit_tax_rate, transaction_cost_rate  (percent)
+            n_scenarios, seed
+
+    Returns:
+        Dict of summary statistics and per-year percentile bands.
+        Raises ValueError on out-of-range inputs.
+    """
+    n_scenarios = _as_number(params, 'n_scenarios', DEFAULT_SCENARIOS, int)
+    years_to_exit = _as_number(params, 'years_to_exit', 0, int)
+    years_of_income = _as_number(params, 'years_of_income', 20, int)
+    if not 1 <= n_scenarios <= MAX_SCENARIOS:
+        raise ValueError(f'n_scenarios must be between 1 and {MAX_SCENARIOS}')
+    if years_to_exit < 0 or years_of_income < 0 or years_to_exit + years_of_income > MAX_YEARS:
+        raise ValueError(f'years_to_exit and years_of_income must be non-negative and total at most {MAX_YEARS}')
+
+    method = params.get('wealth_goal_method') or 'single_number'
+    monthly_cash_need = _as_number(params, 'monthly_cash_need', 0.0)
+    net_worth = _as_number(params, 'current_net_worth', 0.0)
+    exit_value = _as_number(params, 'exit_value', 0.0)
+    contribution = _as_number(params, 'annual_contribution', 0.0)
+
+    mean_return = _percent(params, 'annual_return_rate')
+    return_volatility = _percent(params, 'return_volatility')
+    mean_inflation = _percent(params, 'annual_inflation_rate')
+    inflation_volatility = _percent(params, 'inflation_volatility')
+    exit_volatility = _percent(params, 'exit_value_volatility')
+    tax_rate = _percent(params, 'exit_tax_rate')
+    cost_rate = _percent(params, 'transaction_cost_rate')
+    if min(return_volatility, inflation_volatility, exit_volatility) < 0:
+        raise ValueError('Volatilities must be non-negative')
+    if not (0 <= tax_rate <= 1 and 0 <= cost_rate <= 1):
+        raise ValueError('Tax and transaction cost rates must be between 0 and 100')
+
+    goal = wealth_goal(
+        method,
+        wealth_goal_amount=_as_number(params, 'wealth_goal_amount', 0.0),
+        monthly_cash_need=monthly_cash_need,
+        years_of_income=years_of_income,
+        annual_inflation_rate=mean_inflation * 100,
+        annual_return_rate=mean_return * 100
+    )
+
+    rng = np.random.default_rng(_as_number(params, 'seed', DEFAULT_SEED, int))
+    retire_years = years_of_income if monthly_cash_need > 0 else 0
+    n_years = years_to_exit + retire_years
+
+    # Draws: scenarios x years (returns floored so balances never flip sign)
+    returns = np.maximum(rng.normal(mean_return, return_volatility, (n_scenarios, n_years)), -0.99)
+    inflation = rng.normal(mean_inflation, inflation_volatility, (n_scenarios, n_years))
+    exit_values = exit_value * np.exp(rng.normal(-exit_volatility ** 2 / 2, exit_volatility, n_scenarios))
+
+    growth = np.ones((n_scenarios, n_years + 1))
+    np.cumprod(1 + returns, axis=1, out=growth[:, 1:])
+    prices = np.ones((n_scenarios, n_years + 1))
+    np.cumprod(1 + inflation, axis=1, out=prices[:, 1:])
+
+    proceeds = after_tax_proceeds(exit_values, tax_rate * 100, cost_rate * 100)
+
+    # Start-of-year cash flows, scenarios x (years + 1); the last column is the horizon
+    flows = np.zeros((n_scenarios, n_years + 1))
+    flows[:, :years_to_exit] = contribution
+    flows[:, years_to_exit] += proceeds
+    if retire_years:
+        flows[:, years_to_exit:n_years] -= monthly_cash_need * 12 * prices[:, years_to_exit:n_years]
+
+    # Balance right after each year's flow, in year-0 growth units
+    discounted = net_worth + np.cumsum(flows / growth, axis=1)
+    balance_after_flow = growth * discounted
+
+    # Net worth at the start of each year (before that year's flow)
+    path = np.empty((n_scenarios, n_years + 1))
+    path[:, 0] = net_worth
+    path[:, 1:] = balance_after_flow[:, :-1] * (1 + returns)
+
+    # Funds last if no withdrawal ever overdraws the balance
+    depleted = np.zeros((n_scenarios, n_years + 1), dtype=bool)
+    if retire_years:
+        overdrawn = np.zeros((n_scenarios, n_years + 1), dtype=bool)
+        overdrawn[:, years_to_exit:n_years] = discounted[:, years_to_exit:n_years] < 0
+        depleted = np.logical_or.accumulate(overdrawn, axis=1)
+        path[:, 1:] = np.where(depleted[:, :-1], 0.0, path[:, 1:])
+
+    # Wealth available at exit (after proceeds, before any withdrawal), in today's dollars
+    wealth_at_exit = (path[:, years_to_exit] + proceeds) / prices[:, years_to_exit]
+    shortfall = np.maximum(goal - wealth_at_exit, 0.0)
+
+    bands = np.percentile(path, PERCENTILES, axis=0)
+    proceeds_bands = np.percentile(proceeds, PERCENTILES)
+    exit_bands = np.percentile(wealth_at_exit, PERCENTILES)
+
+    return {
+        'n_scenarios': n_scenarios,
+        'wealth_goal': goal,
+        'wealth_gap': goal - net_worth,
+        'probability_of_closing_gap': float(np.mean(wealth_at_exit >= goal)),
+        'probability_funds_last': float(1 - np.mean(depleted[:, -1])) if retire_years else None,
+        'median_shortfall': float(np.median(shortfall)),
+        'after_tax_proceeds': {f'p{p}': float(v) for p, v in zip(PERCENTILES, proceeds_bands)},
+        'wealth_at_exit': {f'p{p}': float(v) for p, v in zip(PERCENTILES, exit_bands)},
+        'years': [
+            {'year': year, **{f'p{p}': float(bands[i, year]) for i, p in enumerate(PERCENTILES)}}
+            for year in range(n_years + 1)
+        ],
+        'exit_year': years_to_exit
+    }
@@ -6,6 +6,13 @@ from app.utils.validation import (
     validate_string_length,
     validate_choice
 )
+from app.utils.pagination import (
+    get_page_args,
+    apply_sort,
+    paginate,
+    sort_records,
+    paginate_list
+)
 
 __all__ = [
     'validate_positive_number',
@@ -13,5 +20,10 @@ __all__ = [
     'validate_required_fields',
     'validate_email',
     'validate_string_length',
-    'validate_choice'
+    'validate_choice',
+    'get_page_args',
+    'apply_sort',
+    'paginate',
+    'sort_records',
+    'paginate_list'
 ]
@@ -0,0 +1,113 @@
+"""
+Pagination and sorting helpers for list endpoints
+"""
+from flask import request
+
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 500
+
+
+def get_page_args():
+    """
+    Read page/per_page from the query string
+    Returns (page, per_page); page is None when the client did not ask for paging
+    Raises ValueError on invalid values
+    """
+    page = request.args.get('page')
+    per_page = request.args.get('per_page')
+
+    if page is None and per_page is None:
+        return None, None
+
+    try:
+        page = int(page) if page is not None else 1
+        per_page = int(per_page) if per_page is not None else DEFAULT_PER_PAGE
+    except (ValueError, TypeError):
+        raise ValueError('page and per_page must be integers')
+
+    if page < 1:
+        raise ValueError('page must be at least 1')
+    if per_page < 1 or per_page > MAX_PER_PAGE:
+        raise ValueError(f'per_page must be between 1 and {MAX_PER_PAGE}')
+
+    return page, per_page
+
+
+def _sort_args(sort_keys, default_sort, default_order):
+    sort = request.args.get('sort', default_sort)
+    order = request.args.get('order', default_order).lower()
+
+    if sort not in sort_keys:
+        raise ValueError(f'sort must be one of: {", ".join(sort_keys)}')
+    if order not in ('asc', 'desc'):
+        raise ValueError('order must be asc or desc')
+
+    return sort_keys[sort], order == 'desc'
+
+
+def apply_sort(query, sort_columns, tiebreaker, default_sort, default_order='desc'):
+    """
+    Order a query by the whitelisted ?sort= column and ?order= direction
+    NULLs always sort last; tiebreaker (usually the primary key) keeps pages stable
+    Raises ValueError on unknown columns or directions
+    """
+    column, descending = _sort_args(sort_columns, default_sort, default_order)
+
+    if descending:
+        return query.order_by(column.desc().nulls_last(), tiebreaker.desc())
+    return query.order_by(column.asc().nulls_last(), tiebreaker.asc())
+
+
+def paginate(query):
+    """
+    Run a query, paged when the client asked for it
+    Returns (items, pagination) where pagination is None for unpaged requests
+    """
+    page, per_page = get_page_args()
+
+    if page is None:
+        return query.all(), None
+
+    result = query.paginate(page=page, per_page=per_page, error_out=False)
+    return result.items, {
+        'page': result.page,
+        'per_page': result.per_page,
+        'total': result.total,
+        'pages': result.pages
+    }
+
+
+def sort_records(records, sort_keys, tiebreaker, default_sort, default_order='desc'):
+    """
+    In-memory counterpart of apply_sort for lists of dicts
+    sort_keys maps ?sort= names to key functions; same NULLs-last and tiebreaker rules
+    Raises ValueError on unknown columns or directions
+    """
+    key, descending = _sort_args(sort_keys, default_sort, default_order)
+
+    present = [record for record in records if key(record) is not None]
+    missing = [record for record in records if key(record) is None]
+
+    present.sort(key=lambda record: (key(record), record[tiebreaker]), reverse=descending)
+    missing.sort(key=lambda record: record[tiebreaker], reverse=descending)
+    return present + missing
+
+
+def paginate_list(records):
+    """
+    In-memory counterpart of paginate for already-filtered lists
+    Returns (items, pagination) where pagination is None for unpaged requests
+    """
+    page, per_page = get_page_args()
+
+    if page is None:
+        return records, None
+
+    total = len(records)
+    start = (page - 1) * per_page
+    return records[start:start + per_page], {
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'pages': (total + per_page - 1) // per_page
+    }
@@ -4,22 +4,77 @@ Generates professional PDF reports for gap analysis assessments
 """
 
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
 from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image
+from reportlab.platypus import Table, TableStyle, Paragraph, Spacer, PageBreak, KeepTogether
 from reportlab.pdfgen import canvas
 from reportlab.lib.colors import HexColor
 from datetime import datetime
 from io import BytesIO
+from itertools import groupby
+from xml.sax.saxutils import escape
+from app.services.assessment_scoring import CATEGORIES
+from app.services.pdf_templates import StreamingDocTemplate, report_styles, static_paragraph
+
+
+# Table styles are the same in every report, so they are built once
+METADATA_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('TEXTCOLOR', (0, 0), (-1, -1), HexColor('#374151')),
+    ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+    ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+])
+
+SCORE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), HexColor('#e5e7eb')),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (1, 1), (1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 12),
+    ('TEXTCOLOR', (0, 0), (-1, -1), HexColor('#374151')),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('GRID', (0, 0), (-1, -1), 1, HexColor('#d1d5db')),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, HexColor('#f9fafb')])
+])
+
+CATEGORY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), HexColor('#1e40af')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 1), (0, -1), 'Helvetica'),
+    ('FONTNAME', (1, 1), (-1, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 11),
+    ('FONTSIZE', (0, 1), (-1, -1), 10),
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('GRID', (0, 0), (-1, -1), 1, HexColor('#d1d5db')),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, HexColor('#f9fafb')])
+])
+
+GAP_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), HexColor('#1e40af')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('GRID', (0, 0), (-1, -1), 1, HexColor('#d1d5db')),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, HexColor('#f9fafb')])
+])
 
 
 class AssessmentPDFGenerator:
     """Generate PDF reports for assessments"""
 
     def __init__(self):
-        self.buffer = BytesIO()
         self.pagesize = letter
         self.width, self.height = self.pagesize
 
@@ -78,20 +133,51 @@ class AssessmentPDFGenerator:
         }
         return category_map.get(category_key, category_key)
 
-    def generate_report(self, assessment_data, user_info=None):
+    def generate_report(self, assessment_data, user_info=None, output=None):
         """
         Generate PDF report for assessment
 
         Args:
             assessment_data: Dictionary containing assessment information
             user_info: Optional dictionary with user information
+            output: Optional binary file object to write into
 
         Returns:
-            BytesIO buffer containing the PDF
+            The output (a new BytesIO by default) rewound to the start
         """
-        # Create document
-        doc = SimpleDocTemplate(
-            self.buffer,
+        output = output if output is not None else BytesIO()
+
+        # Sections are generators, laid out page by page as they are produced
+        self._create_document(output).build_stream(self._report_sections(assessment_data))
+
+        # Get PDF data
+        output.seek(0)
+        return output
+
+    def generate_appendix(self, appendix_data, output=None):
+        """
+        Generate one part of the question-by-question appendix
+
+        The appendix is split into parts of a fixed number of questions, so
+        each part costs the same however many questions and comments an
+        assessment has.
+
+        Args:
+            appendix_data: Dictionary with the part's 'responses', in category
+                order, and its position: 'part', 'parts', 'first', 'total'
+            output: Optional binary file object to write into
+
+        Returns:
+            The output (a new BytesIO by default) rewound to the start
+        """
+        output = output if output is not None else BytesIO()
+        self._create_document(output).build_stream(self._appendix_sections(appendix_data))
+        output.seek(0)
+        return output
+
+    def _create_document(self, output):
+        return StreamingDocTemplate(
+            output,
             pagesize=self.pagesize,
             rightMargin=0.75*inch,
             leftMargin=0.75*inch,
@@ -99,83 +185,41 @@ class AssessmentPDFGenerator:
             bottomMargin=0.75*inch
         )
 
-        # Container for elements
-        elements = []
-
-        # Define styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=HexColor('#1e40af'),
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=HexColor('#1e40af'),
-            spaceAfter=12,
-            spaceBefore=12,
-            fontName='Helvetica-Bold'
-        )
-
-        subheading_style = ParagraphStyle(
-            'CustomSubHeading',
-            parent=styles['Heading3'],
-            fontSize=12,
-            textColor=HexColor('#374151'),
-            spaceAfter=8,
-            fontName='Helvetica-Bold'
-        )
-
-        normal_style = ParagraphStyle(
-            'CustomNormal',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor=HexColor('#374151'),
-            spaceAfter=6
-        )
-
+    def _format_date(self, value):
+        """ISO date string as 'January 02, 2026'; 'N/A' if it cannot be parsed"""
+        if not value:
+            return ''
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).strftime('%B %d, %Y')
+        except:
+            return 'N/A'
+
+    def _report_sections(self, assessment_data):
+        yield from self._summary_section(assessment_data)
+        yield from self._category_section(assessment_data)
+        yield from self._gap_distribution_section(assessment_data)
+        yield from self._recommendations_section(assessment_data)
+        yield from self._next_steps_section()
+
+    def _summary_section(self, assessment_data):
         # Title
-        elements.append(Paragraph("Business Attractiveness Analysis Report", title_style))
-        elements.append(Spacer(1, 0.1*inch))
+        yield static_paragraph("Business Attractiveness Analysis Report", 'CustomTitle')
+        yield Spacer(1, 0.1*inch)
 
         # Report metadata
-        report_date = datetime.now().strftime('%B %d, %Y')
-        assessment_date = assessment_data.get('created_at', '')
-        if assessment_date:
-            try:
-                assessment_date = datetime.fromisoformat(assessment_date.replace('Z', '+00:00'))
-                assessment_date = assessment_date.strftime('%B %d, %Y')
-            except:
-                assessment_date = 'N/A'
-
         metadata_data = [
-            ['Report Generated:', report_date],
-            ['Assessment Date:', assessment_date],
+            ['Report Generated:', datetime.now().strftime('%B %d, %Y')],
+            ['Assessment Date:', self._format_date(assessment_data.get('created_at', ''))],
             ['Questions Answered:', f"{assessment_data.get('answered_questions', 0)}"]
         ]
 
         metadata_table = Table(metadata_data, colWidths=[2*inch, 3*inch])
-        metadata_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('TEXTCOLOR', (0, 0), (-1, -1), HexColor('#374151')),
-            ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
-        elements.append(metadata_table)
-        elements.append(Spacer(1, 0.3*inch))
+        metadata_table.setStyle(METADATA_TABLE_STYLE)
+        yield metadata_table
+        yield Spacer(1, 0.3*inch)
 
         # Overall Score Section
-        elements.append(Paragraph("Overall Business Attractiveness Score", heading_style))
+        yield static_paragraph("Overall Business Attractiveness Score", 'CustomHeading')
 
         overall_score = assessment_data.get('overall_score', 0)
         gap_info = self._get_gap_zone_info(overall_score)
@@ -187,47 +231,21 @@ class AssessmentPDFGenerator:
         ]
 
         score_table = Table(score_data, colWidths=[2.5*inch, 2.5*inch])
-        score_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#e5e7eb')),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 1), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 12),
-            ('TEXTCOLOR', (0, 0), (-1, -1), HexColor('#374151')),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('GRID', (0, 0), (-1, -1), 1, HexColor('#d1d5db')),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, HexColor('#f9fafb')])
-        ]))
-        elements.append(score_table)
-        elements.append(Spacer(1, 0.3*inch))
+        score_table.setStyle(SCORE_TABLE_STYLE)
+        yield score_table
+        yield Spacer(1, 0.3*inch)
 
         # Score interpretation
-        elements.append(Paragraph("Score Interpretation", subheading_style))
-        interpretation = self._get_score_interpretation(overall_score)
-        elements.append(Paragraph(interpretation, normal_style))
-        elements.append(Spacer(1, 0.3*inch))
+        yield static_paragraph("Score Interpretation", 'CustomSubHeading')
+        yield static_paragraph(self._get_score_interpretation(overall_score), 'CustomNormal')
+        yield Spacer(1, 0.3*inch)
 
-        # Category Breakdown
-        elements.append(Paragraph("Category Breakdown", heading_style))
+    def _category_section(self, assessment_data):
+        yield static_paragraph("Category Breakdown", 'CustomHeading')
 
         category_scores = assessment_data.get('category_scores', {})
-        category_order = [
-            'financial_performance',
-            'revenue_quality',
-            'customer_concentration',
-            'management_team',
-            'competitive_position',
-            'growth_potential',
-            'intellectual_property',
-            'legal_compliance',
-            'owner_dependency',
-            'strategic_positioning'
-        ]
-
         category_data = [['Category', 'Score', 'Assessment']]
-        for cat_key in category_order:
+        for cat_key in CATEGORIES:
             if cat_key in category_scores:
                 score = category_scores[cat_key]
                 gap_info = self._get_gap_zone_info(score)
@@ -238,31 +256,18 @@ class AssessmentPDFGenerator:
                 ])
 
         category_table = Table(category_data, colWidths=[2.5*inch, 1.25*inch, 2*inch])
-        category_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#1e40af')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (0, -1), 'Helvetica'),
-            ('FONTNAME', (1, 1), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('GRID', (0, 0), (-1, -1), 1, HexColor('#d1d5db')),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, HexColor('#f9fafb')])
-        ]))
-        elements.append(category_table)
-        elements.append(Spacer(1, 0.3*inch))
-
-        # Gap Distribution
-        elements.append(Paragraph("Gap Distribution Summary", heading_style))
+        category_table.setStyle(CATEGORY_TABLE_STYLE)
+        yield category_table
+        yield Spacer(1, 0.3*inch)
+
+    def _gap_distribution_section(self, assessment_data):
+        yield static_paragraph("Gap Distribution Summary", 'CustomHeading')
 
         responses = assessment_data.get('responses', [])
         gap_distribution = self._calculate_gap_distribution(responses)
 
         gap_data = [['Gap Level', 'Count', 'Percentage']]
-        total_responses = len([r for r in responses if r.get('answer_value', 0) != 0])
+        total_responses = sum(1 for r in responses if r.get('answer_value', 0) != 0)
 
         for gap_level in ['No Gaps', 'Minor Gaps', 'Considerable Gaps', 'Critical Gaps', 'Very Critical Gaps', 'Extremely Critical']:
             count = gap_distribution.get(gap_level, 0)
@@ -270,33 +275,22 @@ class AssessmentPDFGenerator:
             gap_data.append([gap_level, str(count), f"{round(percentage)}%"])
 
         gap_table = Table(gap_data, colWidths=[2.5*inch, 1.5*inch, 1.5*inch])
-        gap_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), HexColor('#1e40af')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('GRID', (0, 0), (-1, -1), 1, HexColor('#d1d5db')),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, HexColor('#f9fafb')])
-        ]))
-        elements.append(gap_table)
-        elements.append(Spacer(1, 0.3*inch))
-
-        # Recommendations
-        elements.append(PageBreak())
-        elements.append(Paragraph("Recommendations for Improvement", heading_style))
-
-        recommendations = self._generate_recommendations(category_scores)
-        for rec in recommendations:
-            elements.append(Paragraph(f"• {rec}", normal_style))
-
-        elements.append(Spacer(1, 0.3*inch))
-
-        # Next Steps
-        elements.append(Paragraph("Next Steps", heading_style))
+        gap_table.setStyle(GAP_TABLE_STYLE)
+        yield gap_table
+        yield Spacer(1, 0.3*inch)
+
+    def _recommendations_section(self, assessment_data):
+        yield PageBreak()
+        yield static_paragraph("Recommendations for Improvement", 'CustomHeading')
+
+        normal_style = report_styles()['CustomNormal']
+        for rec in self._generate_recommendations(assessment_data.get('category_scores', {})):
+            yield Paragraph(f"• {rec}", normal_style)
+
+        yield Spacer(1, 0.3*inch)
+
+    def _next_steps_section(self):
+        yield static_paragraph("Next Steps", 'CustomHeading')
         next_steps = [
             "Review areas with the lowest scores and identify specific improvement opportunities",
             "Prioritize actions that will have the greatest impact on your overall attractiveness score",
@@ -305,14 +299,58 @@ class AssessmentPDFGenerator:
             "Consider consulting with advisors for specific areas requiring expertise"
         ]
         for step in next_steps:
-            elements.append(Paragraph(f"• {step}", normal_style))
+            yield static_paragraph(f"• {step}", 'CustomNormal')
+
+    def _appendix_sections(self, appendix_data):
+        responses = appendix_data.get('responses', [])
+        first = appendix_data.get('first', 1)
+        last = first + len(responses) - 1
+
+        yield static_paragraph("Question Responses", 'CustomTitle')
+        yield Paragraph(
+            f"Assessment of {self._format_date(appendix_data.get('created_at', ''))} - "
+            f"questions {first}-{last} of {appendix_data.get('total', len(responses))} "
+            f"(part {appendix_data.get('part', 1)} of {appendix_data.get('parts', 1)})",
+            report_styles()['CustomNormal']
+        )
+        yield Spacer(1, 0.2*inch)
 
-        # Build PDF
-        doc.build(elements)
+        # Responses arrive in category order; each category is its own section
+        for category, category_responses in groupby(responses, key=lambda r: r.get('category')):
+            yield from self._appendix_category_section(category, category_responses)
 
-        # Get PDF data
-        self.buffer.seek(0)
-        return self.buffer
+    def _appendix_category_section(self, category, responses):
+        heading = static_paragraph(escape(self._get_category_display_name(category) or 'Other'), 'CustomHeading')
+        heading.keepWithNext = True
+        yield heading
+
+        for response in responses:
+            yield self._question_entry(response)
+
+    def _question_entry(self, response):
+        """One question with its answer, comments and considerations, kept on one page where it fits"""
+        styles = report_styles()
+        detail_style = styles['AppendixDetail']
+
+        question = escape(response.get('question_text') or '')
+        subject = escape(response.get('subject') or '')
+        entry = [Paragraph(f"{subject}: {question}" if subject else question, styles['AppendixQuestion'])]
+
+        answer_value = response.get('answer_value')
+        if answer_value:
+            score = response.get('score') or 0
+            answer_text = escape(response.get('answer_text') or str(answer_value))
+            answer = f"{answer_text} - {round(score)}% ({self._get_gap_zone_info(score)['label']})"
+        else:
+            answer = 'Not applicable' if answer_value == 0 else 'Not answered'
+        entry.append(Paragraph(f"<b>Answer:</b> {answer}", detail_style))
+
+        for label, key in (('Comments', 'comments'), ('Considerations', 'considerations')):
+            text = response.get(key)
+            if text:
+                entry.append(Paragraph(f"<b>{label}:</b> {escape(text).replace(chr(10), '<br/>')}", detail_style))
+
+        return KeepTogether(entry)
 
     def _get_score_interpretation(self, score):
         """Get interpretation text based on overall score"""
@@ -0,0 +1,119 @@
+"""
+Render benchmark for the PDF reports
+
+Renders each report kind from a sample payload in this process (no pool,
+no cache) and reports the median time per report and per page. The first
+render of each kind is a warm-up and is not counted, so the numbers are
+what a worker that has already rendered a report pays.
+
+Usage:
+    python benchmark_pdf_render.py [--runs 20] [--kinds assessment,client-pack]
+"""
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.pdf_jobs import RENDERERS, render_report_bytes
+
+BUSINESS_PROFILE = {
+    'business_name': 'Benchmark Manufacturing LLC',
+    'industry': 'Manufacturing',
+    'revenue': 5_000_000,
+    'ebitda': 800_000
+}
+
+SAMPLE_PAYLOADS = {
+    'advanced-valuation': {
+        'valuation_data': {
+            'weighted_average': 1_500_000,
+            'methods': {
+                'sde_multiple': {'value': 1_200_000},
+                'dcf': {'value': 1_800_000},
+                'ebitda_multiple': {'value': 1_500_000},
+                'asset_based': {'value': 900_000}
+            },
+            'weights': {'sde_multiple': 0.25, 'dcf': 0.25, 'ebitda_multiple': 0.25, 'asset_based': 0.25}
+        },
+        'business_profile': BUSINESS_PROFILE,
+        'vector_charts': True
+    },
+    'basic-valuation': {
+        'valuation_data': {'estimated_value': 1_500_000, 'low_range': 1_200_000, 'high_range': 1_800_000},
+        'business_profile': BUSINESS_PROFILE,
+        'vector_charts': True
+    },
+    'assessment': {
+        'assessment_data': {
+            'overall_score': 62,
+            'answered_questions': 100,
+            'created_at': '2026-01-02T00:00:00',
+            'category_scores': {
+                'financial_performance': 55,
+                'revenue_quality': 70,
+                'customer_concentration': 40,
+                'management_team': 80,
+                'owner_dependency': 35
+            },
+            'responses': [{'answer_value': 3, 'score': score} for score in range(0, 100, 3)]
+        }
+    },
+    'client-pack': {
+        'pack': {
+            'period': '2026-Q4',
+            'client': {'user_id': 1, 'name': 'Jordan Smith', 'email': 'jordan@example.com'},
+            'business': {**BUSINESS_PROFILE, 'employees': 42, 'exit_horizon': '3-5 years',
+                         'preferred_exit_type': 'strategic_sale'},
+            'valuation': {'method': 'dcf', 'valuation_amount': 1_500_000, 'low_range': 1_200_000,
+                          'high_range': 1_800_000, 'valuation_date': '2026-09-30T00:00:00'},
+            'assessment': {'overall_score': 62, 'answered_questions': 100,
+                           'updated_at': '2026-09-30T00:00:00',
+                           'category_scores': {'financial_performance': 55, 'management_team': 80}},
+            'wealth_gap': {'wealth_goal': 4_000_000, 'current_net_worth': 1_000_000, 'wealth_gap': 3_000_000,
+                           'exit_value': 1_500_000, 'exit_after_tax_proceeds': 1_150_000,
+                           'exit_coverage_ratio': 0.38},
+            'exit_quiz': {'version': 1, 'completed_at': '2026-09-30T00:00:00',
+                          'recommendations': [{'rank': 1, 'name': 'Strategic Sale', 'score': 42}]}
+        }
+    }
+}
+
+PAGE_PATTERN = re.compile(rb'/Type /Page[^s]')
+
+
+def benchmark(kind, runs):
+    payload = SAMPLE_PAYLOADS[kind]
+    pages = len(PAGE_PATTERN.findall(render_report_bytes(kind, payload)))
+
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        render_report_bytes(kind, payload)
+        samples.append(time.perf_counter() - started)
+
+    ms = statistics.median(samples) * 1000
+    return {'ms': ms, 'pages': pages, 'ms_per_page': ms / pages if pages else None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure PDF render time per report and per page')
+    parser.add_argument('--runs', type=int, default=20,
+                        help='Timed renders per report kind, after one warm-up render')
+    parser.add_argument('--kinds', default=','.join(SAMPLE_PAYLOADS),
+                        help='Comma-separated report kinds')
+    args = parser.parse_args()
+
+    for kind in args.kinds.split(','):
+        if kind not in RENDERERS or kind not in SAMPLE_PAYLOADS:
+            parser.error(f"Unknown report kind: {kind}")
+        stats = benchmark(kind, args.runs)
+        print(f"{kind:20} {stats['ms']:7.1f} ms/report  {stats['pages']:3d} pages  "
+              f"{stats['ms_per_page']:6.1f} ms/page")
+
+
+if __name__ == '__main__':
+    main()
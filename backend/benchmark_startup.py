@@ -0,0 +1,104 @@
+"""
+Startup benchmark for the web app
+
+Measures the cold start of a web worker - importing the app and running
+create_app() in a fresh interpreter - and its resident memory, with the PDF
+stack (ReportLab, matplotlib) loaded lazily as it is now and loaded eagerly
+as it was when routes/pdf.py imported the report generator at module load.
+Each scenario runs in its own subprocess so nothing is already imported.
+
+Usage:
+    python benchmark_startup.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+HEAVY_MODULES = ('numpy', 'reportlab', 'matplotlib')
+
+# Runs in the child interpreter; EAGER is substituted per scenario
+PROBE = """
+import json, logging, resource, sys, time
+logging.disable(logging.CRITICAL)
+started = time.perf_counter()
+from app import create_app
+create_app()
+if EAGER:
+    import matplotlib.pyplot
+    import app.services.pdf_generator
+    import app.utils.pdf_generator
+elapsed = time.perf_counter() - started
+
+rss_kb = None
+try:
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                rss_kb = int(line.split()[1])
+except OSError:
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        rss_kb //= 1024
+
+print(json.dumps({
+    'seconds': elapsed,
+    'rss_mb': rss_kb / 1024,
+    'loaded': [name for name in HEAVY_MODULES if name in sys.modules]
+}))
+"""
+
+SCENARIOS = (
+    ('eager PDF imports (before)', True),
+    ('lazy PDF imports (now)', False),
+)
+
+
+def probe(eager):
+    """Start a fresh interpreter, create the app and return its measurements"""
+    code = f"HEAVY_MODULES = {HEAVY_MODULES!r}\nEAGER = {eager!r}\n{PROBE}"
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(runs):
+    results = {}
+    for label, eager in SCENARIOS:
+        samples = [probe(eager) for _ in range(runs)]
+        results[label] = {
+            'seconds': statistics.median(sample['seconds'] for sample in samples),
+            'rss_mb': statistics.median(sample['rss_mb'] for sample in samples),
+            'loaded': samples[-1]['loaded']
+        }
+
+        stats = results[label]
+        print(f"{label:28} {stats['seconds'] * 1000:7.0f} ms  {stats['rss_mb']:6.1f} MB RSS  "
+              f"loaded: {', '.join(stats['loaded']) or '-'}")
+
+    before, now = (results[label] for label, _ in SCENARIOS)
+    print(f"Saved per worker: {(before['seconds'] - now['seconds']) * 1000:.0f} ms, "
+          f"{before['rss_mb'] - now['rss_mb']:.1f} MB (median of {runs} runs)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure web worker cold start time and memory')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Fresh interpreters started per scenario')
+    args = parser.parse_args()
+
+    run_benchmark(args.runs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Generate a book of business: one client pack PDF per client, in a ZIP
+
+Clients are the users who granted an advisor account access to their
+reports (--advisor-id, the advisor's user id), an explicit list
+(--user-ids), or ids read one per line from stdin. Ids are streamed in
+chunks and packs render across a process pool (see
+app/services/report_packs.py).
+
+Usage:
+    python generate_report_packs.py --advisor-id 42 [--output packs.zip]
+    python generate_report_packs.py --user-ids 12,15,31
+    cut -f1 clients.tsv | python generate_report_packs.py --workers 8
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
+from app.services.pdf_cache import get_pdf_cache
+from app.services.report_packs import (
+    DEFAULT_CHUNK_SIZE, DEFAULT_PACK_WORKERS, advisor_client_ids, current_period, iter_packs, write_packs_zip
+)
+
+
+def read_ids(lines):
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield int(line)
+
+
+def generate(client_ids, output, workers=DEFAULT_PACK_WORKERS, chunk_size=DEFAULT_CHUNK_SIZE, total=None):
+    started = time.perf_counter()
+    last_report = [0.0]
+
+    def progress(done, total, failed):
+        now = time.perf_counter() - started
+        if now - last_report[0] >= 1 or done == total:
+            last_report[0] = now
+            of_total = f"/{total}" if total else ''
+            print(f"  {done}{of_total} packs, {failed} failed - {done / now if now else 0:.1f} packs/s")
+
+    with open(output, 'wb') as f:
+        write_packs_zip(
+            iter_packs(client_ids, chunk_size=chunk_size),
+            f,
+            workers=workers,
+            cache=get_pdf_cache(),
+            total=total,
+            progress=progress
+        )
+
+    print(f"Wrote {output} in {time.perf_counter() - started:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render client packs for many clients into a ZIP')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--advisor-id', type=int, help='Every client that granted this advisor user access')
+    source.add_argument('--user-ids', help='Comma-separated client user ids')
+    parser.add_argument('--output', help='ZIP file to write (default: book_of_business_<quarter>.zip)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_PACK_WORKERS,
+                        help='Render processes')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='Clients loaded per batch of queries')
+    args = parser.parse_args()
+
+    app = create_app()
+
+    with app.app_context():
+        total = None
+        if args.advisor_id:
+            client_ids = advisor_client_ids(args.advisor_id)
+            total = len(client_ids)
+        elif args.user_ids:
+            client_ids = [int(user_id) for user_id in args.user_ids.split(',') if user_id.strip()]
+            total = len(client_ids)
+        else:
+            client_ids = read_ids(sys.stdin)
+
+        output = args.output or f"book_of_business_{current_period()}.zip"
+        generate(client_ids, output, workers=args.workers, chunk_size=args.chunk_size, total=total)
+
+
+if __name__ == '__main__':
+    main()
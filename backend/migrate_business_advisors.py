@@ -0,0 +1,129 @@
+"""
+Move the advisory team out of the businesses table
+
+create_app() creates business_advisors; this copies each business's
+has_<role>/<role>_name/_email/_phone columns and custom_advisors JSON into
+advisor rows, then drops the old columns so the businesses row only holds
+the core profile. Businesses that already have advisor rows are skipped,
+so it is safe to run more than once.
+
+The columns are only dropped once the copy has committed and the number of
+inserted rows matches what was read. Any other failure - including
+custom_advisors data that cannot be read - leaves the columns in place and
+exits non-zero.
+"""
+import json
+import sys
+from app import create_app, db
+from sqlalchemy import inspect, text
+from app.models.business import ADVISOR_ROLES, CUSTOM_ADVISOR_ROLE, BusinessAdvisor
+
+LEGACY_COLUMNS = ['custom_advisors'] + [
+    f'{prefix}{role}{suffix}' for role in ADVISOR_ROLES
+    for prefix, suffix in (('has_', ''), ('', '_name'), ('', '_email'), ('', '_phone'))
+]
+
+
+def custom_advisor_items(business_id, raw):
+    """
+    custom_advisors JSON as a list of advisor dicts
+
+    Accepts a list of objects or of plain names, or a single object;
+    raises ValueError for anything else so its data is not dropped unread.
+    """
+    try:
+        custom = json.loads(raw) if raw else []
+    except ValueError as e:
+        raise ValueError(f"business {business_id}: custom_advisors is not valid JSON ({e})")
+
+    if isinstance(custom, dict):
+        custom = [custom]
+    if not isinstance(custom, list):
+        raise ValueError(f"business {business_id}: custom_advisors is a {type(custom).__name__}, expected a list")
+
+    items = []
+    for item in custom:
+        if isinstance(item, str):
+            item = {'name': item}
+        elif not isinstance(item, dict):
+            raise ValueError(f"business {business_id}: unexpected custom advisor {item!r}")
+        items.append(item)
+    return items
+
+
+def copy_advisors(columns):
+    """Copy advisors from the given legacy columns; returns (advisors, businesses) copied"""
+    rows = db.session.execute(text(f"""
+        SELECT b.id, {', '.join('b.' + column for column in columns)}
+        FROM businesses b
+        WHERE NOT EXISTS (SELECT 1 FROM business_advisors a WHERE a.business_id = b.id)
+    """)).mappings().all()
+
+    advisors = []
+    for row in rows:
+        for role in ADVISOR_ROLES:
+            advisor = {
+                'business_id': row['id'],
+                'role': role,
+                'position': 0,
+                'title': None,
+                'engaged': bool(row.get(f'has_{role}')),
+                'name': row.get(f'{role}_name') or None,
+                'email': row.get(f'{role}_email') or None,
+                'phone': row.get(f'{role}_phone') or None
+            }
+            if advisor['engaged'] or advisor['name'] or advisor['email'] or advisor['phone']:
+                advisors.append(advisor)
+
+        for position, item in enumerate(custom_advisor_items(row['id'], row.get('custom_advisors'))):
+            advisors.append({
+                'business_id': row['id'],
+                'role': CUSTOM_ADVISOR_ROLE,
+                'position': position,
+                'title': item.get('title'),
+                'engaged': True,
+                'name': item.get('name'),
+                'email': item.get('email'),
+                'phone': item.get('phone')
+            })
+
+    count_advisors = text("SELECT count(*) FROM business_advisors")
+    before = db.session.execute(count_advisors).scalar()
+    if advisors:
+        db.session.execute(BusinessAdvisor.__table__.insert(), advisors)
+    inserted = db.session.execute(count_advisors).scalar() - before
+    if inserted != len(advisors):
+        raise RuntimeError(f"inserted {inserted} advisor rows, expected {len(advisors)}")
+
+    db.session.commit()
+    return len(advisors), len(rows)
+
+
+app = create_app()
+
+with app.app_context():
+    existing = {column['name'] for column in inspect(db.engine).get_columns('businesses')}
+    columns = [column for column in LEGACY_COLUMNS if column in existing]
+    if not columns:
+        print("Already migrated: businesses has no advisor columns")
+        sys.exit(0)
+
+    try:
+        advisor_count, business_count = copy_advisors(columns)
+        print(f"OK Moved {advisor_count} advisors from {business_count} businesses")
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error copying advisors, no columns dropped: {e}")
+        sys.exit(1)
+
+    for column in columns:
+        try:
+            with db.engine.connect() as conn:
+                conn.execute(text(f"ALTER TABLE businesses DROP COLUMN {column}"))
+                conn.commit()
+                print(f"OK Dropped {column} column from businesses table")
+
+        except Exception as e:
+            print(f"Error dropping {column}: {e}")
+            sys.exit(1)
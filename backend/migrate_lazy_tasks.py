@@ -0,0 +1,87 @@
+"""
+Move system tasks to the shared task template catalog
+
+Adds tasks.template_id, seeds task_templates, links each user's previously
+seeded task rows to their template and deletes the copies the user never
+touched (they are served from the catalog as virtual tasks from now on).
+Safe to run more than once.
+"""
+from app import create_app, db
+from sqlalchemy import text
+from seed_tasks import seed_task_templates
+
+app = create_app()
+
+with app.app_context():
+    # create_app() has already created task_templates; add the new column to tasks
+    try:
+        with db.engine.connect() as conn:
+            conn.execute(text("""
+                ALTER TABLE tasks
+                ADD COLUMN template_id INTEGER REFERENCES task_templates(id)
+            """))
+            conn.commit()
+            print("OK Added template_id column to tasks table")
+    except Exception as e:
+        print(f"Skipped template_id column: {e}")
+
+    try:
+        with db.engine.connect() as conn:
+            conn.execute(text("""
+                CREATE UNIQUE INDEX IF NOT EXISTS uq_task_user_template
+                ON tasks (user_id, template_id)
+            """))
+            conn.commit()
+            print("OK Added unique index on tasks (user_id, template_id)")
+    except Exception as e:
+        print(f"Skipped unique index: {e}")
+
+    try:
+        created = seed_task_templates()
+        db.session.commit()
+        print(f"OK Seeded {created} task templates")
+
+        # Link the first copy of each seeded task per user to its template
+        linked = db.session.execute(text("""
+            UPDATE tasks
+            SET template_id = (
+                    SELECT tt.id FROM task_templates tt
+                    WHERE tt.question_id = tasks.question_id AND tt.title = tasks.title
+                ),
+                is_system_task = TRUE
+            WHERE template_id IS NULL
+              AND EXISTS (
+                    SELECT 1 FROM task_templates tt
+                    WHERE tt.question_id = tasks.question_id AND tt.title = tasks.title
+                )
+              AND id = (
+                    SELECT MIN(t2.id) FROM tasks t2
+                    WHERE t2.user_id = tasks.user_id
+                      AND t2.question_id = tasks.question_id
+                      AND t2.title = tasks.title
+                )
+        """)).rowcount
+        print(f"OK Linked {linked} existing tasks to templates")
+
+        # Copies still identical to their template carry no user state
+        removed = db.session.execute(text("""
+            DELETE FROM tasks
+            WHERE template_id IS NOT NULL
+              AND status = 'not_started'
+              AND start_date IS NULL
+              AND due_date IS NULL
+              AND completed_at IS NULL
+              AND (notes IS NULL OR notes = '')
+              AND EXISTS (
+                    SELECT 1 FROM task_templates tt
+                    WHERE tt.id = tasks.template_id
+                      AND tt.description IS NOT DISTINCT FROM tasks.description
+                      AND tt.priority IS NOT DISTINCT FROM tasks.priority
+                )
+        """)).rowcount
+        db.session.commit()
+        print(f"OK Removed {removed} untouched task copies")
+
+    except Exception as e:
+        print(f"Error: {e}")
+        db.session.rollback()
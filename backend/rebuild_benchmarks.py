@@ -0,0 +1,33 @@
+"""
+Rebuild the cohort benchmark distributions from scratch
+
+The distributions are maintained incrementally as responses are saved; run
+this once after deploying benchmarking, or after a bulk rescore.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app, db
+from app.models.benchmark import ScoreDistribution, rebuild_benchmarks
+
+
+def main():
+    app = create_app()
+
+    with app.app_context():
+        try:
+            samples = rebuild_benchmarks()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error rebuilding benchmarks: {e}")
+            raise
+
+        print(f"Recorded {samples} benchmark samples across "
+              f"{ScoreDistribution.query.count()} score distributions")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""
+Rebuild the full-text search index from the tasks, task templates and questions
+
+The index is maintained on write; run this after bulk loads that bypass
+the application (or to repair the SQLite FTS5 table).
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app, db
+from app.services.search import rebuild_search_index
+
+
+def main():
+    app = create_app()
+
+    with app.app_context():
+        try:
+            backend = rebuild_search_index()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error rebuilding search index: {e}")
+            raise
+
+        print(f"Search index rebuilt ({backend} backend)")
+
+
+if __name__ == '__main__':
+    main()
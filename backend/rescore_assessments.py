@@ -0,0 +1,232 @@
+"""
+Bulk rescoring job for historical assessments
+
+Re-applies the current answer-to-score mapping and question weights to every
+stored assessment. Assessments are streamed in id order, each chunk loads its
+responses with a single query, scores them through the vectorized scoring
+engine and writes back with bulk UPDATEs. Chunks run across a worker pool and
+progress is checkpointed so an interrupted run resumes where it stopped.
+
+Usage:
+    python rescore_assessments.py [--chunk-size 500] [--workers 4]
+                                  [--checkpoint rescore_checkpoint.json] [--restart]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import update
+
+from app import create_app, db
+from app.models.assessment import Assessment, AssessmentResponse, AssessmentQuestion
+from app.services.assessment_scoring import score_answers, aggregate_scores, assessment_score_fields
+
+
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_WORKERS = 4
+DEFAULT_CHECKPOINT = 'rescore_checkpoint.json'
+REPORT_EVERY = 10  # chunks
+
+
+def load_checkpoint(path):
+    """Load checkpoint state, or a fresh state if none exists"""
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {'last_id': 0, 'assessments': 0, 'responses': 0, 'changed_responses': 0, 'elapsed': 0.0}
+
+
+def save_checkpoint(path, state):
+    """Atomically write checkpoint state"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def iter_assessment_chunks(after_id, chunk_size):
+    """Yield lists of (id, updated_at) in id order using keyset pagination"""
+    last_id = after_id
+    while True:
+        rows = db.session.query(Assessment.id, Assessment.updated_at)\
+            .filter(Assessment.id > last_id)\
+            .order_by(Assessment.id)\
+            .limit(chunk_size)\
+            .all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def rescore_chunk(app, chunk, weights):
+    """
+    Rescore one chunk of assessments inside its own app context/session
+
+    Returns:
+        Tuple of (assessments, responses, changed_responses)
+    """
+    with app.app_context():
+        assessment_ids = [row[0] for row in chunk]
+        position = {assessment_id: i for i, assessment_id in enumerate(assessment_ids)}
+
+        responses = db.session.query(
+            AssessmentResponse.id,
+            AssessmentResponse.assessment_id,
+            AssessmentResponse.question_id,
+            AssessmentResponse.category,
+            AssessmentResponse.answer_value,
+            AssessmentResponse.score,
+            AssessmentResponse.updated_at
+        ).filter(AssessmentResponse.assessment_id.in_(assessment_ids)).all()
+
+        answer_values = [r.answer_value for r in responses]
+        scores = score_answers(answer_values)
+
+        aggregates = aggregate_scores(
+            [position[r.assessment_id] for r in responses],
+            len(assessment_ids),
+            [r.category for r in responses],
+            answer_values,
+            scores,
+            [weights.get(r.question_id, 1.0) for r in responses]
+        )
+
+        # Only rewrite responses whose stored score is stale; keep updated_at
+        # untouched so a rescore does not look like a user edit
+        response_updates = [
+            {'id': r.id, 'score': float(new_score), 'updated_at': r.updated_at}
+            for r, new_score in zip(responses, scores)
+            if r.score != new_score
+        ]
+
+        assessment_updates = []
+        for assessment_id, updated_at in chunk:
+            fields = assessment_score_fields(aggregates, position[assessment_id])
+            fields['id'] = assessment_id
+            fields['updated_at'] = updated_at
+            assessment_updates.append(fields)
+
+        try:
+            if response_updates:
+                db.session.execute(update(AssessmentResponse), response_updates)
+            db.session.execute(update(Assessment), assessment_updates)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return len(assessment_ids), len(responses), len(response_updates)
+
+
+def print_report(state, started, label='Progress'):
+    """Print throughput figures for the run so far"""
+    elapsed = state['elapsed'] + (time.perf_counter() - started)
+    rate_a = state['assessments'] / elapsed if elapsed > 0 else 0
+    rate_r = state['responses'] / elapsed if elapsed > 0 else 0
+    print(
+        f"{label}: {state['assessments']} assessments, {state['responses']} responses "
+        f"({state['changed_responses']} rescored) in {elapsed:.1f}s "
+        f"- {rate_a:,.0f} assessments/s, {rate_r:,.0f} responses/s "
+        f"- checkpoint at id {state['last_id']}"
+    )
+
+
+def rescore_all(chunk_size=DEFAULT_CHUNK_SIZE, workers=DEFAULT_WORKERS,
+                checkpoint_path=DEFAULT_CHECKPOINT, restart=False):
+    """Rescore every assessment after the checkpoint"""
+    app = create_app()
+
+    if restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    state = load_checkpoint(checkpoint_path)
+
+    with app.app_context():
+        weights = {
+            question_id: (weight if weight is not None else 1.0)
+            for question_id, weight in db.session.query(
+                AssessmentQuestion.question_id, AssessmentQuestion.weight
+            ).all()
+        }
+
+        print(f"Rescoring assessments after id {state['last_id']} "
+              f"(chunk size {chunk_size}, {workers} workers)")
+
+        started = time.perf_counter()
+        in_flight = {}       # future -> chunk end id
+        finished_ends = set()
+        pending_ends = []    # chunk end ids in submission order
+        chunks_done = 0
+
+        def collect(done):
+            nonlocal chunks_done
+            for future in done:
+                end_id = in_flight.pop(future)
+                assessments, responses, changed = future.result()
+                state['assessments'] += assessments
+                state['responses'] += responses
+                state['changed_responses'] += changed
+                finished_ends.add(end_id)
+                chunks_done += 1
+
+            # Advance the checkpoint only past chunks that finished contiguously
+            while pending_ends and pending_ends[0] in finished_ends:
+                state['last_id'] = pending_ends.pop(0)
+                finished_ends.discard(state['last_id'])
+
+            saved = dict(state)
+            saved['elapsed'] = state['elapsed'] + (time.perf_counter() - started)
+            save_checkpoint(checkpoint_path, saved)
+
+            if chunks_done and chunks_done % REPORT_EVERY == 0:
+                print_report(state, started)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for chunk in iter_assessment_chunks(state['last_id'], chunk_size):
+                end_id = chunk[-1][0]
+                pending_ends.append(end_id)
+                in_flight[pool.submit(rescore_chunk, app, chunk, weights)] = end_id
+
+                # Bound the number of chunks held in memory
+                if len(in_flight) >= workers * 2:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+
+        print_report(state, started, label='Rescoring completed')
+        state['elapsed'] += time.perf_counter() - started
+        save_checkpoint(checkpoint_path, state)
+
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rescore all historical assessments')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='Assessments per chunk (one response query per chunk)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help='Number of chunks scored and written concurrently')
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT,
+                        help='Checkpoint file used to resume an interrupted run')
+    parser.add_argument('--restart', action='store_true',
+                        help='Ignore any existing checkpoint and start from the beginning')
+    args = parser.parse_args()
+
+    rescore_all(
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        checkpoint_path=args.checkpoint,
+        restart=args.restart
+    )
+
+
+if __name__ == '__main__':
+    main()
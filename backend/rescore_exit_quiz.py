@@ -0,0 +1,130 @@
+"""
+Bulk rescoring job for stored exit quiz results
+
+Re-applies the current SCORING_RULES to every saved ExitQuizResponse, e.g.
+after a rules change. Results are streamed in id order; each chunk is scored
+as one matrix (see app/services/exit_quiz_engine.py) and written back with a
+single bulk UPDATE. Only rows whose recommendations or scores changed are
+rewritten, and updated_at is left alone so a rescore does not look like a
+new submission.
+
+Usage:
+    python rescore_exit_quiz.py [--chunk-size 1000] [--dry-run]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import update
+
+from app import create_app, db
+from app.models.exit_quiz import ExitQuizResponse
+from app.services.exit_quiz_engine import STRATEGY_KEYS, score_responses, rank_strategies
+from app.services.exit_quiz_results import encode_scores
+
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def iter_result_chunks(chunk_size):
+    """Yield lists of stored quiz rows in id order using keyset pagination"""
+    last_id = 0
+    while True:
+        rows = db.session.query(
+            ExitQuizResponse.id,
+            ExitQuizResponse.responses,
+            ExitQuizResponse.top_recommendation,
+            ExitQuizResponse.second_recommendation,
+            ExitQuizResponse.third_recommendation,
+            ExitQuizResponse.all_scores,
+            ExitQuizResponse.updated_at
+        ).filter(ExitQuizResponse.id > last_id)\
+            .order_by(ExitQuizResponse.id)\
+            .limit(chunk_size)\
+            .all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+
+
+def load_responses(raw):
+    try:
+        responses = json.loads(raw or '{}')
+    except ValueError:
+        return {}
+    return responses if isinstance(responses, dict) else {}
+
+
+def rescore_chunk(rows):
+    """
+    Score one chunk of stored results
+
+    Returns:
+        List of update dicts for the rows whose stored results are stale
+    """
+    scores = score_responses([load_responses(row.responses) for row in rows])
+    rankings = rank_strategies(scores)
+
+    updates = []
+    for row, score_row, top_3 in zip(rows, scores.tolist(), rankings):
+        fields = {
+            'top_recommendation': top_3[0] if len(top_3) > 0 else None,
+            'second_recommendation': top_3[1] if len(top_3) > 1 else None,
+            'third_recommendation': top_3[2] if len(top_3) > 2 else None,
+            'all_scores': encode_scores(dict(zip(STRATEGY_KEYS, score_row)))
+        }
+        if any(getattr(row, key) != value for key, value in fields.items()):
+            fields['id'] = row.id
+            fields['updated_at'] = row.updated_at
+            updates.append(fields)
+    return updates
+
+
+def rescore_all(chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False):
+    """Rescore every stored exit quiz result"""
+    app = create_app()
+
+    with app.app_context():
+        started = time.perf_counter()
+        total = changed = 0
+
+        for rows in iter_result_chunks(chunk_size):
+            updates = rescore_chunk(rows)
+            total += len(rows)
+            changed += len(updates)
+
+            if updates and not dry_run:
+                try:
+                    db.session.execute(update(ExitQuizResponse), updates)
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
+                    raise
+
+        elapsed = time.perf_counter() - started
+        rate = total / elapsed if elapsed > 0 else 0
+        action = 'would change' if dry_run else 'changed'
+        print(f"Rescoring completed: {total} quiz results ({changed} {action}) "
+              f"in {elapsed:.1f}s - {rate:,.0f} results/s")
+
+    return total, changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rescore all stored exit quiz results')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='Quiz results scored and written per batch')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Report how many results would change without writing them')
+    args = parser.parse_args()
+
+    rescore_all(chunk_size=args.chunk_size, dry_run=args.dry_run)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,9 @@
 from app import create_app, db
 
-app = create_app()
+# PDF render workers are spawned processes that re-import this script as
+# __mp_main__ (see pdf_jobs.worker_context); they only render, so they skip the app
+if __name__ != '__mp_main__':
+    app = create_app()
 
 if __name__ == '__main__':
     with app.app_context():
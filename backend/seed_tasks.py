@@ -1,11 +1,11 @@
 """
-Seed script to populate tasks for all 89 assessment questions
+Seed script to populate the task template catalog for all 89 assessment questions
 """
+from sqlalchemy import insert
 from app import create_app
 from app.models import db
-from app.models.task import Task
+from app.models.task import TaskTemplate
 from app.models.assessment import AssessmentQuestion
-from app.models.user import User
 
 # Task definitions for each question
 QUESTION_TASKS = {
@@ -445,56 +445,57 @@ QUESTION_TASKS = {
     ]
 }
 
-def seed_tasks():
-    """Seed tasks for all users and questions"""
-    app = create_app()
-
-    with app.app_context():
-        # Get all users
-        users = User.query.all()
-
-        if not users:
-            print("No users found. Please create users first.")
-            return
+def seed_task_templates():
+    """
+    Insert any missing task templates into the shared catalog
 
-        print(f"Found {len(users)} user(s)")
+    Tasks are no longer copied per user; users see the templates as virtual
+    tasks and a Task row is only created when they edit one. The caller commits.
 
-        for user in users:
-            print(f"\nSeeding tasks for user: {user.email}")
+    Returns the number of templates created.
+    """
+    active_questions = {
+        question_id for (question_id,) in
+        db.session.query(AssessmentQuestion.question_id).filter_by(active=True).all()
+    }
+    existing = set(db.session.query(TaskTemplate.question_id, TaskTemplate.title).all())
 
-            # Get all questions
-            questions = AssessmentQuestion.query.filter_by(active=True).all()
-            print(f"Found {len(questions)} active questions")
+    new_templates = []
+    for question_id, task_list in QUESTION_TASKS.items():
+        if question_id not in active_questions:
+            continue
+        for position, task_data in enumerate(task_list):
+            if (question_id, task_data['title']) in existing:
+                continue
+            new_templates.append({
+                'question_id': question_id,
+                'title': task_data['title'],
+                'description': task_data['description'],
+                'priority': task_data['priority'],
+                'position': position
+            })
 
-            tasks_created = 0
+    if new_templates:
+        db.session.execute(insert(TaskTemplate), new_templates)
 
-            for question in questions:
-                # Check if tasks are defined for this question
-                if question.question_id in QUESTION_TASKS:
-                    task_list = QUESTION_TASKS[question.question_id]
+    return len(new_templates)
 
-                    for task_data in task_list:
-                        # Check if task already exists
-                        existing = Task.query.filter_by(
-                            user_id=user.id,
-                            question_id=question.question_id,
-                            title=task_data['title']
-                        ).first()
 
-                        if not existing:
-                            task = Task(
-                                user_id=user.id,
-                                question_id=question.question_id,
-                                title=task_data['title'],
-                                description=task_data['description'],
-                                priority=task_data['priority'],
-                                status='not_started'
-                            )
-                            db.session.add(task)
-                            tasks_created += 1
+def seed_tasks():
+    """Seed the task template catalog for all questions"""
+    app = create_app()
 
+    with app.app_context():
+        try:
+            created = seed_task_templates()
             db.session.commit()
-            print(f"Created {tasks_created} tasks for {user.email}")
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error seeding task templates: {e}")
+            raise
+
+        print(f"Created {created} task templates "
+              f"({TaskTemplate.query.count()} in catalog)")
 
         print("\n" + "="*80)
         print("Task seeding completed!")
@@ -0,0 +1,58 @@
+"""
+Overlapping quiz submits from one user get distinct versions or share one
+"""
+import pytest
+
+from app import db
+from app.models.exit_quiz import ExitQuizResponse
+from app.models.user import User
+from app.services.exit_quiz_results import encode_responses, encode_scores, save_snapshot
+
+RESULTS = {'all_scores': {'strategic_sale': 42}, 'top_recommendations': ['strategic_sale']}
+
+
+@pytest.fixture
+def user_id(app):
+    user = User(email='owner@example.com', password_hash='x', full_name='Owner')
+    db.session.add(user)
+    db.session.commit()
+    return user.id
+
+
+def race_with(monkeypatch, user_id, responses):
+    """Make another submit commit version 1 between our read and our insert"""
+    begin_nested = db.session.begin_nested
+    raced = []
+
+    def racing_begin_nested():
+        if not raced:
+            raced.append(True)
+            db.session.execute(ExitQuizResponse.__table__.insert().values(
+                user_id=user_id, version=1, responses=encode_responses(responses),
+                all_scores=encode_scores(RESULTS['all_scores'])
+            ))
+        return begin_nested()
+
+    monkeypatch.setattr(db.session, 'begin_nested', racing_begin_nested)
+
+
+def test_conflicting_version_goes_in_after_the_winner(monkeypatch, user_id):
+    race_with(monkeypatch, user_id, {'q1': 'a'})
+
+    snapshot, created = save_snapshot(user_id, {'q1': 'b'}, RESULTS)
+    db.session.commit()
+
+    assert created
+    assert snapshot.version == 2
+    assert [row.version for row in ExitQuizResponse.query.filter_by(user_id=user_id)] == [1, 2]
+
+
+def test_identical_overlapping_submit_returns_the_existing_version(monkeypatch, user_id):
+    race_with(monkeypatch, user_id, {'q1': 'a'})
+
+    snapshot, created = save_snapshot(user_id, {'q1': 'a'}, RESULTS)
+    db.session.commit()
+
+    assert not created
+    assert snapshot.version == 1
+    assert ExitQuizResponse.query.filter_by(user_id=user_id).count() == 1
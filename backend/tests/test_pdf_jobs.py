@@ -0,0 +1,71 @@
+"""
+PDF job records shared by every web worker using the job directory
+"""
+import json
+import multiprocessing
+import time
+
+import pytest
+
+from app.services.pdf_cache import PDFCache
+from app.services.pdf_jobs import QUEUED, RUNNING, JobLimitError, JobStore, PDFJobQueue
+
+fcntl = pytest.importorskip('fcntl')
+
+
+def record(job_id, status, age, user_id=1):
+    now = time.time()
+    return {'job_id': job_id, 'user_id': user_id, 'status': status, 'progress': None,
+            'created_at': now - age, 'finished_at': None}
+
+
+def test_queued_job_outlives_the_ttl_until_the_queue_timeout(tmp_path):
+    store = JobStore(str(tmp_path), ttl=60, queued_timeout=3600)
+    store.save(record('a' * 32, QUEUED, age=600))
+    store.save(record('b' * 32, QUEUED, age=7200))
+
+    assert store.load('a' * 32) is not None
+    assert store.load('b' * 32) is None
+
+
+def test_running_job_expires_when_it_stops_being_updated(tmp_path):
+    store = JobStore(str(tmp_path), ttl=60)
+    store.save(record('c' * 32, RUNNING, age=600))
+    job = store.load('c' * 32)
+    assert job is not None
+
+    job['updated_at'] = time.time() - 120
+    with open(store._path(job['job_id']), 'w') as f:
+        json.dump(job, f)
+    assert store.load('c' * 32) is None
+
+
+def test_limits_count_jobs_from_every_queue_on_the_directory(tmp_path):
+    cache = PDFCache(str(tmp_path))
+    first = PDFJobQueue(cache, max_pending=1)
+    second = PDFJobQueue(cache, max_pending=1)
+    first.jobs.save(record('d' * 32, QUEUED, age=0, user_id=7))
+
+    with pytest.raises(JobLimitError) as refused:
+        second.submit_batch('book-of-business', 8, 'book.zip', 'application/zip', lambda *args: None)
+    assert refused.value.status_code == 503
+
+
+def _try_lock(directory, acquired):
+    with open(f"{directory}/.lock", 'a') as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            acquired.value = 1
+        except BlockingIOError:
+            acquired.value = 0
+
+
+def test_directory_lock_excludes_other_processes(tmp_path):
+    store = JobStore(str(tmp_path))
+    acquired = multiprocessing.Value('i', -1)
+
+    with store.locked():
+        child = multiprocessing.get_context('fork').Process(target=_try_lock, args=(store.directory, acquired))
+        child.start()
+        child.join()
+    assert acquired.value == 0
@@ -0,0 +1,73 @@
+"""
+Task list endpoints run a fixed number of queries however many tasks a user has
+"""
+from datetime import date, timedelta
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import db
+from app.models.assessment import Assessment, AssessmentQuestion, AssessmentTask
+from app.models.task import Task, TaskTemplate
+from app.models.user import User
+from app.services.task_catalog import clear_task_catalog
+
+
+def make_user(email='owner@example.com'):
+    user = User(email=email, password_hash='x', full_name='Owner')
+    db.session.add(user)
+    db.session.commit()
+    return user.id, {'Authorization': f"Bearer {create_access_token(identity=str(user.id))}"}
+
+
+def add_tasks(user_id, count):
+    """Add count questions, each with a template, a stored task and an assessment task"""
+    assessment = Assessment.query.filter_by(user_id=user_id).first()
+    if assessment is None:
+        assessment = Assessment(user_id=user_id)
+        db.session.add(assessment)
+        db.session.flush()
+
+    start = AssessmentQuestion.query.count()
+    for i in range(start, start + count):
+        question_id = f'Q-{i:04d}'
+        db.session.add(AssessmentQuestion(
+            question_id=question_id, category='financial_performance',
+            category_display='Financial Performance', subject=f'Subject {i}',
+            question_text=f'Question {i}?'
+        ))
+        db.session.add(TaskTemplate(question_id=question_id, title=f'Template {i}'))
+        db.session.add(Task(
+            user_id=user_id, question_id=question_id, title=f'Task {i}',
+            start_date=date.today(), due_date=date.today() + timedelta(days=i % 30)
+        ))
+        db.session.add(AssessmentTask(assessment_id=assessment.id, title=f'Assessment task {i}'))
+    db.session.commit()
+    clear_task_catalog()
+
+
+def statements(client, count_queries, url, headers):
+    # Load the template catalog cold so its query is counted too
+    clear_task_catalog()
+    db.session.expunge_all()
+    with count_queries() as counter:
+        response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return counter.count
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('/api/tasks', 2),
+    ('/api/tasks?page=1&per_page=5', 2),
+    ('/api/assessment/tasks', 1),
+])
+def test_task_lists_query_count_is_constant(client, count_queries, url, expected):
+    user_id, headers = make_user()
+
+    counts = []
+    # 3, then 30, then 120 tasks
+    for added in (3, 27, 90):
+        add_tasks(user_id, added)
+        counts.append(statements(client, count_queries, url, headers))
+
+    assert counts == [expected] * len(counts)
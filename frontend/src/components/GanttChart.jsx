@@ -4,16 +4,44 @@ import {
   ZoomOut,
   Maximize2,
   Calendar,
+  ChevronLeft,
   ChevronRight,
   ChevronDown,
   Download
 } from 'lucide-react';
+import { getTaskTimeline } from '../services/api';
 
-const GanttChart = ({ tasks, onTaskUpdate, onTaskClick }) => {
+// Default window around today, in days (same as the timeline endpoint)
+const DAYS_BEFORE_TODAY = 30;
+const DAYS_AFTER_TODAY = 90;
+
+const addDays = (date, days) => {
+  const result = new Date(date);
+  result.setDate(result.getDate() + days);
+  return result;
+};
+
+// YYYY-MM-DD in local time (toISOString would shift to UTC)
+const toISODate = (date) => {
+  const pad = (n) => String(n).padStart(2, '0');
+  return `${date.getFullYear()}-${pad(date.getMonth() + 1)}-${pad(date.getDate())}`;
+};
+
+const getDefaultWindow = () => {
+  const today = new Date();
+  today.setHours(0, 0, 0, 0);
+  return { start: addDays(today, -DAYS_BEFORE_TODAY), end: addDays(today, DAYS_AFTER_TODAY) };
+};
+
+// Loads only the tasks in the visible window; reloadKey changes when tasks were edited elsewhere
+const GanttChart = ({ reloadKey, onTaskUpdate, onTaskClick }) => {
   const [zoomLevel, setZoomLevel] = useState('week');
-  const [viewStartDate, setViewStartDate] = useState(null);
-  const [viewEndDate, setViewEndDate] = useState(null);
+  const [viewStartDate, setViewStartDate] = useState(() => getDefaultWindow().start);
+  const [viewEndDate, setViewEndDate] = useState(() => getDefaultWindow().end);
   const [collapsedGroups, setCollapsedGroups] = useState({});
+  const [groups, setGroups] = useState([]);
+  const [totalInView, setTotalInView] = useState(0);
+  const [loadError, setLoadError] = useState(null);
   const [draggingTask, setDraggingTask] = useState(null);
   const [dragStartX, setDragStartX] = useState(0);
   const [dragOffset, setDragOffset] = useState(0);
@@ -56,46 +84,27 @@ const GanttChart = ({ tasks, onTaskUpdate, onTaskClick }) => {
     return date.toLocaleDateString('en-US', { month: 'short', day: 'numeric' });
   };
 
-  // Get date range from tasks
-  const getDateRange = () => {
-    const validTasks = tasks.filter(t => t.due_date || t.created_at);
-    if (validTasks.length === 0) {
-      const today = new Date();
-      return {
-        start: new Date(today.getFullYear(), today.getMonth(), 1),
-        end: new Date(today.getFullYear(), today.getMonth() + 3, 0)
-      };
-    }
-
-    let minDate = new Date();
-    let maxDate = new Date();
-
-    validTasks.forEach(task => {
-      const dueDate = parseDate(task.due_date);
-      const createdDate = parseDate(task.created_at);
-
-      if (dueDate) {
-        if (dueDate < minDate) minDate = dueDate;
-        if (dueDate > maxDate) maxDate = dueDate;
-      }
-      if (createdDate) {
-        if (createdDate < minDate) minDate = createdDate;
-        if (createdDate > maxDate) maxDate = createdDate;
-      }
+  // Fetch the window's groups; collapsed groups come back as summary bars only
+  const loadTimeline = async () => {
+    const collapsed = Object.keys(collapsedGroups).filter(key => collapsedGroups[key]);
+    const result = await getTaskTimeline({
+      start: toISODate(viewStartDate),
+      end: toISODate(viewEndDate),
+      collapsed
     });
 
-    minDate.setDate(minDate.getDate() - 7);
-    maxDate.setDate(maxDate.getDate() + 30);
-
-    return { start: minDate, end: maxDate };
+    if (result.success) {
+      setGroups(result.data.groups);
+      setTotalInView(result.data.total);
+      setLoadError(null);
+    } else {
+      setLoadError(result.error);
+    }
   };
 
-  // Initialize view dates
   useEffect(() => {
-    const range = getDateRange();
-    setViewStartDate(range.start);
-    setViewEndDate(range.end);
-  }, [tasks]);
+    loadTimeline();
+  }, [viewStartDate, viewEndDate, collapsedGroups, reloadKey]);
 
   // Generate time columns
   const generateTimeColumns = () => {
@@ -213,21 +222,13 @@ const GanttChart = ({ tasks, onTaskUpdate, onTaskClick }) => {
     return colors[priority] || colors.medium;
   };
 
-  // Group tasks
-  const groupedTasks = tasks.reduce((acc, task) => {
-    const category = task.question?.category_display || 'Uncategorized';
-    if (!acc[category]) acc[category] = [];
-    acc[category].push(task);
-    return acc;
-  }, {});
-
-  // Get visible tasks
+  // Group rows (with their summary bar) followed by their tasks unless collapsed
   const getVisibleTasks = () => {
     const visible = [];
-    Object.entries(groupedTasks).forEach(([category, categoryTasks]) => {
-      visible.push({ isGroup: true, name: category, count: categoryTasks.length });
-      if (!collapsedGroups[category]) {
-        categoryTasks.forEach(task => visible.push({ isGroup: false, ...task }));
+    groups.forEach(group => {
+      visible.push({ isGroup: true, key: group.key, name: group.label, count: group.count, start_date: group.start, due_date: group.end, progress: group.progress });
+      if (!group.collapsed) {
+        (group.tasks || []).forEach(task => visible.push({ isGroup: false, ...task }));
       }
     });
     return visible;
@@ -236,10 +237,10 @@ const GanttChart = ({ tasks, onTaskUpdate, onTaskClick }) => {
   const visibleTasks = getVisibleTasks();
 
   // Toggle group
-  const toggleGroup = (category) => {
+  const toggleGroup = (key) => {
     setCollapsedGroups(prev => ({
       ...prev,
-      [category]: !prev[category]
+      [key]: !prev[key]
     }));
   };
 
@@ -262,14 +263,21 @@ const GanttChart = ({ tasks, onTaskUpdate, onTaskClick }) => {
 
   const handleFitToScreen = () => {
     setZoomLevel('week');
-    const range = getDateRange();
+    const range = getDefaultWindow();
     setViewStartDate(range.start);
     setViewEndDate(range.end);
   };
 
+  // Move the window by its own length; the new window is fetched
+  const handleShiftWindow = (direction) => {
+    const days = Math.round((viewEndDate - viewStartDate) / (1000 * 60 * 60 * 24));
+    setViewStartDate(addDays(viewStartDate, direction * days));
+    setViewEndDate(addDays(viewEndDate, direction * days));
+  };
+
   const handleJumpToToday = () => {
     const today = new Date();
-    const range = getDateRange();
+    const range = getDefaultWindow();
     setViewStartDate(range.start);
     setViewEndDate(range.end);
 
@@ -380,6 +388,7 @@ const GanttChart = ({ tasks, onTaskUpdate, onTaskClick }) => {
           taskId: draggingTask.id,
           updates
         });
+        await loadTimeline();
       } catch (error) {
         console.error('Error updating task date:', error);
       }
@@ -409,10 +418,29 @@ const GanttChart = ({ tasks, onTaskUpdate, onTaskClick }) => {
         <div className="flex items-center gap-2">
           <Calendar className="text-blue-600" size={20} />
           <h3 className="font-bold text-gray-900">Gantt Chart</h3>
-          <span className="text-xs text-gray-500">({tasks.length} tasks)</span>
+          <span className="text-xs text-gray-500">({totalInView} tasks in view)</span>
+          {loadError && <span className="text-xs text-red-600">{loadError}</span>}
         </div>
 
         <div className="flex items-center gap-2">
+          <div className="flex items-center gap-1 bg-white rounded-lg shadow-sm border border-gray-200 p-1">
+            <button
+              onClick={() => handleShiftWindow(-1)}
+              className="p-1.5 hover:bg-gray-100 rounded transition"
+            >
+              <ChevronLeft size={18} className="text-gray-600" />
+            </button>
+            <span className="text-xs font-medium text-gray-600 px-2 whitespace-nowrap">
+              {formatDate(viewStartDate)} - {formatDate(viewEndDate)}
+            </span>
+            <button
+              onClick={() => handleShiftWindow(1)}
+              className="p-1.5 hover:bg-gray-100 rounded transition"
+            >
+              <ChevronRight size={18} className="text-gray-600" />
+            </button>
+          </div>
+
           <div className="flex items-center gap-1 bg-white rounded-lg shadow-sm border border-gray-200 p-1">
             <button
               onClick={handleZoomOut}
@@ -469,16 +497,16 @@ const GanttChart = ({ tasks, onTaskUpdate, onTaskClick }) => {
           <div>
             {visibleTasks.map((item, idx) => (
               <div
-                key={item.isGroup ? `group-${item.name}` : `task-${item.id}`}
+                key={item.isGroup ? `group-${item.key}` : `task-${item.id}`}
                 className={`border-b border-gray-200 ${item.isGroup ? 'bg-gray-50' : idx % 2 === 0 ? 'bg-white' : 'bg-gray-50'}`}
                 style={{ height: ROW_HEIGHT }}
               >
                 {item.isGroup ? (
                   <button
-                    onClick={() => toggleGroup(item.name)}
+                    onClick={() => toggleGroup(item.key)}
                     className="w-full h-full px-4 flex items-center gap-2 hover:bg-gray-100 transition text-left"
                   >
-                    {collapsedGroups[item.name] ? (
+                    {collapsedGroups[item.key] ? (
                       <ChevronRight size={16} className="text-gray-600 flex-shrink-0" />
                     ) : (
                       <ChevronDown size={16} className="text-gray-600 flex-shrink-0" />
@@ -554,12 +582,22 @@ const GanttChart = ({ tasks, onTaskUpdate, onTaskClick }) => {
               {/* Task bars */}
               {visibleTasks.map((item, idx) => {
                 if (item.isGroup) {
+                  // Summary bar spanning the group's tasks in the window
+                  const { x: groupX, width: groupWidth } = getTaskBarDimensions(item);
                   return (
                     <div
-                      key={`group-row-${item.name}`}
-                      className="border-b border-gray-200 bg-gray-50"
+                      key={`group-row-${item.key}`}
+                      className="relative border-b border-gray-200 bg-gray-50"
                       style={{ height: ROW_HEIGHT }}
-                    />
+                    >
+                      <div
+                        className="absolute top-5 h-3 rounded bg-gray-400 overflow-hidden"
+                        style={{ left: groupX, width: groupWidth }}
+                        title={`${item.progress}% complete`}
+                      >
+                        <div className="h-full bg-gray-700" style={{ width: `${item.progress}%` }} />
+                      </div>
+                    </div>
                   );
                 }
 
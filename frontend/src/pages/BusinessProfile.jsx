@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import { useAuth } from '../context/AuthContext';
 import { useNavigate } from 'react-router-dom';
 import axios from 'axios';
@@ -153,6 +153,9 @@ const BusinessProfile = () => {
     has_business_coach: false, business_coach_name: '', business_coach_email: '', business_coach_phone: ''
   });
 
+  // Last values known to be stored; section saves only send fields that differ
+  const savedDataRef = useRef(null);
+
   const loadBusinessProfile = useCallback(async () => {
     try {
       const token = localStorage.getItem('token');
@@ -167,7 +170,7 @@ const BusinessProfile = () => {
           catch { return field || []; }
         };
 
-        setFormData({
+        const loaded = {
           client_first_name: profile.client_first_name || '', client_last_name: profile.client_last_name || '',
           client_email: profile.client_email || '', client_phone: profile.client_phone || '',
           client_date_of_birth: profile.client_date_of_birth || '', client_address: profile.client_address || '',
@@ -218,7 +221,9 @@ const BusinessProfile = () => {
           business_coach_name: profile.business_coach_name || '',
           business_coach_email: profile.business_coach_email || '',
           business_coach_phone: profile.business_coach_phone || ''
-        });
+        };
+        setFormData(loaded);
+        savedDataRef.current = loaded;
       }
     } catch (error) { console.error('Error loading profile:', error); }
   }, []);
@@ -400,10 +405,15 @@ const BusinessProfile = () => {
     setSavedSection(null);
 
     try {
+      const saved = savedDataRef.current || {};
+      const changes = Object.fromEntries(
+        Object.entries(formData).filter(([key, value]) => JSON.stringify(value) !== JSON.stringify(saved[key]))
+      );
+
       const token = localStorage.getItem('token');
-      const response = await axios.post(
+      const response = await axios.patch(
         'http://localhost:5000/api/business/profile',
-        formData,
+        changes,
         {
           headers: {
             Authorization: `Bearer ${token}`,
@@ -413,6 +423,7 @@ const BusinessProfile = () => {
       );
 
       if (response.data.success) {
+        savedDataRef.current = formData;
         setSavedSection(sectionName);
         updateUser({ business_name: formData.business_name, industry: formData.industry });
         setTimeout(() => setSavedSection(null), 3000);
@@ -444,6 +455,7 @@ const BusinessProfile = () => {
       );
 
       if (response.data.success) {
+        savedDataRef.current = formData;
         setSavedAll(true);
         updateUser({ business_name: formData.business_name, industry: formData.industry });
         setTimeout(() => setSavedAll(false), 3000);
@@ -61,7 +61,7 @@ const EnhancedDashboard = () => {
       const token = localStorage.getItem('token');
 
       // Fetch client profile first
-      const profileResult = await getBusinessProfile();
+      const profileResult = await getBusinessProfile('core,contact');
       console.log('Client Profile Result:', profileResult);
       if (profileResult.success && profileResult.data.profile) {
         setBusinessProfile(profileResult.data.profile);
@@ -720,6 +720,18 @@ const EnhancedDashboard = () => {
                       <p className="text-xs text-orange-100 mt-1">Amount needed to reach your goal</p>
                     )}
                   </div>
+
+                  {wealthGap.exit_coverage_ratio != null && (
+                    <div className="bg-white/10 backdrop-blur-sm rounded-lg p-3 border border-white/20">
+                      <p className="text-xs text-orange-100 mb-1">Covered by Exit (after tax)</p>
+                      <p className="text-lg font-bold">
+                        {Math.round(wealthGap.exit_coverage_ratio * 100)}%
+                        <span className="ml-2 text-xs font-normal text-orange-100">
+                          {formatCurrency(wealthGap.exit_after_tax_proceeds)} of proceeds
+                        </span>
+                      </p>
+                    </div>
+                  )}
                 </div>
               ) : (
                 <div className="text-center">
@@ -1584,9 +1584,9 @@ const TaskManager = () => {
               {/* GANTT VIEW */}
               {viewMode === 'gantt' && (
                 <GanttChart
-                  tasks={tasks}
+                  reloadKey={tasks}
                   onTaskUpdate={handleGanttTaskUpdate}
-                  onTaskClick={setSelectedTask}
+                  onTaskClick={(task) => setSelectedTask(tasks.find(t => t.id === task.id) || task)}
                 />
               )}
             </>
@@ -59,7 +59,7 @@ const ValuationDashboard = () => {
       setValuationHistory(valuations);
 
       // Fetch business profile
-      const profileResult = await getBusinessProfile();
+      const profileResult = await getBusinessProfile('core,financials');
       if (profileResult.success && profileResult.data.profile) {
         setBusinessProfile(profileResult.data.profile);
       }
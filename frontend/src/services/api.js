@@ -162,20 +162,59 @@ export const getSpecificAssessment = async (assessmentId) => {
   }
 };
 
+// PDF reports render in a background job: queue it, poll until done, then download
+const PDF_JOB_POLL_INTERVAL = 1000;
+const PDF_JOB_TIMEOUT = 120000;
+
+const waitForPdfJob = async (jobId, { timeout = PDF_JOB_TIMEOUT, onProgress } = {}) => {
+  const deadline = Date.now() + timeout;
+  while (Date.now() < deadline) {
+    const { data } = await api.get(`/pdf/jobs/${jobId}`);
+    if (data.progress && onProgress) onProgress(data.progress);
+    if (data.status === 'done') return data;
+    if (data.status === 'failed') throw new Error(data.error || 'Failed to generate PDF');
+    await new Promise((resolve) => setTimeout(resolve, PDF_JOB_POLL_INTERVAL));
+  }
+  throw new Error('PDF generation timed out');
+};
+
+// A job the server no longer knows (404) or whose PDF was evicted (410) is rendered synchronously instead
+const PDF_JOB_LOST_STATUSES = [404, 410];
+
+const renderAssessmentPdfJob = async (assessmentId) => {
+  const { data: job } = await api.post('/pdf/jobs', {
+    kind: 'assessment',
+    assessment_id: assessmentId
+  });
+  await waitForPdfJob(job.job_id);
+
+  const response = await api.get(`/pdf/jobs/${job.job_id}/download`, {
+    responseType: 'blob'
+  });
+  return { data: response.data, filename: job.filename };
+};
+
 export const downloadAssessmentPDF = async (assessmentId) => {
   try {
-    const response = await api.get(`/assessment/${assessmentId}/pdf`, {
-      responseType: 'blob'
-    });
+    let pdf;
+    try {
+      pdf = await renderAssessmentPdfJob(assessmentId);
+    } catch (error) {
+      if (!PDF_JOB_LOST_STATUSES.includes(error.response?.status)) throw error;
+      const response = await api.get(`/assessment/${assessmentId}/pdf`, {
+        responseType: 'blob'
+      });
+      pdf = { data: response.data };
+    }
 
     // Create blob from response
-    const blob = new Blob([response.data], { type: 'application/pdf' });
+    const blob = new Blob([pdf.data], { type: 'application/pdf' });
 
     // Create download link
     const url = window.URL.createObjectURL(blob);
     const link = document.createElement('a');
     link.href = url;
-    link.download = `assessment_report_${assessmentId}_${new Date().toISOString().split('T')[0]}.pdf`;
+    link.download = pdf.filename || `assessment_report_${assessmentId}_${new Date().toISOString().split('T')[0]}.pdf`;
 
     // Trigger download
     document.body.appendChild(link);
@@ -195,6 +234,100 @@ export const downloadAssessmentPDF = async (assessmentId) => {
   }
 };
 
+// One part of the question-by-question appendix (part counts from 1); returns the number of parts
+export const downloadAssessmentAppendix = async (assessmentId, part = 1) => {
+  try {
+    const response = await api.get(`/assessment/${assessmentId}/pdf/appendix`, {
+      params: { part },
+      responseType: 'blob'
+    });
+
+    const parts = Number(response.headers['x-appendix-parts']) || 1;
+    const url = window.URL.createObjectURL(new Blob([response.data], { type: 'application/pdf' }));
+    const link = document.createElement('a');
+    link.href = url;
+    link.download = `assessment_appendix_${assessmentId}_part${part}_of_${parts}.pdf`;
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+    window.URL.revokeObjectURL(url);
+
+    return { success: true, parts };
+  } catch (error) {
+    console.error('Error downloading appendix PDF:', error);
+    return {
+      success: false,
+      error: error.response?.status === 404
+        ? 'Appendix part not found'
+        : error.message || 'Failed to download PDF appendix'
+    };
+  }
+};
+
+// Book of business ZIPs render in a background job and can take minutes for hundreds of clients
+const BOOK_OF_BUSINESS_TIMEOUT = 30 * 60000;
+
+// ZIP of this quarter's client pack for every client who granted access; onProgress gets { done, total, failed }
+export const downloadBookOfBusiness = async (onProgress) => {
+  try {
+    const { data: job } = await api.post('/pdf/book-of-business');
+    const finished = await waitForPdfJob(job.job_id, { timeout: BOOK_OF_BUSINESS_TIMEOUT, onProgress });
+
+    const response = await api.get(`/pdf/jobs/${job.job_id}/download`, {
+      responseType: 'blob'
+    });
+
+    const url = window.URL.createObjectURL(new Blob([response.data], { type: 'application/zip' }));
+    const link = document.createElement('a');
+    link.href = url;
+    link.download = job.filename || 'book_of_business.zip';
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+    window.URL.revokeObjectURL(url);
+
+    return { success: true, packs: finished.progress?.total || 0 };
+  } catch (error) {
+    console.error('Error downloading book of business:', error);
+    return {
+      success: false,
+      error: error.response?.status === 404
+        ? 'No clients have granted you access to their reports'
+        : error.response?.data?.error || error.message || 'Failed to download book of business'
+    };
+  }
+};
+
+// Advisor side: ask the client with this email for access to their reports
+export const requestAdvisorAccess = async (clientEmail) => {
+  try {
+    const response = await api.post('/business/advisor-access', { client_email: clientEmail });
+    return { success: true, data: response.data };
+  } catch (error) {
+    console.error('Error requesting advisor access:', error);
+    return {
+      success: false,
+      error: error.response?.data?.error || error.message || 'Failed to request access'
+    };
+  }
+};
+
+// Client side: grant (true) or revoke (false) the access an advisor requested
+export const setAdvisorAccess = async (advisorId, granted) => {
+  try {
+    const response = granted
+      ? await api.post(`/business/advisors/${advisorId}/access`)
+      : await api.delete(`/business/advisors/${advisorId}/access`);
+    return { success: true, data: response.data };
+  } catch (error) {
+    console.error('Error updating advisor access:', error);
+    return {
+      success: false,
+      error: error.response?.data?.error || error.message || 'Failed to update advisor access'
+    };
+  }
+};
+
 export const getAssessmentSummary = async (assessmentId) => {
   try {
     const response = await api.get(`/assessment/${assessmentId}/summary`);
@@ -248,10 +381,46 @@ export const calculateWealthGap = async (wealthGapData) => {
   }
 };
 
+export const projectWealthScenarios = async (scenarioInputs) => {
+  try {
+    const response = await api.post('/wealth-gap/scenarios', scenarioInputs);
+    return { success: true, data: response.data };
+  } catch (error) {
+    console.error('Error projecting wealth scenarios:', error);
+    return {
+      success: false,
+      error: error.response?.data?.error || error.message || 'Failed to project wealth scenarios'
+    };
+  }
+};
+
+// Task API Functions
+// Gantt data for the tasks overlapping [start, end] (YYYY-MM-DD); collapsed groups come back as summary bars only
+export const getTaskTimeline = async ({ start, end, groupBy = 'category', collapsed = [] }) => {
+  try {
+    const response = await api.get('/tasks/timeline', {
+      params: {
+        start,
+        end,
+        group_by: groupBy,
+        ...(collapsed.length ? { collapsed: collapsed.join(',') } : {})
+      }
+    });
+    return { success: true, data: response.data };
+  } catch (error) {
+    console.error('Error getting task timeline:', error);
+    return {
+      success: false,
+      error: error.response?.data?.error || error.message || 'Failed to get task timeline'
+    };
+  }
+};
+
 // Business Profile API Functions
-export const getBusinessProfile = async () => {
+// fields: optional comma-separated field groups (e.g. 'core,contact'); omit for the full profile
+export const getBusinessProfile = async (fields) => {
   try {
-    const response = await api.get('/business/profile');
+    const response = await api.get('/business/profile', { params: fields ? { fields } : undefined });
     return { success: true, data: response.data };
   } catch (error) {
     console.error('Error getting business profile:', error);
@@ -302,6 +471,19 @@ export const getExitQuizResults = async () => {
   }
 };
 
+export const getExitQuizWhatIf = async (responses) => {
+  try {
+    const response = await api.post('/exit-quiz/what-if', responses ? { responses } : {});
+    return { success: true, data: response.data };
+  } catch (error) {
+    console.error('Error getting quiz what-if table:', error);
+    return {
+      success: false,
+      error: error.response?.data?.error || error.message || 'Failed to get quiz what-if table'
+    };
+  }
+};
+
 export const getExitQuizHistory = async () => {
   try {
     const response = await api.get('/exit-quiz/history');